@@ -0,0 +1,109 @@
+"""
+Orçamentos de consultas SQL por endpoint.
+
+Cada caso de `cases.CASES` com `budget` é executado contra dois conjuntos de
+dados sintéticos (pequeno e grande, gerados dentro de uma transação desfeita
+ao final) com os caches vazios, ou seja, no pior caso. O caso falha se passar do
+orçamento ou se o número de consultas crescer com o volume de dados (N+1).
+
+Os caches são esvaziados antes de cada caso; por isso a verificação troca todos
+os aliases do Django por caches em memória do próprio processo (e o cache de
+respostas `shared` pelo `memory`), sem tocar no Redis de quem a executa.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+
+from apps.profiles.models import Profile
+from core import response_cache
+from .cases import Case, path_params, run_captured
+from .dataset import Scale, generate
+from .tokens import mint_token
+
+# Semente própria para não colidir com os dados do bench_seed
+# Todos os módulos disponíveis concluídos: o estado do perfil é o mesmo nas duas escalas
+SMALL = Scale(profiles=3, leads=40, commissions=12, modules=4, resources=8, progress_ratio=1.0, seed=4242)
+LARGE = Scale(profiles=6, leads=400, commissions=120, modules=12, resources=24, progress_ratio=1.0, seed=4242)
+
+
+@dataclass
+class Violation:
+    case: Case
+    reason: str
+    sql: List[str]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _isolated_caches() -> override_settings:
+    """Caches em memória deste processo para todos os aliases e para o cache de respostas."""
+    caches = {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'seal-budgets-{alias}'}
+        for alias in settings.CACHES
+    }
+    response_cache_mode = 'off' if settings.RESPONSE_CACHE == 'off' else 'memory'
+    return override_settings(CACHES=caches, RESPONSE_CACHE=response_cache_mode)
+
+
+def count_queries(scale: Scale, cases: List[Case]) -> Dict[str, Tuple[Optional[int], List[str]]]:
+    """Status e SQL da primeira requisição (cache vazio) de cada caso."""
+    measured: Dict[str, Tuple[Optional[int], List[str]]] = {}
+    try:
+        with transaction.atomic():
+            summary = generate(scale, log=lambda message: None)
+            profile = Profile.objects.get(id=summary.bench_profile_id)
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {mint_token(str(profile.id), profile.email)}")
+            params = path_params(str(profile.id))
+            for case in cases:
+                try:
+                    path = case.path.format(**params)
+                except KeyError:
+                    measured[case.name] = (None, [])
+                    continue
+                cache.clear()
+                response_cache.clear()
+                response, _, sql = run_captured(client, case, path)
+                measured[case.name] = (response.status_code, sql)
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        cache.clear()
+        response_cache.clear()
+    return measured
+
+
+def check(cases: List[Case]) -> Tuple[List[Violation], Dict[str, Tuple[int, int]]]:
+    """
+    Retorna as violações e, por caso, o número de consultas nas duas escalas.
+    """
+    with _isolated_caches():
+        small = count_queries(SMALL, cases)
+        large = count_queries(LARGE, cases)
+    violations = []
+    counts = {}
+    for case in cases:
+        small_status, small_sql = small[case.name]
+        large_status, large_sql = large[case.name]
+        counts[case.name] = (len(small_sql), len(large_sql))
+        if small_status is None or large_status is None:
+            violations.append(Violation(case, "sem dados para os parâmetros do caminho", []))
+        elif max(small_status, large_status) >= 400:
+            violations.append(Violation(
+                case, f"respondeu HTTP {max(small_status, large_status)}", large_sql
+            ))
+        elif case.budget is not None and len(large_sql) > case.budget:
+            violations.append(Violation(
+                case, f"{len(large_sql)} consultas, orçamento {case.budget}", large_sql
+            ))
+        elif len(large_sql) > len(small_sql):
+            violations.append(Violation(
+                case, f"consultas crescem com os dados: {len(small_sql)} -> {len(large_sql)}", large_sql
+            ))
+    return violations, counts
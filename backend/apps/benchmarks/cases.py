@@ -0,0 +1,176 @@
+"""
+Casos de benchmark dos endpoints da API e execução em processo.
+
+Cada caso é uma requisição a uma rota de `core/api.py`; os parâmetros de caminho
+(`{lead_id}`, `{module_id}`, `{resource_id}`) são preenchidos com dados do
+perfil de benchmark. A execução usa o cliente de teste do Django (pilha completa
+de middleware, autenticação e serialização, sem rede) e conta as consultas SQL
+de cada requisição em todos os bancos configurados.
+"""
+import json
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db import connections
+from django.http import HttpResponseBase
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from apps.crm.models import Lead
+from apps.resources.models import Resource
+from apps.training.models import TrainingModule
+from .runner import percentile
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    method: str
+    path: str
+    body: Optional[dict] = None
+    # Casos que alteram dados só rodam com --writes
+    write: bool = False
+    # Máximo de consultas SQL com cache vazio (check_query_budgets)
+    budget: Optional[int] = None
+
+
+CASES: List[Case] = [
+    Case('profiles.me', 'GET', '/api/profiles/me', budget=1),
+    Case('profiles.dashboard_stats', 'GET', '/api/profiles/dashboard-stats', budget=1),
+    Case('profiles.update', 'PUT', '/api/profiles/me', {'full_name': 'Operador Benchmark'}, write=True, budget=2),
+    Case('crm.board', 'GET', '/api/crm/board', budget=2),
+    Case('crm.leads', 'GET', '/api/crm/leads', budget=2),
+    Case('crm.leads_fields', 'GET', '/api/crm/leads?fields=name,status,potential_value', budget=2),
+    Case('crm.leads_search', 'GET', '/api/crm/leads/search?q=silva', budget=3),
+    Case('crm.lead', 'GET', '/api/crm/leads/{lead_id}', budget=2),
+    Case('crm.create_lead', 'POST', '/api/crm/leads', {'name': 'Lead Benchmark', 'potential_value': 1000}, write=True, budget=2),
+    Case('crm.update_lead', 'PUT', '/api/crm/leads/{lead_id}', {'notes': 'Atualizado no benchmark'}, write=True, budget=3),
+    Case('crm.move_lead', 'PATCH', '/api/crm/leads/{lead_id}/move', {'status': 'COMBATE'}, write=True, budget=3),
+    Case('training.modules', 'GET', '/api/training/modules', budget=5),
+    Case('training.module', 'GET', '/api/training/modules/{module_id}', budget=3),
+    Case('training.pending', 'GET', '/api/training/pending', budget=3),
+    Case('training.complete', 'POST', '/api/training/modules/{module_id}/complete', write=True, budget=3),
+    Case('resources.arsenal', 'GET', '/api/resources/arsenal', budget=3),
+    Case('resources.list', 'GET', '/api/resources/list', budget=3),
+    Case('resources.categories', 'GET', '/api/resources/categories', budget=4),
+    Case('resources.resource', 'GET', '/api/resources/{resource_id}', budget=2),
+    Case('resources.download', 'POST', '/api/resources/{resource_id}/download', write=True, budget=3),
+    Case('commissions.summary', 'GET', '/api/commissions/summary', budget=3),
+    Case('commissions.list', 'GET', '/api/commissions/list', budget=2),
+    Case('commissions.pending', 'GET', '/api/commissions/pending', budget=2),
+    Case('commissions.rules', 'GET', '/api/commissions/rules', budget=1),
+    Case('commissions.stats', 'GET', '/api/commissions/stats', budget=2),
+    Case('onboarding.check_schedule', 'GET', '/api/onboarding/check-schedule', budget=2),
+    Case('search.catalog', 'GET', '/api/search/?q=script', budget=5),
+    Case('warroom.bootstrap', 'GET', '/api/war-room/bootstrap', budget=7),
+    Case('batch.reads', 'POST', '/api/batch', {'operations': [
+        {'path': '/api/profiles/me'}, {'path': '/api/crm/leads'}, {'path': '/api/commissions/summary'},
+    ]}, budget=4),
+]
+
+
+def path_params(profile_id: str) -> Dict[str, int]:
+    """IDs usados nos caminhos: um lead do perfil, um módulo e um recurso ativos."""
+    params = {}
+    lead_id = Lead.objects.filter(strategist_id=profile_id).values_list('id', flat=True).first()
+    module_id = TrainingModule.objects.filter(is_active=True, required_step=0).values_list('id', flat=True).first()
+    resource_id = Resource.objects.filter(is_active=True).values_list('id', flat=True).first()
+    for name, value in (('lead_id', lead_id), ('module_id', module_id), ('resource_id', resource_id)):
+        if value is not None:
+            params[name] = value
+    return params
+
+
+def select_cases(names: Optional[List[str]] = None, writes: bool = False) -> List[Case]:
+    cases = [case for case in CASES if writes or not case.write]
+    if names:
+        cases = [case for case in cases if any(case.name.startswith(name) for name in names)]
+    return cases
+
+
+def uncovered_routes() -> Set[str]:
+    """Rotas da API sem caso de benchmark (streams e endpoints internos não contam)."""
+    from core.api import api
+
+    covered = {(case.method, case.path.split('?')[0].rstrip('/')) for case in CASES}
+    routes = set()
+    for path, operations in api.get_openapi_schema()['paths'].items():
+        for method in operations:
+            key = (method.upper(), path.rstrip('/'))
+            if key not in covered and not path.endswith('stream') and '/internal/' not in path:
+                routes.add(f"{key[0]} {path}")
+    return routes
+
+
+def _request(client: Client, case: Case, path: str):
+    if case.body is None:
+        return getattr(client, case.method.lower())(path)
+    return getattr(client, case.method.lower())(
+        path, data=json.dumps(case.body), content_type='application/json'
+    )
+
+
+def _is_transaction_control(sql: str) -> bool:
+    # Savepoints only appear because the budget check runs inside a transaction
+    return sql.lstrip().upper().startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+
+
+def run_captured(client: Client, case: Case, path: str) -> Tuple[HttpResponseBase, float, List[str]]:
+    """Executa uma requisição e retorna a resposta, a duração (s) e o SQL executado."""
+    with ExitStack() as stack:
+        captures = [
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in connections
+        ]
+        started = time.perf_counter()
+        response = _request(client, case, path)
+        elapsed = time.perf_counter() - started
+    sql = [
+        query['sql'] for capture in captures for query in capture.captured_queries
+        if not _is_transaction_control(query['sql'])
+    ]
+    return response, elapsed, sql
+
+
+def measure(client: Client, case: Case, params: Dict[str, int], iterations: int, warmup: int) -> Dict:
+    """
+    Executa o caso `warmup + iterations` vezes e retorna latências (ms),
+    vazão sequencial (req/s) e consultas SQL por requisição.
+    """
+    try:
+        path = case.path.format(**params)
+    except KeyError as exc:
+        return {'name': case.name, 'skipped': f"sem dados para {exc.args[0]}"}
+
+    for _ in range(warmup):
+        _request(client, case, path)
+
+    latencies: List[float] = []
+    statuses = set()
+    sql: List[str] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        response, elapsed, executed = run_captured(client, case, path)
+        latencies.append(elapsed)
+        statuses.add(response.status_code)
+        if len(executed) > len(sql) or not latencies[:-1]:
+            sql = executed
+    elapsed = time.perf_counter() - started
+
+    return {
+        'name': case.name,
+        'method': case.method,
+        'path': path,
+        'status': sorted(statuses),
+        'iterations': iterations,
+        'rps': round(iterations / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'queries': len(sql),
+        'sql': sql,
+    }
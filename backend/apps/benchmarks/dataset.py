@@ -0,0 +1,263 @@
+"""
+Esquema local e dados sintéticos para benchmarks.
+
+Os modelos do `seal` são `managed = False` (as tabelas vivem no Supabase), então
+`create_schema` cria o schema e as tabelas num PostgreSQL local a partir dos
+próprios modelos, e `generate` preenche com dados sintéticos determinísticos
+(mesma semente, mesmos dados) em lotes de `bulk_create`.
+
+Os leads seguem uma distribuição de Zipf entre os estrategistas: o primeiro
+perfil é o mais carregado e é o usado pelos benchmarks.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.commissions.models import Commission
+from apps.crm.models import Lead
+from apps.onboarding.models import Onboarding
+from apps.profiles.models import Profile
+from apps.resources.models import Resource
+from apps.training.models import ModuleProgress, TrainingModule
+
+SCHEMA = 'seal'
+EMAIL_DOMAIN = 'bench.seal.local'
+LOCAL_HOSTS = {'', 'localhost', '127.0.0.1', '::1'}
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor',
+    'Isabela', 'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael',
+    'Sofia', 'Thiago', 'Vitória', 'Wesley',
+]
+LAST_NAMES = [
+    'Almeida', 'Barbosa', 'Cardoso', 'Costa', 'Ferreira', 'Gomes', 'Lima', 'Martins',
+    'Oliveira', 'Pereira', 'Ribeiro', 'Rodrigues', 'Santos', 'Silva', 'Souza',
+]
+NOTES = [
+    'Interessado em proteção familiar.', 'Retornar após o dia 10.',
+    'Pediu proposta por email.', 'Indicação de cliente antigo.', '',
+]
+
+
+@dataclass
+class Scale:
+    profiles: int = 50
+    leads: int = 20000
+    commissions: int = 2000
+    modules: int = 24
+    resources: int = 60
+    progress_ratio: float = 0.5
+    seed: int = 42
+
+
+@dataclass
+class DatasetSummary:
+    counts: Dict[str, int] = field(default_factory=dict)
+    bench_profile_id: Optional[str] = None
+
+
+def ensure_local_database(allow_remote: bool) -> None:
+    """Recusa (CommandError) gravar dados de benchmark num banco `default` fora de localhost."""
+    host = settings.DATABASES['default'].get('HOST') or ''
+    if host not in LOCAL_HOSTS and not allow_remote:
+        raise CommandError(f"Banco em '{host}' não é local; use --allow-remote se for um banco de benchmark.")
+
+
+def seal_models() -> List:
+    """Modelos cujas tabelas ficam no schema `seal`, em ordem de dependência."""
+    return [
+        model for model in apps.get_models()
+        if model._meta.db_table.startswith(f'"{SCHEMA}".')
+    ]
+
+
+def _existing_tables() -> set:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = %s", [SCHEMA]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def create_schema(log: Callable[[str], None] = print) -> List[str]:
+    """
+    Cria o schema `seal` e as tabelas dos modelos não gerenciados que ainda não
+    existem (PostgreSQL). Tabelas gerenciadas ficam com o `migrate`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+    existing = _existing_tables()
+    created = []
+    with connection.schema_editor() as editor:
+        for model in seal_models():
+            table = model._meta.db_table.split('.')[-1].strip('"')
+            if model._meta.managed or table in existing:
+                continue
+            editor.create_model(model)
+            created.append(table)
+            log(f"Tabela {SCHEMA}.{table} criada")
+    return created
+
+
+def truncate() -> None:
+    """Remove todos os dados das tabelas do `seal` (apenas bancos de benchmark)."""
+    tables = ', '.join(model._meta.db_table for model in seal_models())
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phone(rng: random.Random) -> str:
+    return f"(11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+
+
+def _bulk(model, objects: List, batch_size: int) -> List:
+    with transaction.atomic():
+        return model.objects.bulk_create(objects, batch_size=batch_size)
+
+
+def generate(
+    scale: Scale,
+    batch_size: int = 5000,
+    log: Callable[[str], None] = print,
+) -> DatasetSummary:
+    """Gera o conjunto de dados sintético descrito por `scale`."""
+    rng = random.Random(scale.seed)
+    now = timezone.now()
+    summary = DatasetSummary()
+
+    profiles = []
+    for index in range(scale.profiles):
+        # O primeiro perfil (o dos benchmarks) é sempre operacional
+        step = Profile.STEP_OPERACIONAL if index == 0 or rng.random() < 0.7 else rng.randint(0, 2)
+        profiles.append(Profile(
+            id=_uuid(rng),
+            onboarding_step=step,
+            email=f"operador{index}@{EMAIL_DOMAIN}",
+            full_name=_name(rng),
+            phone=_phone(rng),
+            financial_goal=Decimal(rng.randrange(5000, 50000, 500)),
+        ))
+    _bulk(Profile, profiles, batch_size)
+    summary.bench_profile_id = str(profiles[0].id)
+    summary.counts['profiles'] = len(profiles)
+    log(f"{len(profiles)} perfis")
+
+    onboardings = [
+        Onboarding(
+            person=profile,
+            time=now + timedelta(days=rng.randint(-60, 14)),
+            calendly_event_uri=f"https://api.calendly.com/scheduled_events/bench-{profile.id}",
+        )
+        for profile in profiles if profile.onboarding_step >= Profile.STEP_KICKOFF
+    ]
+    _bulk(Onboarding, onboardings, batch_size)
+    summary.counts['onboarding'] = len(onboardings)
+
+    weights = [1 / (rank + 1) for rank in range(len(profiles))]
+    statuses = [choice for choice, _ in Lead.STATUS_CHOICES]
+    leads_by_profile: Dict[uuid.UUID, List[int]] = {}
+    created = 0
+    while created < scale.leads:
+        size = min(batch_size, scale.leads - created)
+        owners = rng.choices(profiles, weights=weights, k=size)
+        batch = []
+        for owner in owners:
+            name = _name(rng)
+            batch.append(Lead(
+                strategist=owner,
+                status=rng.choices(statuses, weights=[50, 25, 15, 10])[0],
+                name=name,
+                phone=_phone(rng) if rng.random() < 0.8 else None,
+                email=f"{name.lower().replace(' ', '.')}{rng.randint(1, 999)}@example.com"
+                if rng.random() < 0.6 else None,
+                potential_value=Decimal(rng.randrange(0, 200000, 100)),
+                notes=rng.choice(NOTES) or None,
+            ))
+        for lead in _bulk(Lead, batch, batch_size):
+            leads_by_profile.setdefault(lead.strategist_id, []).append(lead.id)
+        created += size
+        log(f"{created}/{scale.leads} leads")
+    summary.counts['leads'] = created
+    summary.counts['bench_profile_leads'] = len(leads_by_profile.get(profiles[0].id, []))
+
+    commission_statuses = [choice for choice, _ in Commission.STATUS_CHOICES]
+    owners_with_leads = [profile for profile in profiles if profile.id in leads_by_profile]
+    created = 0
+    while owners_with_leads and created < scale.commissions:
+        size = min(batch_size, scale.commissions - created)
+        batch = []
+        for owner in rng.choices(owners_with_leads, weights=weights[:len(owners_with_leads)], k=size):
+            status = rng.choice(commission_statuses)
+            batch.append(Commission(
+                strategist=owner,
+                lead_id=rng.choice(leads_by_profile[owner.id]),
+                amount=Decimal(rng.randrange(100, 20000)) / 10,
+                status=status,
+                description="Comissão sintética",
+                paid_at=now - timedelta(days=rng.randint(0, 365)) if status == Commission.STATUS_PAID else None,
+            ))
+        _bulk(Commission, batch, batch_size)
+        created += size
+    summary.counts['commissions'] = created
+    log(f"{created} comissões")
+
+    modules = _bulk(TrainingModule, [
+        TrainingModule(
+            title=f"Módulo {index + 1}: {rng.choice(['Abordagem', 'Objeções', 'Fechamento', 'Pós-venda'])}",
+            description="Conteúdo sintético de treinamento.",
+            video_url=f"https://videos.example.com/bench/{index + 1}",
+            order_index=index + 1,
+            required_step=min(index * 4 // max(scale.modules, 1), Profile.STEP_OPERACIONAL),
+            duration_minutes=rng.randint(5, 45),
+        )
+        for index in range(scale.modules)
+    ], batch_size)
+    summary.counts['modules'] = len(modules)
+
+    categories = [choice for choice, _ in Resource.CATEGORY_CHOICES]
+    resources = _bulk(Resource, [
+        Resource(
+            title=f"{rng.choice(['Script', 'Playbook', 'Modelo', 'Guia'])} de {rng.choice(['prospecção', 'negociação', 'follow-up', 'indicação'])} {index + 1}",
+            description="Material sintético do Arsenal.",
+            category=categories[index % len(categories)],
+            file_url=f"https://files.example.com/bench/{index + 1}.pdf",
+            file_type='pdf',
+            order_index=index,
+            download_count=rng.randint(0, 500),
+        )
+        for index in range(scale.resources)
+    ], batch_size)
+    summary.counts['resources'] = len(resources)
+
+    progress = []
+    for profile in profiles:
+        for module in modules:
+            if module.required_step <= profile.onboarding_step and rng.random() < scale.progress_ratio:
+                progress.append(ModuleProgress(
+                    profile=profile,
+                    module=module,
+                    completed=True,
+                    completed_at=now - timedelta(days=rng.randint(0, 90)),
+                ))
+    _bulk(ModuleProgress, progress, batch_size)
+    summary.counts['module_progress'] = len(progress)
+    log(f"{len(modules)} módulos, {len(resources)} recursos, {len(progress)} progressos")
+
+    return summary
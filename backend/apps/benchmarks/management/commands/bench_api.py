@@ -0,0 +1,95 @@
+"""
+Runs the in-process benchmark suite over the API routes (see
+apps/benchmarks/cases.py), reports latency percentiles, sequential throughput
+and SQL queries per request, and stores the results for later comparison.
+With --writes, refuses to run against a non-local database unless
+--allow-remote is given.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from apps.benchmarks import cases, results
+from apps.benchmarks.dataset import EMAIL_DOMAIN, ensure_local_database
+from apps.benchmarks.tokens import mint_token
+from apps.crm.models import Lead
+from apps.profiles.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Mede p50/p95/p99, vazão e consultas SQL de cada rota da API (em processo) e grava o resultado."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', metavar='case', help="Prefixos dos casos a rodar (ex.: crm, training.modules).")
+        parser.add_argument('--user-id', help="Perfil autenticado (padrão: o perfil de benchmark do bench_seed).")
+        parser.add_argument('--iterations', type=int, default=50, help="Requisições medidas por caso.")
+        parser.add_argument('--warmup', type=int, default=5, help="Requisições de aquecimento por caso.")
+        parser.add_argument('--writes', action='store_true', help="Inclui os casos que alteram dados.")
+        parser.add_argument(
+            '--allow-remote', action='store_true',
+            help="Permite --writes num banco fora de localhost (nunca use em produção).",
+        )
+        parser.add_argument('--label', default='', help="Rótulo adicionado ao nome do arquivo de resultado.")
+        parser.add_argument('--compare', help="Compara com um resultado anterior (caminho ou 'latest').")
+        parser.add_argument('--no-save', action='store_true', help="Não grava o resultado.")
+
+    def handle(self, *args, names, user_id, iterations, warmup, writes, allow_remote, label, compare, no_save, **options):
+        if not settings.SUPABASE_JWT_SECRET:
+            raise CommandError("Defina SUPABASE_JWT_SECRET (um segredo de teste) para gerar os tokens.")
+        if writes:
+            ensure_local_database(allow_remote)
+        if user_id:
+            profile = Profile.objects.filter(id=user_id).first()
+        else:
+            profile = Profile.objects.filter(email=f"operador0@{EMAIL_DOMAIN}").first()
+        if profile is None:
+            raise CommandError("Perfil não encontrado; rode `bench_seed` ou informe --user-id.")
+
+        baseline = None
+        if compare:
+            try:
+                baseline = results.load(compare)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Resultado para comparação inválido: {exc}")
+
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {mint_token(str(profile.id), profile.email or '')}")
+        params = cases.path_params(str(profile.id))
+        selected = cases.select_cases(names, writes)
+
+        self.stdout.write(
+            f"{'caso':<28} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>5} status"
+        )
+        measured = []
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for case in selected:
+                result = cases.measure(client, case, params, iterations, warmup)
+                measured.append(result)
+                if 'skipped' in result:
+                    self.stdout.write(f"{case.name:<28} ignorado: {result['skipped']}")
+                    continue
+                self.stdout.write(
+                    f"{case.name:<28} {result['rps']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+                    f"{result['p99_ms']:>8} {result['queries']:>5} {','.join(map(str, result['status']))}"
+                )
+
+        uncovered = cases.uncovered_routes()
+        if uncovered:
+            self.stdout.write(f"Rotas sem caso de benchmark: {', '.join(sorted(uncovered))}")
+
+        if baseline is not None:
+            self.stdout.write(f"\nComparação com {baseline['file']} (commit {baseline.get('commit')}):")
+            for row in results.compare(baseline, measured):
+                self.stdout.write(
+                    f"{row['name']:<28} p50 {row['p50_delta_pct']:+.1f}%  "
+                    f"p95 {row['p95_delta_pct']:+.1f}%  SQL {row['queries_delta']:+d}"
+                )
+
+        if not no_save:
+            dataset = {
+                'profile_id': str(profile.id),
+                'profiles': Profile.objects.count(),
+                'leads': Lead.objects.count(),
+                'profile_leads': Lead.objects.filter(strategist=profile).count(),
+            }
+            path = results.save(measured, dataset, label)
+            self.stdout.write(self.style.SUCCESS(f"Resultado gravado em {path}"))
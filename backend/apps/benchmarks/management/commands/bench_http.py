@@ -0,0 +1,47 @@
+"""
+Measures throughput and latency of API endpoints on a running server.
+Run it against the WSGI (gunicorn) and ASGI (uvicorn) stacks to compare them.
+"""
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks.runner import run_load
+from apps.benchmarks.tokens import mint_token
+
+DEFAULT_PATHS = [
+    '/api/profiles/me',
+    '/api/crm/board',
+    '/api/commissions/summary',
+    '/api/training/modules',
+    '/api/resources/arsenal',
+]
+
+
+class Command(BaseCommand):
+    help = "Mede vazão e latência (p50/p95/p99) de endpoints num servidor em execução."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Rotas a medir (padrão: endpoints de leitura principais).")
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help="URL do servidor.")
+        parser.add_argument('--token', help="JWT a usar no header Authorization.")
+        parser.add_argument('--user-id', help="Gera um JWT para este perfil com SUPABASE_JWT_SECRET.")
+        parser.add_argument('--requests', type=int, default=500, help="Requisições por rota.")
+        parser.add_argument('--concurrency', type=int, default=20, help="Requisições simultâneas.")
+        parser.add_argument('--warmup', type=int, default=10, help="Requisições de aquecimento por rota.")
+
+    def handle(self, *args, paths, base_url, token, user_id, requests, concurrency, warmup, **options):
+        if not token and user_id:
+            if not settings.SUPABASE_JWT_SECRET:
+                raise CommandError("Defina SUPABASE_JWT_SECRET para gerar o token.")
+            token = mint_token(user_id)
+        headers = {'Authorization': f"Bearer {token}"} if token else {}
+
+        self.stdout.write(f"{'rota':<32} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'erros':>6}")
+        for path in paths or DEFAULT_PATHS:
+            result = asyncio.run(run_load(base_url, path, requests, concurrency, headers, warmup))
+            self.stdout.write(
+                f"{result['path']:<32} {result['rps']:>8} {result['p50_ms']:>8} "
+                f"{result['p95_ms']:>8} {result['p99_ms']:>8} {result['errors']:>6}"
+            )
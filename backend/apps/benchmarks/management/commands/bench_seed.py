@@ -0,0 +1,65 @@
+"""
+Creates the `seal` schema on a local PostgreSQL database and fills it with a
+synthetic dataset for benchmarks. Refuses to run against remote databases.
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.benchmarks import dataset
+
+
+class Command(BaseCommand):
+    help = "Cria o schema seal num PostgreSQL local e gera dados sintéticos para benchmarks."
+
+    def add_arguments(self, parser):
+        defaults = dataset.Scale()
+        parser.add_argument('--profiles', type=int, default=defaults.profiles, help="Perfis de estrategistas.")
+        parser.add_argument('--leads', type=int, default=defaults.leads, help="Total de leads (distribuição de Zipf).")
+        parser.add_argument('--commissions', type=int, default=defaults.commissions, help="Total de comissões.")
+        parser.add_argument('--modules', type=int, default=defaults.modules, help="Módulos de treinamento.")
+        parser.add_argument('--resources', type=int, default=defaults.resources, help="Recursos do Arsenal.")
+        parser.add_argument(
+            '--progress-ratio', type=float, default=defaults.progress_ratio,
+            help="Fração dos módulos disponíveis concluída por perfil.",
+        )
+        parser.add_argument('--seed', type=int, default=defaults.seed, help="Semente do gerador.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Registros por INSERT.")
+        parser.add_argument('--reset', action='store_true', help="Apaga os dados do schema seal antes de gerar.")
+        parser.add_argument('--schema-only', action='store_true', help="Apenas cria schema, tabelas e índices.")
+        parser.add_argument(
+            '--allow-remote', action='store_true',
+            help="Permite rodar num banco fora de localhost (nunca use em produção).",
+        )
+
+    def handle(self, *args, reset, schema_only, allow_remote, batch_size, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("O schema seal de benchmark requer PostgreSQL.")
+        dataset.ensure_local_database(allow_remote)
+
+        dataset.create_schema(log=self.stdout.write)
+        call_command('migrate', verbosity=0)
+        call_command('install_lead_search', stdout=self.stdout)
+        call_command('install_profile_indexes', stdout=self.stdout)
+        if schema_only:
+            return
+
+        if reset:
+            dataset.truncate()
+            self.stdout.write("Dados anteriores removidos.")
+
+        scale = dataset.Scale(
+            profiles=options['profiles'],
+            leads=options['leads'],
+            commissions=options['commissions'],
+            modules=options['modules'],
+            resources=options['resources'],
+            progress_ratio=options['progress_ratio'],
+            seed=options['seed'],
+        )
+        summary = dataset.generate(scale, batch_size=batch_size, log=self.stdout.write)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(self.style.SUCCESS(
+            f"Dados gerados: {summary.counts}. Perfil de benchmark: {summary.bench_profile_id}"
+        ))
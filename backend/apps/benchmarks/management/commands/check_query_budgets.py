@@ -0,0 +1,53 @@
+"""
+Fails when an endpoint exceeds its SQL query budget or when its query count
+grows with the amount of data (N+1). Runs against synthetic data created inside
+a transaction that is rolled back; intended for CI and pre-deploy checks.
+Refuses to run against a non-local database unless --allow-remote is given.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.benchmarks import budgets, cases
+from apps.benchmarks.dataset import ensure_local_database
+
+
+class Command(BaseCommand):
+    help = "Verifica o orçamento de consultas SQL de cada endpoint em duas escalas de dados."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', metavar='case', help="Prefixos dos casos a verificar.")
+        parser.add_argument(
+            '--allow-remote', action='store_true',
+            help="Permite rodar num banco fora de localhost (nunca use em produção).",
+        )
+
+    def handle(self, *args, names, allow_remote, **options):
+        if not settings.SUPABASE_JWT_SECRET:
+            raise CommandError("Defina SUPABASE_JWT_SECRET (um segredo de teste) para gerar os tokens.")
+        ensure_local_database(allow_remote)
+
+        selected = cases.select_cases(names, writes=True)
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            violations, counts = budgets.check(selected)
+
+        self.stdout.write(f"{'caso':<28} {'pequeno':>8} {'grande':>8} {'orçamento':>10}")
+        for case in selected:
+            small, large = counts[case.name]
+            budget = '-' if case.budget is None else case.budget
+            self.stdout.write(f"{case.name:<28} {small:>8} {large:>8} {budget:>10}")
+
+        missing = [case.name for case in selected if case.budget is None]
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Casos sem orçamento: {', '.join(missing)}"))
+        uncovered = cases.uncovered_routes()
+        if uncovered:
+            self.stdout.write(self.style.WARNING(f"Rotas sem caso: {', '.join(sorted(uncovered))}"))
+
+        if violations:
+            for violation in violations:
+                self.stderr.write(f"\n{violation.case.name} ({violation.case.method} {violation.case.path}): {violation.reason}")
+                for index, sql in enumerate(violation.sql, 1):
+                    self.stderr.write(f"  {index:>3}. {sql}")
+            raise CommandError(f"{len(violations)} endpoint(s) fora do orçamento de consultas.")
+        self.stdout.write(self.style.SUCCESS("Todos os endpoints dentro do orçamento."))
@@ -0,0 +1,82 @@
+"""
+Armazenamento dos resultados de benchmark para comparação entre commits.
+
+Cada execução vira um JSON em BENCHMARK_RESULTS_DIR com o commit, o banco, os
+volumes do conjunto de dados e as métricas por caso.
+"""
+import json
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.db import connection
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results: List[Dict], dataset: Dict, label: str = '') -> Path:
+    """Grava a execução e retorna o caminho do arquivo."""
+    directory = Path(settings.BENCHMARK_RESULTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    commit = _git_commit()
+    now = datetime.now()
+    name = '-'.join(part for part in (now.strftime('%Y%m%d-%H%M%S'), commit, label) if part)
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps({
+        'created_at': now.isoformat(timespec='seconds'),
+        'commit': commit,
+        'label': label,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'dataset': dataset,
+        'results': [{key: value for key, value in result.items() if key != 'sql'} for result in results],
+    }, indent=2, ensure_ascii=False))
+    return path
+
+
+def load(reference: str) -> Dict:
+    """Carrega um resultado pelo caminho ou `latest` (o mais recente gravado)."""
+    if reference == 'latest':
+        files = sorted(Path(settings.BENCHMARK_RESULTS_DIR).glob('*.json'))
+        if not files:
+            raise FileNotFoundError("Nenhum resultado gravado em BENCHMARK_RESULTS_DIR.")
+        path = files[-1]
+    else:
+        path = Path(reference)
+    data = json.loads(path.read_text())
+    data['file'] = str(path)
+    return data
+
+
+def compare(baseline: Dict, results: List[Dict]) -> List[Dict]:
+    """Variação de p50/p95 (%) e de consultas em relação a uma execução anterior."""
+    previous = {result['name']: result for result in baseline.get('results', []) if 'p50_ms' in result}
+    rows = []
+    for result in results:
+        before = previous.get(result['name'])
+        if before is None or 'p50_ms' not in result:
+            continue
+        rows.append({
+            'name': result['name'],
+            'p50_delta_pct': _delta(before['p50_ms'], result['p50_ms']),
+            'p95_delta_pct': _delta(before['p95_ms'], result['p95_ms']),
+            'queries_delta': result['queries'] - before['queries'],
+        })
+    return rows
+
+
+def _delta(before: float, after: float) -> float:
+    return round((after - before) / before * 100, 1) if before else 0.0
@@ -0,0 +1,76 @@
+"""
+Gerador de carga HTTP para medir endpoints de um servidor em execução.
+Dispara requisições concorrentes com um cliente `httpx` assíncrono e
+calcula vazão e percentis de latência por rota.
+"""
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(path: str, latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Latências em milissegundos; vazão em requisições por segundo."""
+    return {
+        'path': path,
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'rps': round((len(latencies) + errors) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run_load(
+    base_url: str,
+    path: str,
+    requests: int,
+    concurrency: int,
+    headers: Optional[dict] = None,
+    warmup: int = 0,
+) -> Dict:
+    """
+    Executa `requests` GETs em `path` com até `concurrency` em voo.
+    Respostas 2xx/304 contam como sucesso; as demais como erro.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        for _ in range(warmup):
+            await client.get(path)
+
+        latencies: List[float] = []
+        errors = 0
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 300 or response.status_code == 304
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(path, latencies, errors, elapsed)
@@ -0,0 +1,20 @@
+"""
+Tokens de teste para benchmarks.
+"""
+import time
+
+import jwt
+from django.conf import settings
+
+
+def mint_token(user_id: str, email: str = '', ttl: int = 3600) -> str:
+    """JWT HS256 no formato do Supabase, assinado com SUPABASE_JWT_SECRET."""
+    payload = {
+        'sub': user_id,
+        'aud': 'authenticated',
+        'role': 'authenticated',
+        'exp': int(time.time()) + ttl,
+    }
+    if email:
+        payload['email'] = email
+    return jwt.encode(payload, settings.SUPABASE_JWT_SECRET, algorithm='HS256')
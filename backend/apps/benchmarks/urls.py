@@ -0,0 +1,9 @@
+from django.contrib import admin
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', admin.site.admin_view(views.profile_list), name='profiling'),
+    path('<str:profile_id>/', admin.site.admin_view(views.profile_download), name='profiling-download'),
+]
@@ -0,0 +1,33 @@
+"""
+Página do admin com os perfis de requisição gravados por `core/profiling.py`.
+"""
+from django.contrib import admin
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import render
+
+from core import profiling
+
+
+def profile_list(request):
+    """Lista os perfis gravados, do mais recente ao mais antigo."""
+    context = {
+        **admin.site.each_context(request),
+        'title': "Perfis de requisição",
+        'profiles': profiling.list_profiles(),
+    }
+    return render(request, 'admin/benchmarks/profiling.html', context)
+
+
+def profile_download(request, profile_id: str):
+    """Perfil completo em JSON, ou só as pilhas no formato folded (`?format=folded`)."""
+    data = profiling.load(profile_id)
+    if data is None:
+        raise Http404("Perfil não encontrado")
+    if request.GET.get('format') == 'folded':
+        response = HttpResponse(profiling.folded(data), content_type='text/plain; charset=utf-8')
+        filename = f"{profile_id}.folded.txt"
+    else:
+        response = JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+        filename = f"{profile_id}.json"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
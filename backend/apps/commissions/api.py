@@ -2,13 +2,17 @@
 Commissions API endpoints using Django Ninja.
 Tracks and displays commission information for strategists.
 """
+import asyncio
 from typing import List
 from decimal import Decimal
 from ninja import Router
 from ninja.errors import HttpError
-from django.db.models import Sum
+from django.db.models import Count, Q, Sum
 
-from core.auth import supabase_auth
+from core.aio import alist
+from core.auth import async_supabase_auth, supabase_auth
+from core.fields import parse_fields, serialize, sparse_response
+from core.response_cache import cached_response
 from apps.profiles.models import Profile
 from .models import Commission
 from .schemas import (
@@ -31,65 +35,88 @@ def check_operational_access(profile: Profile):
         )
 
 
-@router.get("/summary", response=CommissionSummarySchema, auth=supabase_auth)
-def get_commission_summary(request):
+@router.get("/summary", response=CommissionSummarySchema, auth=async_supabase_auth)
+@cached_response('commissions:{profile}')
+async def get_commission_summary(request):
     """
     Retorna resumo das comissões do estrategista.
     OPERAÇÃO: Relatório Financeiro Tático.
     """
     profile = request.auth
     check_operational_access(profile)
-    
+    return await build_commission_summary(profile)
+
+
+async def build_commission_summary(profile: Profile) -> CommissionSummarySchema:
+    """Resumo das comissões do estrategista (também usado pelo bootstrap do War Room)."""
     commissions = Commission.objects.filter(strategist=profile)
     
-    # Calcula totais
-    pending = commissions.filter(status__in=[Commission.STATUS_PENDING, Commission.STATUS_APPROVED])
-    paid = commissions.filter(status=Commission.STATUS_PAID)
+    # Calcula totais e contagens num único aggregate, junto com as últimas 50 comissões
+    pending = Q(status__in=[Commission.STATUS_PENDING, Commission.STATUS_APPROVED])
+    paid = Q(status=Commission.STATUS_PAID)
+    totals, recent = await asyncio.gather(
+        commissions.aaggregate(
+            total_pending=Sum('amount', filter=pending),
+            total_paid=Sum('amount', filter=paid),
+            pending_count=Count('pk', filter=pending),
+            paid_count=Count('pk', filter=paid),
+        ),
+        alist(commissions[:50]),
+    )
     
-    total_pending = pending.aggregate(total=Sum('amount'))['total'] or Decimal('0')
-    total_paid = paid.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+    total_pending = totals['total_pending'] or Decimal('0')
+    total_paid = totals['total_paid'] or Decimal('0')
     
     return CommissionSummarySchema(
         total_earned=total_pending + total_paid,
         total_pending=total_pending,
         total_paid=total_paid,
-        pending_count=pending.count(),
-        paid_count=paid.count(),
-        commissions=list(commissions[:50])  # Últimas 50 comissões
+        pending_count=totals['pending_count'],
+        paid_count=totals['paid_count'],
+        commissions=recent  # Últimas 50 comissões
     )
 
 
 @router.get("/list", response=List[CommissionOutSchema], auth=supabase_auth)
-def list_commissions(request, status: str = None):
+@cached_response('commissions:{profile}')
+def list_commissions(request, status: str = None, fields: str = None):
     """
     Lista comissões do estrategista.
+    `fields=id,amount,status,...` retorna (e consulta) apenas esses campos.
     OPERAÇÃO: Extrato de Operações Financeiras.
     """
     profile = request.auth
     check_operational_access(profile)
+    selected = parse_fields(fields, CommissionOutSchema)
     
     commissions = Commission.objects.filter(strategist=profile)
     
     if status:
         commissions = commissions.filter(status=status.upper())
     
+    if selected:
+        return sparse_response(request, serialize(CommissionOutSchema, selected, commissions.values(*selected)))
     return list(commissions)
 
 
 @router.get("/pending", response=List[CommissionOutSchema], auth=supabase_auth)
-def list_pending_commissions(request):
+@cached_response('commissions:{profile}')
+def list_pending_commissions(request, fields: str = None):
     """
-    Lista comissões pendentes do estrategista.
+    Lista comissões pendentes do estrategista. Aceita `fields=` como /list.
     OPERAÇÃO: Recompensas Aguardando Liberação.
     """
     profile = request.auth
     check_operational_access(profile)
+    selected = parse_fields(fields, CommissionOutSchema)
     
     commissions = Commission.objects.filter(
         strategist=profile,
         status__in=[Commission.STATUS_PENDING, Commission.STATUS_APPROVED]
     )
     
+    if selected:
+        return sparse_response(request, serialize(CommissionOutSchema, selected, commissions.values(*selected)))
     return list(commissions)
 
 
@@ -144,6 +171,7 @@ def get_commission_rules(request):
 
 
 @router.get("/stats", auth=supabase_auth)
+@cached_response('commissions:{profile}', 'profile:{profile}')
 def get_commission_stats(request):
     """
     Retorna estatísticas detalhadas de comissões.
@@ -152,22 +180,26 @@ def get_commission_stats(request):
     profile = request.auth
     check_operational_access(profile)
     
-    commissions = Commission.objects.filter(strategist=profile)
-    
-    # Estatísticas por status
+    # Estatísticas por status em uma única consulta agrupada
+    grouped = {
+        row['status']: row
+        for row in Commission.objects.filter(strategist=profile)
+        .values('status')
+        .annotate(count=Count('id'), total=Sum('amount'))
+        .order_by()
+    }
     stats_by_status = {}
     for status_code, status_name in Commission.STATUS_CHOICES:
-        status_commissions = commissions.filter(status=status_code)
-        total = status_commissions.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        row = grouped.get(status_code, {})
         stats_by_status[status_code] = {
             "name": status_name,
-            "count": status_commissions.count(),
-            "total": float(total)
+            "count": row.get('count', 0),
+            "total": float(row.get('total') or Decimal('0'))
         }
     
     return {
         "status": "RELATÓRIO GERADO",
-        "total_commissions": commissions.count(),
+        "total_commissions": sum(row['count'] for row in grouped.values()),
         "by_status": stats_by_status,
         "current_commission": float(profile.current_commission),
         "financial_goal": float(profile.financial_goal),
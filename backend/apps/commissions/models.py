@@ -5,6 +5,12 @@ Tracks commissions earned by strategists.
 from django.db import models
 from apps.profiles.models import Profile
 from apps.crm.models import Lead
+from core.response_cache import TaggedQuerySet
+
+
+class CommissionQuerySet(TaggedQuerySet):
+    cache_tag = 'commissions:{profile}'
+    cache_tag_field = 'strategist_id'
 
 
 class Commission(models.Model):
@@ -73,6 +79,8 @@ class Commission(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CommissionQuerySet.as_manager()
+    
     class Meta:
         managed = False  # Não sobrescrever o banco existente do Supabase
         db_table = '"seal"."commissions"'
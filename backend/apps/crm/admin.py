@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Lead
+from .search import search_leads
 
 
 @admin.register(Lead)
@@ -28,3 +29,9 @@ class LeadAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Usa a busca indexada de leads em vez de icontains em cada coluna."""
+        if not search_term:
+            return queryset, False
+        return search_leads(queryset, search_term), False
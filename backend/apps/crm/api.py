@@ -2,16 +2,21 @@
 CRM API endpoints using Django Ninja.
 Implements the Frontline Kanban board with tactical pipeline.
 """
-from typing import List
+from typing import List, Tuple
 from ninja import Router
 from ninja.errors import HttpError
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 
-from core.auth import supabase_auth, require_operational
+from core.auth import async_supabase_auth, supabase_auth, require_operational
+from core.fields import parse_fields, serialize, sparse_response
+from core.response_cache import cached_response
+from core.events import event_stream, format_sse, open_subscription, sse_response
 from apps.profiles.models import Profile
 from apps.commissions.models import Commission
+from . import events
 from .models import Lead
+from .search import search_leads
 from .schemas import (
     LeadCreateSchema,
     LeadUpdateSchema,
@@ -73,18 +78,27 @@ def check_operational_access(profile: Profile):
         )
 
 
-@router.get("/board", response=KanbanBoardSchema, auth=supabase_auth)
-def get_kanban_board(request):
+@router.get("/board", response=KanbanBoardSchema, auth=async_supabase_auth)
+@cached_response('leads:{profile}')
+async def get_kanban_board(request, fields: str = None):
     """
     Retorna o board Kanban completo com leads organizados por status.
+    `fields=id,name,status,...` limita os campos de cada card (e as colunas lidas).
     OPERAÇÃO: Visão Tática do Campo de Batalha.
     """
     profile = request.auth
     check_operational_access(profile)
-    
-    # Busca todos os leads do estrategista
-    leads = Lead.objects.filter(strategist=profile)
-    
+    selected = parse_fields(fields, LeadOutSchema)
+    if selected:
+        return sparse_response(request, await build_board(profile, selected))
+    return await build_board(profile)
+
+
+async def build_board(profile: Profile, selected: Tuple[str, ...] = None):
+    """
+    Board Kanban do estrategista (também usado pelo bootstrap do War Room).
+    Com `selected`, lê apenas essas colunas e retorna o board já serializado.
+    """
     # Organiza por status
     board = {
         'RADAR': [],
@@ -93,37 +107,94 @@ def get_kanban_board(request):
         'RESGATE': [],
     }
     
-    for lead in leads:
-        if lead.status in board:
-            board[lead.status].append(lead)
+    leads = Lead.objects.filter(strategist=profile)
+    if selected:
+        leads = leads.values(*dict.fromkeys(selected + ('status',)))
+    
+    # Busca todos os leads do estrategista (uma única consulta; o total vem da mesma leitura)
+    total_count = 0
+    async for lead in leads:
+        total_count += 1
+        status = lead['status'] if selected else lead.status
+        if status in board:
+            board[status].append(lead)
+    
+    if selected:
+        board = {status: serialize(LeadOutSchema, selected, rows) for status, rows in board.items()}
+        return {**board, 'total_count': total_count, 'families_saved': len(board['RESGATE'])}
     
     return KanbanBoardSchema(
         RADAR=board['RADAR'],
         COMBATE=board['COMBATE'],
         EXTRAÇÃO=board['EXTRAÇÃO'],
         RESGATE=board['RESGATE'],
-        total_count=leads.count(),
+        total_count=total_count,
         families_saved=len(board['RESGATE'])
     )
 
 
+@router.get("/board/stream", auth=supabase_auth)
+def board_stream(request):
+    """
+    Stream SSE (text/event-stream) com as mudanças do board do estrategista:
+    lead.created, lead.updated, lead.moved, lead.deleted e commission.*.
+    O evento inicial `ready` indica que o cliente deve (re)carregar o board;
+    `resync` indica que eventos foram descartados por lentidão do cliente.
+    OPERAÇÃO: Rádio do Campo de Batalha.
+    """
+    profile = request.auth
+    check_operational_access(profile)
+    
+    subscription = open_subscription(events.channel(profile.id))
+    return sse_response(request, event_stream(subscription, initial=[format_sse('ready')]), subscription)
+
+
 @router.get("/leads", response=List[LeadOutSchema], auth=supabase_auth)
-def list_leads(request, status: str = None):
+@cached_response('leads:{profile}')
+def list_leads(request, status: str = None, fields: str = None):
     """
     Lista todos os leads do estrategista, opcionalmente filtrados por status.
+    `fields=id,name,status,...` retorna (e consulta) apenas esses campos.
     OPERAÇÃO: Reconhecimento de Alvos.
     """
     profile = request.auth
     check_operational_access(profile)
+    selected = parse_fields(fields, LeadOutSchema)
     
     leads = Lead.objects.filter(strategist=profile)
     
     if status:
         leads = leads.filter(status=status)
     
+    if selected:
+        return sparse_response(request, serialize(LeadOutSchema, selected, leads.values(*selected)))
     return list(leads)
 
 
+@router.get("/leads/search", response=List[LeadOutSchema], auth=supabase_auth)
+@cached_response('leads:{profile}')
+def search_leads_endpoint(request, q: str, status: str = None, limit: int = 20, fields: str = None):
+    """
+    Busca leads do estrategista por nome, email, telefone (dígitos parciais) e notas.
+    Ignora acentos e tolera erros de digitação no nome. Aceita `fields=` como /leads.
+    OPERAÇÃO: Localização de Alvo.
+    """
+    profile = request.auth
+    check_operational_access(profile)
+    selected = parse_fields(fields, LeadOutSchema)
+    
+    leads = Lead.objects.filter(strategist=profile)
+    
+    if status:
+        leads = leads.filter(status=status)
+    
+    limit = max(1, min(limit, 100))
+    results = search_leads(leads, q)
+    if selected:
+        return sparse_response(request, serialize(LeadOutSchema, selected, results.values(*selected)[:limit]))
+    return list(results[:limit])
+
+
 @router.post("/leads", response=LeadOutSchema, auth=supabase_auth)
 def create_lead(request, payload: LeadCreateSchema):
     """
@@ -158,6 +229,7 @@ def create_lead(request, payload: LeadCreateSchema):
 
 
 @router.get("/leads/{lead_id}", response=LeadOutSchema, auth=supabase_auth)
+@cached_response('leads:{profile}')
 def get_lead(request, lead_id: int):
     """
     Retorna detalhes de um lead específico.
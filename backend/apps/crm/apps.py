@@ -5,3 +5,6 @@ class CrmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.crm'
     verbose_name = 'Frontline CRM'
+
+    def ready(self):
+        from . import signals  # noqa: F401
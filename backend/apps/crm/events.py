@@ -0,0 +1,40 @@
+"""
+Eventos do board Kanban (SSE).
+Cada estrategista tem um canal; os signals de Lead e Commission publicam nele
+após o commit, tanto para mudanças feitas pela API quanto pelo admin.
+"""
+from apps.commissions.schemas import CommissionOutSchema
+from core.events import publish
+from .schemas import LeadOutSchema
+
+LEAD_CREATED = 'lead.created'
+LEAD_UPDATED = 'lead.updated'
+LEAD_MOVED = 'lead.moved'
+LEAD_DELETED = 'lead.deleted'
+COMMISSION_CREATED = 'commission.created'
+COMMISSION_UPDATED = 'commission.updated'
+COMMISSION_DELETED = 'commission.deleted'
+
+
+def channel(strategist_id) -> str:
+    return f"crm:{strategist_id}"
+
+
+def publish_lead(event_type: str, lead, from_status: str = None) -> None:
+    data = {"lead": LeadOutSchema.from_orm(lead).model_dump(mode='json')}
+    if from_status is not None:
+        data["from_status"] = from_status
+    publish(channel(lead.strategist_id), event_type, data)
+
+
+def publish_lead_deleted(lead) -> None:
+    publish(channel(lead.strategist_id), LEAD_DELETED, {"id": lead.id, "status": lead.status})
+
+
+def publish_commission(event_type: str, commission) -> None:
+    data = {"commission": CommissionOutSchema.from_orm(commission).model_dump(mode='json')}
+    publish(channel(commission.strategist_id), event_type, data)
+
+
+def publish_commission_deleted(commission) -> None:
+    publish(channel(commission.strategist_id), COMMISSION_DELETED, {"id": commission.id})
@@ -0,0 +1,37 @@
+"""
+Installs the PostgreSQL objects used by lead search (pg_trgm, seal.seal_unaccent
+and trigram indexes on seal.crm_leads). Safe to run more than once.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.crm.search import INSTALL_SQL
+
+
+class Command(BaseCommand):
+    help = "Cria extensão, função e índices trigram para a busca de leads (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--print',
+            action='store_true',
+            dest='print_only',
+            help="Apenas imprime o SQL, sem executar.",
+        )
+
+    def handle(self, *args, print_only=False, **options):
+        if print_only:
+            for statement in INSTALL_SQL:
+                self.stdout.write(statement.strip() + ';\n')
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError("A busca indexada de leads requer PostgreSQL.")
+
+        # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação:
+        # cada comando é executado em autocommit.
+        with connection.cursor() as cursor:
+            for statement in INSTALL_SQL:
+                self.stdout.write(statement.strip().splitlines()[0] + ' ...')
+                cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS("Busca de leads instalada."))
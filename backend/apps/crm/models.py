@@ -4,6 +4,12 @@ Manages leads through the tactical pipeline.
 """
 from django.db import models
 from apps.profiles.models import Profile
+from core.response_cache import TaggedQuerySet
+
+
+class LeadQuerySet(TaggedQuerySet):
+    cache_tag = 'leads:{profile}'
+    cache_tag_field = 'strategist_id'
 
 
 class Lead(models.Model):
@@ -74,6 +80,8 @@ class Lead(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = LeadQuerySet.as_manager()
+    
     class Meta:
         managed = False  # Não sobrescrever o banco existente do Supabase
         db_table = '"seal"."crm_leads"'
@@ -0,0 +1,137 @@
+"""
+Lead search across name, email, phone and notes.
+
+On PostgreSQL the search runs against trigram GIN indexes built over an
+accent-free expression (`seal.seal_unaccent`) and over the phone digits, so
+substring, partial-phone and fuzzy-name matches stay index-backed as
+`crm_leads` grows. Install them with `python manage.py install_lead_search`.
+Other databases fall back to an accent-insensitive scan in Python.
+"""
+import difflib
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Case, FloatField, IntegerField, When
+from django.db.models.expressions import RawSQL
+
+from core.text import UNACCENT_FROM, UNACCENT_TO, normalize
+from .models import Lead
+
+MIN_QUERY_LENGTH = 2
+MIN_PHONE_DIGITS = 3
+FUZZY_RATIO = 0.75
+
+INSTALL_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE OR REPLACE FUNCTION seal.seal_unaccent(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT translate(lower(value), '{UNACCENT_FROM}', '{UNACCENT_TO}') $$
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS crm_leads_strategist_created_idx
+    ON seal.crm_leads (strategist_id, created_at DESC)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS crm_leads_search_trgm_idx
+    ON seal.crm_leads USING gin ((seal.seal_unaccent(
+        coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(notes, '')
+    )) gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS crm_leads_phone_digits_trgm_idx
+    ON seal.crm_leads USING gin ((regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')) gin_trgm_ops)
+    """,
+]
+
+
+def _column(name: str) -> str:
+    # Colunas qualificadas: o admin faz JOIN com profiles, que também tem email/phone
+    return f'{Lead._meta.db_table}."{name}"'
+
+
+def _search_text_sql() -> str:
+    # Deve ser idêntica à expressão do índice crm_leads_search_trgm_idx
+    return (
+        f"seal.seal_unaccent(coalesce({_column('name')}, '') || ' ' || "
+        f"coalesce({_column('email')}, '') || ' ' || coalesce({_column('notes')}, ''))"
+    )
+
+
+def _phone_digits_sql() -> str:
+    return f"regexp_replace(coalesce({_column('phone')}, ''), '[^0-9]', '', 'g')"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _postgres_search(queryset, term: str, digits: str):
+    text_sql = _search_text_sql()
+    conditions = [f"{text_sql} LIKE %s", f"%s <%% {text_sql}"]
+    params = [f"%{_escape_like(term)}%", term]
+    if digits:
+        conditions.append(f"{_phone_digits_sql()} LIKE %s")
+        params.append(f"%{digits}%")
+
+    return queryset.filter(
+        RawSQL(f"({' OR '.join(conditions)})", params, output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f"word_similarity(%s, {text_sql})", [term], output_field=FloatField())
+    ).order_by('-search_rank', '-created_at')
+
+
+def _lead_score(lead, term: str, digits: str) -> float:
+    if digits and digits in re.sub(r'\D', '', lead.phone or ''):
+        return 1.0
+    text = normalize(' '.join(filter(None, [lead.name, lead.email, lead.notes])))
+    if term in text:
+        return 1.0
+    # Cada palavra da busca deve casar com alguma palavra do lead (tolerando erros de digitação)
+    words = text.split()
+    scores = []
+    for query_word in term.split():
+        if query_word in text:
+            scores.append(1.0)
+            continue
+        best = max(
+            (difflib.SequenceMatcher(None, query_word, word).ratio() for word in words),
+            default=0.0
+        )
+        if best < FUZZY_RATIO:
+            return 0.0
+        scores.append(best)
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def _basic_search(queryset, term: str, digits: str):
+    scored = []
+    for lead in queryset.only('id', 'name', 'email', 'phone', 'notes', 'created_at'):
+        score = _lead_score(lead, term, digits)
+        if score:
+            scored.append((score, lead.created_at, lead.id))
+    scored.sort(reverse=True)
+    ids = [lead_id for _, _, lead_id in scored]
+    ranking = Case(
+        *[When(pk=lead_id, then=position) for position, lead_id in enumerate(ids)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=ids).annotate(search_position=ranking).order_by('search_position')
+
+
+def search_leads(queryset, query: str):
+    """
+    Filtra e ordena `queryset` por relevância para `query`.
+    Casa trechos de nome/email/notas (sem acentos), dígitos parciais do telefone
+    e nomes aproximados. O escopo (ex.: por estrategista) vem do queryset.
+    """
+    term = normalize(query.strip())
+    if len(term) < MIN_QUERY_LENGTH:
+        return queryset.none()
+    digits = re.sub(r'\D', '', query)
+    if len(digits) < MIN_PHONE_DIGITS:
+        digits = ''
+
+    if connection.vendor == 'postgresql':
+        return _postgres_search(queryset, term, digits)
+    return _basic_search(queryset, term, digits)
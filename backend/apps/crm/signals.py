@@ -0,0 +1,54 @@
+"""
+Signals do Frontline CRM: publicam as mudanças de leads e comissões
+no stream do board do estrategista e invalidam as respostas em cache.
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.commissions.models import Commission
+from core.response_cache import invalidate_instance
+from . import events
+from .models import Lead
+
+
+@receiver(post_init, sender=Lead)
+def remember_lead_status(sender, instance, **kwargs):
+    # Status carregado do banco, para distinguir movimentação de edição.
+    # Lido de __dict__: em querysets com .only() o campo pode estar adiado
+    instance._board_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Lead)
+def publish_lead_saved(sender, instance, created, **kwargs):
+    if created:
+        events.publish_lead(events.LEAD_CREATED, instance)
+    elif instance._board_status is not None and instance.status != instance._board_status:
+        events.publish_lead(events.LEAD_MOVED, instance, from_status=instance._board_status)
+    else:
+        events.publish_lead(events.LEAD_UPDATED, instance)
+    instance._board_status = instance.status
+
+
+@receiver(post_delete, sender=Lead)
+def publish_lead_deleted(sender, instance, **kwargs):
+    events.publish_lead_deleted(instance)
+
+
+@receiver(post_save, sender=Commission)
+def publish_commission_saved(sender, instance, created, **kwargs):
+    events.publish_commission(
+        events.COMMISSION_CREATED if created else events.COMMISSION_UPDATED,
+        instance
+    )
+
+
+@receiver(post_delete, sender=Commission)
+def publish_commission_deleted(sender, instance, **kwargs):
+    events.publish_commission_deleted(instance)
+
+
+@receiver([post_save, post_delete], sender=Lead)
+@receiver([post_save, post_delete], sender=Commission)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Invalida as respostas em cache do estrategista dono do lead/comissão."""
+    invalidate_instance(instance)
@@ -1,12 +1,17 @@
 """
 Onboarding API endpoints - Calendly integration.
 """
+import logging
 from datetime import datetime
 from ninja import Router
+from ninja.errors import HttpError
 from django.http import HttpRequest
 
 from core.auth import supabase_auth
+from core.events import event_stream, format_sse, open_subscription, sse_response
 from apps.profiles.models import Profile
+from apps.webhooks.queue import enqueue
+from . import calendly, events
 from .models import Onboarding
 from .schemas import (
     OnboardingOutSchema,
@@ -16,6 +21,7 @@ from .schemas import (
 )
 
 router = Router()
+logger = logging.getLogger(__name__)
 
 
 @router.get("/check-schedule", response=CheckScheduleSchema, auth=supabase_auth)
@@ -40,86 +46,83 @@ def check_schedule(request):
     }
 
 
+@router.get("/schedule-stream", auth=supabase_auth)
+def schedule_stream(request):
+    """
+    Stream SSE (text/event-stream) do agendamento do kickoff.
+    Envia o estado atual como evento `schedule` e, enquanto não houver
+    agendamento, mantém a conexão aberta até o webhook registrá-lo.
+    Substitui o polling de /check-schedule. A conexão expira após
+    EVENTS_STREAM_MAX_AGE segundos e o cliente reconecta.
+    """
+    profile = request.auth
+    
+    # Inscreve antes de consultar para não perder um evento entre os dois passos
+    subscription = open_subscription(events.channel(profile.id))
+    
+    def current_state():
+        profile.refresh_from_db(fields=['onboarding_step'])
+        return events.schedule_state(profile, Onboarding.objects.filter(person=profile).first())
+    
+    try:
+        state = current_state()
+    except Exception:
+        subscription.close()
+        raise
+    initial = [format_sse(events.EVENT_SCHEDULE, state)]
+    if state["has_schedule"]:
+        subscription.close()
+        return sse_response(request, iter(initial))
+    
+    def recheck():
+        # Rede de segurança caso uma notificação se perca (ex.: worker em outro processo)
+        state = current_state()
+        return {"type": events.EVENT_SCHEDULE, "data": state} if state["has_schedule"] else None
+    
+    return sse_response(request, event_stream(
+        subscription,
+        initial=initial,
+        stop=lambda event: event["data"].get("has_schedule", False),
+        on_idle=recheck,
+    ), subscription)
+
+
 @router.post("/calendly-webhook", response=MessageSchema)
 def calendly_webhook(request: HttpRequest):
     """
     Webhook para receber eventos do Calendly.
-    Quando uma reunião é marcada, registra na tabela onboarding.
+    Valida a assinatura e apenas enfileira o evento bruto; o registro na tabela
+    onboarding é feito pelo worker (`python manage.py process_webhooks`).
+    Reentregas do mesmo evento são ignoradas.
     """
     import json
     
+    if not calendly.verify_signature(request.headers.get('Calendly-Webhook-Signature'), request.body):
+        logger.warning("Webhook do Calendly com assinatura inválida")
+        raise HttpError(401, "Assinatura do webhook inválida.")
+    
     try:
         body = json.loads(request.body)
-        event_type = body.get('event')
-        payload = body.get('payload', {})
-        
-        print(f"[Calendly Webhook] Evento: {event_type}")
-        print(f"[Calendly Webhook] Payload: {payload}")
-        
-        # Evento de criação de agendamento
-        if event_type == 'invitee.created':
-            invitee = payload.get('invitee', {})
-            event = payload.get('event', {})
-            
-            email = invitee.get('email', '').lower()
-            event_uri = event.get('uri', '')
-            start_time_str = event.get('start_time', '')
-            
-            print(f"[Calendly] Email: {email}, Start: {start_time_str}")
-            
-            if email and start_time_str:
-                # Busca o perfil pelo email
-                try:
-                    profile = Profile.objects.get(email__iexact=email)
-                    
-                    # Parse da data
-                    start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    
-                    # Cria ou atualiza o registro de onboarding
-                    onboarding, created = Onboarding.objects.update_or_create(
-                        person=profile,
-                        defaults={
-                            'time': start_time,
-                            'calendly_event_uri': event_uri
-                        }
-                    )
-                    
-                    # Avança o perfil para o próximo step se ainda estiver no step 1
-                    if profile.onboarding_step == Profile.STEP_KICKOFF:
-                        profile.onboarding_step = Profile.STEP_CONTRATO
-                        profile.save()
-                        print(f"[Calendly] Perfil {email} avançado para step {Profile.STEP_CONTRATO}")
-                    
-                    return {"status": "ok", "message": f"Agendamento registrado para {email}"}
-                    
-                except Profile.DoesNotExist:
-                    print(f"[Calendly] Perfil não encontrado para email: {email}")
-                    return {"status": "warning", "message": f"Perfil não encontrado: {email}"}
-        
-        # Evento de cancelamento
-        elif event_type == 'invitee.canceled':
-            invitee = payload.get('invitee', {})
-            email = invitee.get('email', '').lower()
-            
-            if email:
-                try:
-                    profile = Profile.objects.get(email__iexact=email)
-                    Onboarding.objects.filter(person=profile).delete()
-                    
-                    # Volta o step se necessário
-                    if profile.onboarding_step == Profile.STEP_CONTRATO:
-                        profile.onboarding_step = Profile.STEP_KICKOFF
-                        profile.save()
-                    
-                    return {"status": "ok", "message": f"Agendamento cancelado para {email}"}
-                except Profile.DoesNotExist:
-                    pass
-        
-        return {"status": "ok", "message": "Evento processado"}
-        
-    except Exception as e:
-        print(f"[Calendly Webhook] Erro: {e}")
-        return {"status": "error", "message": str(e)}
+    except ValueError:
+        raise HttpError(400, "Payload inválido.")
+    
+    if not isinstance(body, dict):
+        raise HttpError(400, "Payload inválido.")
+    
+    created = enqueue(
+        calendly.PROVIDER,
+        body.get('event', ''),
+        calendly.dedup_key(body, request.body),
+        body
+    )
+    logger.info(
+        "Webhook do Calendly recebido",
+        extra={'event_type': body.get('event', ''), 'enqueued': created}
+    )
+    
+    if not created:
+        return {"status": "ok", "message": "Evento já recebido"}
+    return {"status": "ok", "message": "Evento enfileirado"}
 
 
 @router.post("/dev-simulate-schedule", response=MessageSchema, auth=supabase_auth)
@@ -154,6 +157,8 @@ def dev_simulate_schedule(request):
         profile.onboarding_step = Profile.STEP_CONTRATO
         profile.save()
     
+    events.publish_schedule(profile, onboarding)
+    
     return {
         "status": "ok", 
         "message": f"Agendamento simulado para {fake_time.strftime('%d/%m/%Y às %H:%M')}"
@@ -222,8 +227,8 @@ def dev_simulate_contract(request):
 @router.post("/confirm-schedule", response=MessageSchema, auth=supabase_auth)
 def confirm_schedule(request):
     """
-    Endpoint para polling - verifica se o usuário tem agendamento e avança o step.
-    Chamado pelo frontend após redirecionar do Calendly.
+    Verifica se o usuário tem agendamento e avança o step.
+    Chamado pelo frontend ao confirmar o agendamento detectado pelo stream.
     """
     profile = request.auth
     
@@ -235,6 +240,7 @@ def confirm_schedule(request):
         if profile.onboarding_step == Profile.STEP_KICKOFF:
             profile.onboarding_step = Profile.STEP_CONTRATO
             profile.save()
+            events.publish_schedule(profile, schedule)
         
         return {
             "status": "ok", 
@@ -1,7 +1,22 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class OnboardingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.onboarding'
     verbose_name = 'Onboarding'
+
+    def ready(self):
+        from apps.webhooks.queue import register_handler
+        from . import calendly
+        register_handler(calendly.PROVIDER, calendly.process_events)
+        if not settings.CALENDLY_WEBHOOK_SIGNING_KEY:
+            if settings.DEBUG:
+                logger.warning("CALENDLY_WEBHOOK_SIGNING_KEY não configurada: webhooks do Calendly aceitos sem verificação (DEBUG)")
+            else:
+                logger.warning("CALENDLY_WEBHOOK_SIGNING_KEY não configurada: webhooks do Calendly serão rejeitados")
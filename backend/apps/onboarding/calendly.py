@@ -0,0 +1,228 @@
+"""
+Calendly webhook handling.
+The HTTP endpoint only verifies and enqueues the raw event; `process_events`
+applies batches of queued events to seal.onboarding and Profile.onboarding_step.
+"""
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.profiles.lookup import get_profiles_by_email
+from apps.profiles.models import Profile
+from .events import publish_schedule
+from .models import Onboarding
+
+PROVIDER = 'calendly'
+
+EVENT_CREATED = 'invitee.created'
+EVENT_CANCELED = 'invitee.canceled'
+
+
+def verify_signature(header: Optional[str], body: bytes) -> bool:
+    """
+    Valida o header `Calendly-Webhook-Signature` (t=<timestamp>,v1=<hmac>).
+    Sem CALENDLY_WEBHOOK_SIGNING_KEY configurada, os webhooks só são aceitos
+    sem verificação com DEBUG (desenvolvimento); fora dele, são rejeitados.
+    """
+    signing_key = settings.CALENDLY_WEBHOOK_SIGNING_KEY
+    if not signing_key:
+        return settings.DEBUG
+    if not header:
+        return False
+    parts = dict(item.split('=', 1) for item in header.split(',') if '=' in item)
+    timestamp, signature = parts.get('t'), parts.get('v1')
+    if not timestamp or not signature:
+        return False
+    try:
+        if abs(time.time() - int(timestamp)) > settings.CALENDLY_WEBHOOK_TOLERANCE:
+            return False
+    except ValueError:
+        return False
+    expected = hmac.new(
+        signing_key.encode(),
+        f"{timestamp}.".encode() + body,
+        hashlib.sha256
+    ).hexdigest()
+    # Bytes: compare_digest rejeita str com caracteres não ASCII (TypeError)
+    return hmac.compare_digest(expected.encode(), signature.encode())
+
+
+def parse_event(body: dict) -> dict:
+    """
+    Extrai os campos usados do corpo do webhook.
+    Aceita o formato v1 (payload.invitee / payload.event) e o v2
+    (payload.email / payload.scheduled_event).
+    """
+    payload = body.get('payload') or {}
+    invitee = payload.get('invitee') or {}
+    event = payload.get('event') if isinstance(payload.get('event'), dict) else {}
+    scheduled_event = payload.get('scheduled_event') or event
+
+    return {
+        'event_type': body.get('event', ''),
+        'email': (invitee.get('email') or payload.get('email') or '').strip().lower(),
+        'invitee_uri': invitee.get('uri') or invitee.get('uuid') or payload.get('uri') or '',
+        'event_uri': scheduled_event.get('uri') or scheduled_event.get('uuid') or '',
+        'start_time': scheduled_event.get('start_time') or '',
+    }
+
+
+def dedup_key(body: dict, raw_body: bytes) -> str:
+    """Chave de idempotência: tipo do evento + URIs do convidado/evento."""
+    data = parse_event(body)
+    if data['invitee_uri'] or data['event_uri']:
+        return f"{PROVIDER}:{data['event_type']}:{data['invitee_uri']}:{data['event_uri']}"
+    return f"{PROVIDER}:sha256:{hashlib.sha256(raw_body).hexdigest()}"
+
+
+def _apply_event(profile: Profile, data: dict) -> None:
+    if data['event_type'] == EVENT_CREATED:
+        start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
+        
+        # Cria ou atualiza o registro de onboarding
+        schedule, _ = Onboarding.objects.update_or_create(
+            person=profile,
+            defaults={
+                'time': start_time,
+                'calendly_event_uri': data['event_uri']
+            }
+        )
+        
+        # Avança o perfil para o próximo step se ainda estiver no step 1
+        if profile.onboarding_step == Profile.STEP_KICKOFF:
+            profile.onboarding_step = Profile.STEP_CONTRATO
+            profile.save(update_fields=['onboarding_step', 'updated_at'])
+        
+        publish_schedule(profile, schedule)
+    
+    elif data['event_type'] == EVENT_CANCELED:
+        Onboarding.objects.filter(person=profile).delete()
+        
+        # Volta o step se necessário
+        if profile.onboarding_step == Profile.STEP_CONTRATO:
+            profile.onboarding_step = Profile.STEP_KICKOFF
+            profile.save(update_fields=['onboarding_step', 'updated_at'])
+        
+        publish_schedule(profile, None)
+
+
+def process_events(events) -> Dict[int, str]:
+    """
+    Processa um lote de eventos do Calendly, em ordem de chegada.
+    Os perfis do lote são resolvidos de uma vez pelo índice/cache de email.
+    Retorna {event_id: erro} para os eventos que devem ser tentados novamente.
+    """
+    parsed = {event.id: parse_event(event.payload) for event in events}
+    emails = {data['email'] for data in parsed.values() if data['email']}
+    profiles = get_profiles_by_email(emails)
+
+    errors: Dict[int, str] = {}
+    for event in events:
+        data = parsed[event.id]
+        if data['event_type'] not in (EVENT_CREATED, EVENT_CANCELED):
+            continue
+        if not data['email'] or (data['event_type'] == EVENT_CREATED and not data['start_time']):
+            # Evento sem dados suficientes: nada a fazer, não adianta repetir
+            continue
+        profile = profiles.get(data['email'])
+        if profile is None:
+            errors[event.id] = f"Perfil não encontrado: {data['email']}"
+            continue
+        try:
+            with transaction.atomic():
+                _apply_event(profile, data)
+        except Exception as exc:
+            errors[event.id] = repr(exc)
+    return errors
+
+
+def reconcile_schedules(records: Iterable[dict], dry_run: bool = False) -> dict:
+    """
+    Reconcilia agendamentos lidos da API do Calendly com seal.onboarding.
+    `records` são convidados {email, event_uri, start_time, active}; para cada
+    perfil vale o agendamento ativo mais recente. Um perfil sem agendamento ativo
+    cujo registro aponta para um evento cancelado tem o registro removido.
+    Todas as escritas do lote são feitas em operações em massa, numa transação.
+    """
+    by_email: Dict[str, List[dict]] = {}
+    for record in records:
+        by_email.setdefault(record['email'], []).append(record)
+
+    profiles = get_profiles_by_email(by_email)
+    existing: Dict = {}
+    # ordering = ['-time']: o primeiro registro de cada perfil é o mais recente
+    for onboarding in Onboarding.objects.filter(person__in=[p.id for p in profiles.values()]):
+        existing.setdefault(onboarding.person_id, onboarding)
+
+    summary = {'created': 0, 'updated': 0, 'removed': 0, 'advanced': 0, 'reverted': 0, 'unchanged': 0}
+    missing: List[str] = []
+    to_create: List[Onboarding] = []
+    to_update: List[Onboarding] = []
+    to_delete: List[int] = []
+    advance: List[Profile] = []
+    revert: List[Profile] = []
+    changed: Dict = {}
+
+    for email, items in by_email.items():
+        profile = profiles.get(email)
+        if profile is None:
+            missing.append(email)
+            continue
+        row = existing.get(profile.id)
+        active = [record for record in items if record['active']]
+
+        if active:
+            latest = max(active, key=lambda record: record['start_time'])
+            if row is None:
+                row = Onboarding(person=profile, time=latest['start_time'], calendly_event_uri=latest['event_uri'])
+                to_create.append(row)
+                changed[profile.id] = (profile, row)
+            elif row.time != latest['start_time'] or row.calendly_event_uri != latest['event_uri']:
+                row.time = latest['start_time']
+                row.calendly_event_uri = latest['event_uri']
+                to_update.append(row)
+                changed[profile.id] = (profile, row)
+            else:
+                summary['unchanged'] += 1
+            if profile.onboarding_step == Profile.STEP_KICKOFF:
+                advance.append(profile)
+                changed[profile.id] = (profile, row)
+        elif row is not None and row.calendly_event_uri in {record['event_uri'] for record in items}:
+            to_delete.append(row.id)
+            changed[profile.id] = (profile, None)
+            if profile.onboarding_step == Profile.STEP_CONTRATO:
+                revert.append(profile)
+
+    summary.update(
+        created=len(to_create), updated=len(to_update), removed=len(to_delete),
+        advanced=len(advance), reverted=len(revert)
+    )
+    summary['missing'] = missing
+    if dry_run:
+        return summary
+
+    now = timezone.now()
+    with transaction.atomic():
+        Onboarding.objects.bulk_create(to_create)
+        Onboarding.objects.bulk_update(to_update, ['time', 'calendly_event_uri'])
+        Onboarding.objects.filter(pk__in=to_delete).delete()
+        Profile.objects.filter(
+            pk__in=[profile.id for profile in advance], onboarding_step=Profile.STEP_KICKOFF
+        ).update(onboarding_step=Profile.STEP_CONTRATO, updated_at=now)
+        Profile.objects.filter(
+            pk__in=[profile.id for profile in revert], onboarding_step=Profile.STEP_CONTRATO
+        ).update(onboarding_step=Profile.STEP_KICKOFF, updated_at=now)
+
+        for profile in advance:
+            profile.onboarding_step = Profile.STEP_CONTRATO
+        for profile in revert:
+            profile.onboarding_step = Profile.STEP_KICKOFF
+        for profile, row in changed.values():
+            publish_schedule(profile, row)
+    return summary
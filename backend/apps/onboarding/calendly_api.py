@@ -0,0 +1,103 @@
+"""
+Calendly API v2 client used to backfill/verify onboarding schedules.
+Network access is async (pooled httpx client with bounded concurrency and
+rate-limit handling); database writes stay in the synchronous reconcile step.
+"""
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+
+from django.conf import settings
+
+from core.http import AsyncAPIClient
+
+
+def _next_page(data: dict, params: dict) -> Optional[dict]:
+    token = (data.get('pagination') or {}).get('next_page_token')
+    return {'page_token': token} if token else None
+
+
+def _collection(data: dict) -> list:
+    return data.get('collection')
+
+
+def _uuid(uri: str) -> str:
+    return uri.rstrip('/').rsplit('/', 1)[-1]
+
+
+class CalendlyClient(AsyncAPIClient):
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('base_url', settings.CALENDLY_API_URL)
+        kwargs.setdefault('headers', {'Authorization': f"Bearer {settings.CALENDLY_API_TOKEN}"})
+        super().__init__(**kwargs)
+
+    async def organization_uri(self) -> str:
+        if settings.CALENDLY_ORGANIZATION_URI:
+            return settings.CALENDLY_ORGANIZATION_URI
+        data = await self.get_json('/users/me')
+        return data['resource']['current_organization']
+
+    def scheduled_events(self, organization: str, min_start: datetime, max_start: datetime):
+        """Async iterator over pages of scheduled events (active and canceled)."""
+        return self.paginate(
+            '/scheduled_events',
+            _next_page,
+            params={
+                'organization': organization,
+                'min_start_time': min_start.isoformat(),
+                'max_start_time': max_start.isoformat(),
+                'sort': 'start_time:asc',
+                'count': 100,
+            },
+            items=_collection,
+        )
+
+    async def invitees(self, event_uri: str) -> list:
+        # Caminho montado a partir do UUID: o token nunca vai para outro host
+        invitees = []
+        async for page in self.paginate(
+            f"/scheduled_events/{_uuid(event_uri)}/invitees",
+            _next_page,
+            params={'count': 100},
+            items=_collection,
+        ):
+            invitees.extend(page)
+        return invitees
+
+
+def _schedule_records(event: dict, invitees: list) -> List[dict]:
+    records = []
+    for invitee in invitees:
+        email = (invitee.get('email') or '').strip().lower()
+        if not email:
+            continue
+        records.append({
+            'email': email,
+            'event_uri': event.get('uri') or '',
+            'start_time': datetime.fromisoformat(event['start_time'].replace('Z', '+00:00')),
+            'active': event.get('status') == 'active' and invitee.get('status') == 'active',
+        })
+    return records
+
+
+async def fetch_schedules(client: CalendlyClient, min_start: datetime, max_start: datetime) -> List[dict]:
+    """
+    Busca todos os convidados dos eventos no intervalo.
+    As páginas de eventos são lidas em sequência (paginação por token) enquanto
+    os convidados de cada evento são buscados em paralelo, limitados pelo cliente.
+    Retorna registros {email, event_uri, start_time, active}.
+    """
+    organization = await client.organization_uri()
+    tasks = []
+
+    async def event_records(event):
+        return _schedule_records(event, await client.invitees(event['uri']))
+
+    async for events in client.scheduled_events(organization, min_start, max_start):
+        tasks.extend(asyncio.create_task(event_records(event)) for event in events if event.get('uri'))
+
+    records = []
+    for result in await asyncio.gather(*tasks):
+        records.extend(result)
+    return records
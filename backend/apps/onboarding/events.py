@@ -0,0 +1,29 @@
+"""
+Eventos de agendamento do kickoff (SSE).
+Publicados quando o agendamento é registrado/cancelado ou o step avança,
+consumidos pelo stream `GET /onboarding/schedule-stream`.
+"""
+from typing import Optional
+
+from core.events import publish
+from apps.profiles.models import Profile
+from .models import Onboarding
+
+EVENT_SCHEDULE = 'schedule'
+
+
+def channel(profile_id) -> str:
+    return f"onboarding:{profile_id}"
+
+
+def schedule_state(profile: Profile, schedule: Optional[Onboarding]) -> dict:
+    return {
+        "has_schedule": schedule is not None,
+        "schedule_time": schedule.time.isoformat() if schedule else None,
+        "onboarding_step": profile.onboarding_step,
+    }
+
+
+def publish_schedule(profile: Profile, schedule: Optional[Onboarding]) -> None:
+    """Notifica os streams abertos do perfil (após o commit da transação)."""
+    publish(channel(profile.id), EVENT_SCHEDULE, schedule_state(profile, schedule))
@@ -0,0 +1,94 @@
+"""
+Backfills/verifies seal.onboarding against the Calendly API.
+Useful after the webhook was down: pages scheduled events, fetches their
+invitees concurrently and reconciles them in batched writes.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.onboarding.calendly import reconcile_schedules
+from apps.onboarding.calendly_api import CalendlyClient, fetch_schedules
+from core.http import APIError
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed = parse_datetime(value) or parse_datetime(f"{value}T00:00:00")
+    if parsed is None:
+        raise CommandError(f"Data inválida: {value}")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class Command(BaseCommand):
+    help = "Sincroniza agendamentos do Calendly (API v2) com seal.onboarding e o step dos perfis."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="Início do intervalo (ISO 8601). Padrão: 30 dias atrás.")
+        parser.add_argument('--until', help="Fim do intervalo (ISO 8601). Padrão: 90 dias à frente.")
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.HTTP_CLIENT_CONCURRENCY,
+            help="Requisições simultâneas à API do Calendly.",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help="Emails reconciliados por transação.",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Apenas mostra o que seria alterado.",
+        )
+
+    def handle(self, *args, since, until, concurrency, batch_size, dry_run, **options):
+        if not settings.CALENDLY_API_TOKEN:
+            raise CommandError("Defina CALENDLY_API_TOKEN.")
+
+        now = timezone.now()
+        min_start = _parse_datetime(since) if since else now - timedelta(days=30)
+        max_start = _parse_datetime(until) if until else now + timedelta(days=90)
+
+        async def fetch():
+            async with CalendlyClient(concurrency=concurrency) as client:
+                records = await fetch_schedules(client, min_start, max_start)
+                return records, client.request_count, client.rate_limited_count
+
+        try:
+            records, request_count, rate_limited = asyncio.run(fetch())
+        except APIError as exc:
+            raise CommandError(f"Falha na API do Calendly: {exc}")
+
+        self.stdout.write(
+            f"{len(records)} convidado(s) em {request_count} requisição(ões) "
+            f"({rate_limited} limitada(s) por rate limit)."
+        )
+
+        by_email = {}
+        for record in records:
+            by_email.setdefault(record['email'], []).append(record)
+        emails = sorted(by_email)
+
+        totals = {}
+        missing = []
+        for start in range(0, len(emails), batch_size):
+            batch = [record for email in emails[start:start + batch_size] for record in by_email[email]]
+            summary = reconcile_schedules(batch, dry_run=dry_run)
+            missing.extend(summary.pop('missing'))
+            for key, value in summary.items():
+                totals[key] = totals.get(key, 0) + value
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{totals.get('created', 0)} criado(s), {totals.get('updated', 0)} atualizado(s), "
+            f"{totals.get('removed', 0)} removido(s), {totals.get('unchanged', 0)} sem mudança; "
+            f"{totals.get('advanced', 0)} perfil(is) avançado(s), {totals.get('reverted', 0)} revertido(s)."
+        ))
+        for email in missing:
+            self.stdout.write(self.style.WARNING(f"Perfil não encontrado: {email}"))
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models.functions import Lower
+from .lookup import normalize_email
 from .models import Profile
 
 
@@ -27,3 +29,11 @@ class ProfileAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Buscas por email completo usam o índice lower(email) em vez de icontains."""
+        if '@' in search_term and ' ' not in search_term.strip():
+            return queryset.annotate(email_lower=Lower('email')).filter(
+                email_lower=normalize_email(search_term)
+            ), False
+        return super().get_search_results(request, queryset, search_term)
@@ -4,7 +4,7 @@ Profile API endpoints using Django Ninja.
 from ninja import Router
 from django.shortcuts import get_object_or_404
 
-from core.auth import supabase_auth
+from core.auth import async_supabase_auth, supabase_auth
 from .models import Profile
 from .schemas import (
     ProfileOutSchema,
@@ -17,8 +17,8 @@ from .schemas import (
 router = Router()
 
 
-@router.get("/me", response=ProfileOutSchema, auth=supabase_auth)
-def get_my_profile(request):
+@router.get("/me", response=ProfileOutSchema, auth=async_supabase_auth)
+async def get_my_profile(request):
     """
     Retorna o perfil do operador logado.
     OPERAÇÃO: Identificação do Agente.
@@ -115,8 +115,11 @@ def get_dashboard_stats(request):
     Retorna estatísticas do dashboard do operador.
     OPERAÇÃO: Relatório de Guerra.
     """
-    profile = request.auth
-    
+    return dashboard_stats(request.auth)
+
+
+def dashboard_stats(profile: Profile) -> dict:
+    """Estatísticas do dashboard, calculadas a partir do perfil (sem consultas)."""
     return {
         "operador": profile.full_name or "Operador",
         "familias_salvas": profile.families_saved_count,
@@ -5,3 +5,6 @@ class ProfilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.profiles'
     verbose_name = 'Perfis de Operadores'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,89 @@
+"""
+Sincronização em massa dos emails dos perfis a partir do Supabase Auth.
+A leitura usa o cliente HTTP assíncrono com pool (Admin API, service role);
+a escrita é feita em lotes com bulk_update (um UPDATE ... CASE por lote).
+"""
+import asyncio
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.http import AsyncAPIClient
+from . import lookup
+from .models import Profile
+
+
+class SupabaseAdminClient(AsyncAPIClient):
+    """Cliente da Admin API do Supabase Auth (`/auth/v1/admin`)."""
+
+    def __init__(self, **kwargs):
+        key = settings.SUPABASE_SERVICE_ROLE_KEY
+        kwargs.setdefault('base_url', f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1")
+        kwargs.setdefault('headers', {'apikey': key, 'Authorization': f"Bearer {key}"})
+        super().__init__(**kwargs)
+
+    async def users_page(self, page: int, per_page: int):
+        response = await self.request('GET', '/admin/users', params={'page': page, 'per_page': per_page})
+        return response.json().get('users') or [], response.headers.get('x-total-count')
+
+
+async def fetch_auth_users(client: SupabaseAdminClient, per_page: int) -> List[dict]:
+    """
+    Lista todos os usuários do Auth. Com o total informado no header
+    `x-total-count`, as páginas restantes são buscadas em paralelo (limitadas
+    pelo cliente); sem ele, página a página até uma página incompleta.
+    """
+    users, total = await client.users_page(1, per_page)
+    if total is not None:
+        pages = -(-int(total) // per_page)
+        for page_users, _ in await asyncio.gather(
+            *(client.users_page(page, per_page) for page in range(2, pages + 1))
+        ):
+            users.extend(page_users)
+        return users
+
+    page = 1
+    last = users
+    while len(last) == per_page:
+        page += 1
+        last, _ = await client.users_page(page, per_page)
+        users.extend(last)
+    return users
+
+
+def sync_profile_emails(users: Iterable[dict], dry_run: bool = False) -> Dict[str, int]:
+    """
+    Preenche/atualiza `Profile.email` para um lote de usuários do Auth.
+    Uma consulta para carregar os perfis e um bulk_update para os alterados.
+    """
+    emails = {
+        str(user['id']): lookup.normalize_email(user.get('email'))
+        for user in users if user.get('id')
+    }
+    profiles = Profile.objects.filter(pk__in=list(emails)).only('id', 'email')
+
+    changed: List[Profile] = []
+    previous: List[str] = []
+    found = 0
+    now = timezone.now()
+    for profile in profiles:
+        found += 1
+        email = emails[str(profile.id)]
+        if email and lookup.normalize_email(profile.email) != email:
+            previous.append(profile.email)
+            profile.email = email
+            profile.updated_at = now
+            changed.append(profile)
+
+    if changed and not dry_run:
+        with transaction.atomic():
+            Profile.objects.bulk_update(changed, ['email', 'updated_at'])
+        # bulk_update não dispara signals: mantém o cache de email em dia
+        for email in previous:
+            lookup.forget(email)
+        for profile in changed:
+            lookup.remember(profile)
+
+    return {'updated': len(changed), 'unchanged': found - len(changed), 'without_profile': len(emails) - found}
@@ -0,0 +1,84 @@
+"""
+Indexed, cached email -> profile lookup.
+
+Emails are matched on `lower(email)`, which is backed by the functional index
+`profiles_email_lower_idx` (see `python manage.py install_profile_indexes`),
+and resolved ids are cached per email. A cached id is always checked against
+the loaded profile, so a stale entry costs one extra query instead of a wrong
+answer.
+"""
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from .models import Profile
+
+EMAIL_KEY_PREFIX = 'seal:profile-email:'
+
+INSTALL_SQL = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS profiles_email_lower_idx
+    ON seal.profiles (lower(email))
+    """,
+]
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Email em minúsculas e sem espaços."""
+    return (email or '').strip().lower()
+
+
+def _key(email: str) -> str:
+    return EMAIL_KEY_PREFIX + email
+
+
+def remember(profile: Profile) -> None:
+    """Associa o email do perfil ao seu id no cache."""
+    email = normalize_email(profile.email)
+    if email:
+        cache.set(_key(email), str(profile.id), settings.PROFILE_EMAIL_CACHE_TIMEOUT)
+
+
+def forget(email: Optional[str]) -> None:
+    """Remove o email do cache."""
+    email = normalize_email(email)
+    if email:
+        cache.delete(_key(email))
+
+
+def get_profiles_by_email(emails: Iterable[str]) -> Dict[str, Profile]:
+    """
+    Resolve vários emails de uma vez: ids em cache são carregados por PK e os
+    demais com uma consulta indexada por lower(email).
+    """
+    emails = {normalize_email(email) for email in emails} - {''}
+    if not emails:
+        return {}
+
+    cached = cache.get_many([_key(email) for email in emails])
+    to_pk = Profile._meta.pk.to_python
+    ids = {email: to_pk(cached[_key(email)]) for email in emails if _key(email) in cached}
+
+    found: Dict[str, Profile] = {}
+    if ids:
+        by_id = Profile.objects.in_bulk(list(ids.values()))
+        for email, profile_id in ids.items():
+            profile = by_id.get(profile_id)
+            if profile is not None and normalize_email(profile.email) == email:
+                found[email] = profile
+            else:
+                forget(email)
+
+    missing = emails - set(found)
+    if missing:
+        for profile in Profile.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=missing):
+            found.setdefault(profile.email_lower, profile)
+            remember(profile)
+    return found
+
+
+def get_profile_by_email(email: str) -> Optional[Profile]:
+    """Busca um perfil pelo email, sem diferenciar maiúsculas."""
+    return get_profiles_by_email([email]).get(normalize_email(email))
@@ -0,0 +1,37 @@
+"""
+Installs the PostgreSQL index used by case-insensitive profile email lookups.
+Safe to run more than once.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.profiles.lookup import INSTALL_SQL
+
+
+class Command(BaseCommand):
+    help = "Cria o índice funcional lower(email) em seal.profiles (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--print',
+            action='store_true',
+            dest='print_only',
+            help="Apenas imprime o SQL, sem executar.",
+        )
+
+    def handle(self, *args, print_only=False, **options):
+        if print_only:
+            for statement in INSTALL_SQL:
+                self.stdout.write(statement.strip() + ';\n')
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError("O índice de email de perfis requer PostgreSQL.")
+
+        # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação:
+        # cada comando é executado em autocommit.
+        with connection.cursor() as cursor:
+            for statement in INSTALL_SQL:
+                self.stdout.write(statement.strip().splitlines()[0] + ' ...')
+                cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS("Índice de email de perfis instalado."))
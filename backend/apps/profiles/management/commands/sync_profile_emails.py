@@ -0,0 +1,66 @@
+"""
+Fills/updates profile emails from Supabase Auth users, in batches.
+"""
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profiles.auth_sync import SupabaseAdminClient, fetch_auth_users, sync_profile_emails
+from core.http import APIError
+
+
+class Command(BaseCommand):
+    help = "Sincroniza seal.profiles.email com os usuários do Supabase Auth (Admin API)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--per-page',
+            type=int,
+            default=1000,
+            help="Usuários por página da Admin API.",
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.HTTP_CLIENT_CONCURRENCY,
+            help="Requisições simultâneas ao Supabase.",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Perfis por UPDATE em lote.",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Apenas mostra o que seria alterado.",
+        )
+
+    def handle(self, *args, per_page, concurrency, batch_size, dry_run, **options):
+        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
+            raise CommandError("Defina SUPABASE_URL e SUPABASE_SERVICE_ROLE_KEY.")
+
+        async def fetch():
+            async with SupabaseAdminClient(concurrency=concurrency) as client:
+                return await fetch_auth_users(client, per_page), client.request_count
+
+        try:
+            users, request_count = asyncio.run(fetch())
+        except APIError as exc:
+            raise CommandError(f"Falha na Admin API do Supabase: {exc}")
+
+        self.stdout.write(f"{len(users)} usuário(s) em {request_count} requisição(ões).")
+
+        totals = {'updated': 0, 'unchanged': 0, 'without_profile': 0}
+        for start in range(0, len(users), batch_size):
+            summary = sync_profile_emails(users[start:start + batch_size], dry_run=dry_run)
+            for key, value in summary.items():
+                totals[key] += value
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{totals['updated']} email(s) atualizado(s), {totals['unchanged']} sem mudança, "
+            f"{totals['without_profile']} usuário(s) sem perfil."
+        ))
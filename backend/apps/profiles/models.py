@@ -4,6 +4,12 @@ Central user state and gamification data.
 """
 import uuid
 from django.db import models
+from core.response_cache import TaggedQuerySet
+
+
+class ProfileQuerySet(TaggedQuerySet):
+    cache_tag = 'profile:{profile}'
+    cache_tag_field = 'id'
 
 
 class Profile(models.Model):
@@ -102,6 +108,8 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProfileQuerySet.as_manager()
+    
     class Meta:
         managed = False  # Não sobrescrever o banco existente do Supabase
         db_table = '"seal"."profiles"'
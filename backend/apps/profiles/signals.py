@@ -0,0 +1,35 @@
+"""
+Signals keeping the email -> profile cache and the cached responses that read
+profile fields in sync.
+"""
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from core.response_cache import invalidate_instance
+from . import lookup
+from .models import Profile
+
+
+@receiver(pre_save, sender=Profile)
+def normalize_profile_email(sender, instance, **kwargs):
+    """Armazena o email sempre normalizado (minúsculas, sem espaços)."""
+    if instance.email:
+        instance.email = lookup.normalize_email(instance.email)
+
+
+@receiver(post_save, sender=Profile)
+def cache_profile_email(sender, instance, **kwargs):
+    """Atualiza o cache com o email atual do perfil."""
+    lookup.remember(instance)
+
+
+@receiver(post_delete, sender=Profile)
+def forget_profile_email(sender, instance, **kwargs):
+    """Remove o email do perfil excluído do cache."""
+    lookup.forget(instance.email)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Invalida as respostas em cache que leem campos do perfil (meta, comissão atual)."""
+    invalidate_instance(instance)
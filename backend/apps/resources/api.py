@@ -3,14 +3,29 @@ Resources API endpoints using Django Ninja.
 Manages scripts, playbooks, and downloadable resources (Arsenal).
 """
 from typing import List
+from asgiref.sync import sync_to_async
 from ninja import Router
 from ninja.errors import HttpError
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum
+from django.urls import reverse
+from django.utils.text import slugify
 
-from core.auth import supabase_auth
+from core.auth import async_supabase_auth, supabase_auth
+from core.conditional import etag_condition
+from core.fields import parse_fields, serialize, sparse_response
+from core.response_cache import cached_response
+from core.files import serve_file
 from apps.profiles.models import Profile
+from .catalog import (
+    DOWNLOADS_TAG,
+    get_active_resources,
+    get_category_stats,
+    get_downloads_version,
+    get_resources_version,
+    record_download,
+)
 from .models import Resource
+from . import storage
 from .schemas import (
     ResourceOutSchema,
     ResourcesByCategorySchema,
@@ -32,8 +47,24 @@ def check_operational_access(profile: Profile):
         )
 
 
-@router.get("/arsenal", response=ResourcesByCategorySchema, auth=supabase_auth)
-def get_arsenal(request):
+def catalog_etag(request, *args, **kwargs) -> str:
+    """
+    ETag das rotas de catálogo: depende apenas da versão do Arsenal.
+    Verifica o acesso antes de responder 304.
+    """
+    check_operational_access(request.auth)
+    return get_resources_version()
+
+
+def categories_etag(request, *args, **kwargs) -> str:
+    """ETag de /categories: versão do catálogo e dos contadores de download."""
+    return f"{catalog_etag(request)}-{get_downloads_version()}"
+
+
+@router.get("/arsenal", response=ResourcesByCategorySchema, auth=async_supabase_auth)
+@etag_condition(catalog_etag)
+@cached_response('catalog')
+async def get_arsenal(request):
     """
     Retorna todos os recursos do Arsenal organizados por categoria.
     OPERAÇÃO: Inventário do Arsenal.
@@ -41,7 +72,8 @@ def get_arsenal(request):
     profile = request.auth
     check_operational_access(profile)
     
-    resources = Resource.objects.filter(is_active=True)
+    # Lista em cache (versionada); consulta o banco apenas quando o catálogo muda
+    resources = await sync_to_async(get_active_resources)()
     
     # Organiza por categoria
     arsenal = {
@@ -60,28 +92,37 @@ def get_arsenal(request):
         PLAYBOOK=arsenal['PLAYBOOK'],
         TEMPLATE=arsenal['TEMPLATE'],
         GUIDE=arsenal['GUIDE'],
-        total_count=resources.count()
+        total_count=len(resources)
     )
 
 
 @router.get("/list", response=List[ResourceOutSchema], auth=supabase_auth)
-def list_resources(request, category: str = None):
+@etag_condition(catalog_etag)
+@cached_response('catalog')
+def list_resources(request, category: str = None, fields: str = None):
     """
     Lista recursos, opcionalmente filtrados por categoria.
+    `fields=id,title,...` retorna apenas esses campos (a lista vem do cache do catálogo).
     OPERAÇÃO: Busca no Arsenal.
     """
     profile = request.auth
     check_operational_access(profile)
+    selected = parse_fields(fields, ResourceOutSchema)
     
-    resources = Resource.objects.filter(is_active=True)
+    resources = get_active_resources()
     
     if category:
-        resources = resources.filter(category=category.upper())
+        category = category.upper()
+        resources = [resource for resource in resources if resource.category == category]
     
-    return list(resources)
+    if selected:
+        return sparse_response(request, serialize(ResourceOutSchema, selected, resources))
+    return resources
 
 
 @router.get("/categories", response=List[CategoryStatsSchema], auth=supabase_auth)
+@etag_condition(categories_etag)
+@cached_response('catalog', DOWNLOADS_TAG)
 def get_categories_stats(request):
     """
     Retorna estatísticas por categoria de recursos.
@@ -90,29 +131,11 @@ def get_categories_stats(request):
     profile = request.auth
     check_operational_access(profile)
     
-    category_display = {
-        'SCRIPT': 'Scripts de Vendas',
-        'PLAYBOOK': 'Playbooks Táticos',
-        'TEMPLATE': 'Templates',
-        'GUIDE': 'Guias e Manuais',
-    }
-    
-    stats = []
-    for cat_code, cat_name in category_display.items():
-        resources = Resource.objects.filter(is_active=True, category=cat_code)
-        total_downloads = resources.aggregate(total=Sum('download_count'))['total'] or 0
-        
-        stats.append(CategoryStatsSchema(
-            category=cat_code,
-            category_display=cat_name,
-            count=resources.count(),
-            total_downloads=total_downloads
-        ))
-    
-    return stats
+    return [CategoryStatsSchema(**stats) for stats in get_category_stats()]
 
 
 @router.get("/{resource_id}", response=ResourceOutSchema, auth=supabase_auth)
+@cached_response('catalog')
 def get_resource(request, resource_id: int):
     """
     Retorna detalhes de um recurso específico.
@@ -136,13 +159,43 @@ def register_download(request, resource_id: int):
     
     resource = get_object_or_404(Resource, id=resource_id, is_active=True)
     
-    # Incrementa contador de downloads
-    resource.download_count += 1
-    resource.save()
+    # Incrementa o contador sem invalidar o catálogo (ETags e caches das listas)
+    record_download(resource.id)
+    
+    file_url = resource.file_url
+    if storage.is_local(file_url):
+        # Arquivo servido pelo próprio backend via link assinado
+        path = reverse(
+            f"{request.resolver_match.namespace}:resource_file",
+            kwargs={'resource_id': resource.id}
+        )
+        token = storage.sign_download(resource.id)
+        file_url = request.build_absolute_uri(f"{path}?token={token}")
     
     return {
         "status": "EQUIPAMENTO LIBERADO",
         "message": f"Download de '{resource.title}' autorizado.",
-        "file_url": resource.file_url,
+        "file_url": file_url,
         "file_type": resource.file_type
     }
+
+
+@router.get("/{resource_id}/file", url_name="resource_file")
+def download_file(request, resource_id: int, token: str):
+    """
+    Entrega o arquivo de um recurso armazenado localmente.
+    Autorizado apenas pelo token assinado emitido em /download (link ao portador,
+    válido por RESOURCES_DOWNLOAD_MAX_AGE); suporta Range e sendfile.
+    OPERAÇÃO: Entrega de Equipamento.
+    """
+    if not storage.verify_download(token, resource_id):
+        raise HttpError(403, "ACESSO NEGADO: Link de download inválido ou expirado.")
+    
+    resource = get_object_or_404(Resource, id=resource_id, is_active=True)
+    
+    path = storage.resolve_local_path(resource.file_url) if storage.is_local(resource.file_url) else None
+    if path is None:
+        raise HttpError(404, "Arquivo não encontrado no armazenamento.")
+    
+    filename = f"{slugify(resource.title) or 'recurso'}{path.suffix}"
+    return serve_file(request, path, storage.storage_root(), filename=filename, as_attachment=True)
@@ -5,3 +5,6 @@ class ResourcesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.resources'
     verbose_name = 'Arsenal de Recursos'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,100 @@
+"""
+Arsenal catalog versioning and cached reads.
+The version token changes whenever a resource is saved or removed; catalog
+data cached under it is therefore never stale and the Arsenal is served
+without queries while warm.
+
+Downloads only increment a counter and have their own version: they refresh
+the category stats but keep the catalog version (ETags, cached lists), so the
+`download_count` of listed resources is the value at the last catalog change.
+"""
+from typing import Dict, List
+
+from django.db.models import Count, Sum
+
+from core.cache import bump_version, get_version, get_versioned, queryset_version
+from core.response_cache import invalidate
+from .models import Resource
+
+RESOURCES_VERSION_SCOPE = 'resources'
+DOWNLOADS_VERSION_SCOPE = 'resources-downloads'
+# Response cache tag of the routes showing download totals
+DOWNLOADS_TAG = 'catalog-downloads'
+
+CATEGORY_DISPLAY = {
+    Resource.CATEGORY_SCRIPT: 'Scripts de Vendas',
+    Resource.CATEGORY_PLAYBOOK: 'Playbooks Táticos',
+    Resource.CATEGORY_TEMPLATE: 'Templates',
+    Resource.CATEGORY_GUIDE: 'Guias e Manuais',
+}
+
+
+def get_resources_version() -> str:
+    """Versão atual do catálogo do Arsenal."""
+    return get_version(
+        RESOURCES_VERSION_SCOPE,
+        lambda: queryset_version(Resource.objects.all())
+    )
+
+
+def get_downloads_version() -> str:
+    """Versão dos contadores de download (muda a cada download)."""
+    return get_version(
+        DOWNLOADS_VERSION_SCOPE,
+        lambda: str(Resource.objects.aggregate(total=Sum('download_count'))['total'] or 0)
+    )
+
+
+def record_download(resource_id: int) -> None:
+    """Conta um download e invalida apenas as estatísticas, não o catálogo."""
+    Resource.objects.filter(pk=resource_id).increment_downloads()
+    bump_version(DOWNLOADS_VERSION_SCOPE)
+    invalidate(DOWNLOADS_TAG)
+
+
+def get_active_resources() -> List[Resource]:
+    """Recursos ativos do Arsenal, em cache pela versão do catálogo (1 query a frio)."""
+    return get_versioned(
+        RESOURCES_VERSION_SCOPE,
+        'active',
+        get_resources_version(),
+        lambda: list(Resource.objects.filter(is_active=True))
+    )
+
+
+def _query_category_stats() -> Dict[str, dict]:
+    rows = (
+        Resource.objects.filter(is_active=True)
+        .order_by()
+        .values('category')
+        .annotate(count=Count('id'), total_downloads=Sum('download_count'))
+    )
+    return {
+        row['category']: {
+            'count': row['count'],
+            'total_downloads': row['total_downloads'] or 0,
+        }
+        for row in rows
+    }
+
+
+def get_category_stats() -> List[dict]:
+    """
+    Estatísticas por categoria em um único GROUP BY, em cache pelas versões do
+    catálogo e dos downloads.
+    """
+    grouped = get_versioned(
+        RESOURCES_VERSION_SCOPE,
+        'category-stats',
+        f"{get_resources_version()}:{get_downloads_version()}",
+        _query_category_stats
+    )
+    return [
+        {
+            'category': code,
+            'category_display': name,
+            'count': grouped.get(code, {}).get('count', 0),
+            'total_downloads': grouped.get(code, {}).get('total_downloads', 0),
+        }
+        for code, name in CATEGORY_DISPLAY.items()
+    ]
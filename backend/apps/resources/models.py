@@ -3,6 +3,20 @@ Resource model - Maps to seal.resources table in Supabase.
 Manages scripts, playbooks, and downloadable resources.
 """
 from django.db import models
+from django.db.models import F
+from core.response_cache import TaggedQuerySet
+
+
+class ResourceQuerySet(TaggedQuerySet):
+    cache_tag = 'catalog'
+
+    def increment_downloads(self) -> int:
+        """
+        Soma 1 ao download_count num UPDATE atômico (sem corrida entre downloads
+        simultâneos). Não passa por `save` nem pelo `update` com tags: um
+        download não deve invalidar o catálogo (ver catalog.record_download).
+        """
+        return models.QuerySet.update(self, download_count=F('download_count') + 1)
 
 
 class Resource(models.Model):
@@ -44,7 +58,7 @@ class Resource(models.Model):
     )
     
     file_url = models.TextField(
-        help_text="URL do arquivo para download"
+        help_text="URL do arquivo para download (ou local://<caminho> para armazenamento local)"
     )
     
     thumbnail_url = models.TextField(
@@ -78,6 +92,8 @@ class Resource(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ResourceQuerySet.as_manager()
+    
     class Meta:
         managed = False  # Não sobrescrever o banco existente do Supabase
         db_table = '"seal"."resources"'
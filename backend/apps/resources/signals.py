@@ -0,0 +1,17 @@
+"""
+Signals for the Arsenal catalog.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from core.response_cache import invalidate_instance
+from .catalog import RESOURCES_VERSION_SCOPE
+from .models import Resource
+
+
+@receiver([post_save, post_delete], sender=Resource)
+def invalidate_resources_catalog(sender, instance, **kwargs):
+    """Invalida a versão do catálogo e as respostas em cache quando um recurso muda."""
+    bump_version(RESOURCES_VERSION_SCOPE)
+    invalidate_instance(instance)
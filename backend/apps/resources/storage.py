@@ -0,0 +1,59 @@
+"""
+Local storage for Arsenal resources.
+Resources whose `file_url` starts with `local://` are stored under
+RESOURCES_STORAGE_ROOT and served by the backend through signed,
+expiring download links. A link is a bearer URL: it is issued only to an
+authenticated operator with access, but anyone holding it can download the
+resource until it expires (RESOURCES_DOWNLOAD_MAX_AGE).
+"""
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+LOCAL_PREFIX = 'local://'
+DOWNLOAD_SALT = 'seal.resources.download'
+
+
+def is_local(file_url: Optional[str]) -> bool:
+    """Indica se o recurso está armazenado localmente."""
+    return bool(file_url) and file_url.startswith(LOCAL_PREFIX)
+
+
+def storage_root() -> Path:
+    """Diretório raiz do armazenamento local do Arsenal."""
+    return Path(settings.RESOURCES_STORAGE_ROOT).resolve()
+
+
+def resolve_local_path(file_url: str) -> Optional[Path]:
+    """
+    Resolve o caminho local de um recurso dentro da raiz de armazenamento.
+    Retorna None se o caminho sair da raiz ou o arquivo não existir.
+    """
+    relative = file_url[len(LOCAL_PREFIX):].lstrip('/')
+    try:
+        path = Path(safe_join(storage_root(), relative))
+    except SuspiciousFileOperation:
+        return None
+    return path if path.is_file() else None
+
+
+def sign_download(resource_id: int) -> str:
+    """Gera token assinado (e com validade) para download de um recurso."""
+    return signing.dumps({'r': resource_id}, salt=DOWNLOAD_SALT)
+
+
+def verify_download(token: str, resource_id: int) -> bool:
+    """Valida o token de download (assinatura, validade e recurso)."""
+    try:
+        data = signing.loads(
+            token,
+            salt=DOWNLOAD_SALT,
+            max_age=settings.RESOURCES_DOWNLOAD_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return data.get('r') == resource_id
@@ -0,0 +1,45 @@
+"""
+Search API endpoints using Django Ninja.
+Full-text search over the Arsenal and training catalog, served from memory.
+"""
+from ninja import Router
+
+from core.auth import supabase_auth
+from core.response_cache import cached_response
+from apps.profiles.models import Profile
+from .index import DOC_MODULE, DOC_RESOURCE, catalog_index
+from .schemas import SearchResponseSchema
+
+router = Router()
+
+MAX_RESULTS = 50
+
+
+@router.get("/", response=SearchResponseSchema, auth=supabase_auth)
+@cached_response('catalog')
+def search_catalog(request, q: str, types: str = None, limit: int = 20):
+    """
+    Busca recursos do Arsenal e módulos de treinamento por título e descrição.
+    Sem acentos, por prefixo e ordenado por relevância.
+    OPERAÇÃO: Varredura do Arsenal.
+    """
+    profile = request.auth
+    
+    kinds = {DOC_RESOURCE, DOC_MODULE}
+    if types:
+        kinds &= {kind.strip().lower() for kind in types.split(',')}
+    
+    # CADEADO: Arsenal apenas para operadores com acesso total
+    if profile.onboarding_step < Profile.STEP_OPERACIONAL:
+        kinds.discard(DOC_RESOURCE)
+    
+    results = []
+    if kinds:
+        catalog_index.ensure_fresh()
+        results = catalog_index.search(q, kinds=kinds, limit=max(1, min(limit, MAX_RESULTS)))
+    
+    for result in results:
+        if result['type'] == DOC_MODULE:
+            result['is_locked'] = result['required_step'] > profile.onboarding_step
+    
+    return {"query": q, "total": len(results), "results": results}
@@ -0,0 +1,219 @@
+"""
+In-process inverted index over the Arsenal and training catalog.
+
+The catalog is small and read-heavy, so it is kept entirely in memory:
+accent-insensitive Portuguese tokenization, prefix matching over a sorted
+vocabulary and TF-IDF ranking with field weights. Saves in this process
+update the index incrementally; changes made by other processes are picked
+up through the catalog version tokens and trigger a full rebuild.
+"""
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from core import singleflight
+from core.text import normalize
+from apps.resources.catalog import get_resources_version
+from apps.resources.models import Resource
+from apps.training.catalog import get_modules_version
+from apps.training.models import TrainingModule
+
+DOC_RESOURCE = 'resource'
+DOC_MODULE = 'module'
+
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+PREFIX_FACTOR = 0.6
+MAX_PREFIX_EXPANSIONS = 50
+
+STOPWORDS = frozenset({
+    'a', 'ao', 'aos', 'as', 'com', 'da', 'das', 'de', 'do', 'dos', 'e', 'em',
+    'na', 'nas', 'no', 'nos', 'o', 'os', 'ou', 'para', 'pela', 'pelo', 'por',
+    'que', 'se', 'sem', 'um', 'uma', 'uns', 'umas',
+})
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+DocKey = Tuple[str, int]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Tokeniza texto em português, ignorando acentos e stopwords."""
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
+
+
+def current_version() -> str:
+    """Versão combinada dos catálogos indexados."""
+    return f"{get_resources_version()}|{get_modules_version()}"
+
+
+class CatalogIndex:
+    """
+    Índice invertido em memória: token -> {documento: peso}.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[DocKey, float]] = defaultdict(dict)
+        self._doc_tokens: Dict[DocKey, Dict[str, float]] = {}
+        self._docs: Dict[DocKey, dict] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self.version: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Indexação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _document(kind: str, obj) -> dict:
+        doc = {
+            'type': kind,
+            'id': obj.id,
+            'title': obj.title,
+            'description': obj.description,
+        }
+        if kind == DOC_RESOURCE:
+            doc.update(category=obj.category, file_type=obj.file_type)
+        else:
+            doc.update(required_step=obj.required_step, duration_minutes=obj.duration_minutes)
+        return doc
+
+    @staticmethod
+    def _weights(obj) -> Dict[str, float]:
+        weights: Dict[str, float] = defaultdict(float)
+        for token in tokenize(obj.title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(obj.description):
+            weights[token] += DESCRIPTION_WEIGHT
+        return weights
+
+    def _remove_locked(self, key: DocKey) -> None:
+        for token in self._doc_tokens.pop(key, {}):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+        self._docs.pop(key, None)
+
+    def _add_locked(self, kind: str, obj) -> None:
+        key = (kind, obj.id)
+        weights = self._weights(obj)
+        for token, weight in weights.items():
+            if token not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[token][key] = weight
+        self._doc_tokens[key] = dict(weights)
+        self._docs[key] = self._document(kind, obj)
+
+    def upsert(self, kind: str, obj) -> None:
+        """Atualiza um documento (removendo-o se estiver inativo)."""
+        with self._lock:
+            self._remove_locked((kind, obj.id))
+            if obj.is_active:
+                self._add_locked(kind, obj)
+
+    def remove(self, kind: str, obj_id: int) -> None:
+        """Remove um documento do índice."""
+        with self._lock:
+            self._remove_locked((kind, obj_id))
+
+    def rebuild(self) -> None:
+        """Reconstrói o índice inteiro a partir do banco."""
+        version = current_version()
+        resources = list(Resource.objects.filter(is_active=True))
+        modules = list(TrainingModule.objects.filter(is_active=True))
+        fresh = CatalogIndex()
+        for resource in resources:
+            fresh._add_locked(DOC_RESOURCE, resource)
+        for module in modules:
+            fresh._add_locked(DOC_MODULE, module)
+        fresh._vocabulary = sorted(fresh._postings)
+        with self._lock:
+            self._postings = fresh._postings
+            self._doc_tokens = fresh._doc_tokens
+            self._docs = fresh._docs
+            self._vocabulary = fresh._vocabulary
+            self._vocabulary_dirty = False
+            self.version = version
+
+    def ensure_fresh(self) -> None:
+        """
+        Reconstrói o índice se o catálogo mudou em outro processo.
+        Buscas simultâneas aguardam uma única reconstrução.
+        """
+        if self.version != current_version():
+            singleflight.do(f"search-index:{id(self)}", self._rebuild_if_stale)
+
+    def _rebuild_if_stale(self) -> None:
+        # Quem aguardava uma reconstrução anterior não precisa de outra
+        if self.version != current_version():
+            self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        expansions = []
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and len(expansions) < MAX_PREFIX_EXPANSIONS:
+            token = self._vocabulary[position]
+            if not token.startswith(term):
+                break
+            expansions.append((token, 1.0 if token == term else PREFIX_FACTOR))
+            position += 1
+        return expansions
+
+    def search(self, query: str, kinds=None, limit: int = 20) -> List[dict]:
+        """
+        Busca documentos contendo todos os termos (por prefixo), ordenados por relevância.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            total_docs = max(len(self._docs), 1)
+            scores: Optional[Dict[DocKey, float]] = None
+            for term in terms:
+                term_scores: Dict[DocKey, float] = {}
+                for token, factor in self._expand(term):
+                    postings = self._postings[token]
+                    idf = math.log(1 + total_docs / len(postings))
+                    for key, weight in postings.items():
+                        if kinds and key[0] not in kinds:
+                            continue
+                        score = weight * idf * factor
+                        if score > term_scores.get(key, 0.0):
+                            term_scores[key] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        key: score + term_scores[key]
+                        for key, score in scores.items()
+                        if key in term_scores
+                    }
+                if not scores:
+                    return []
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], self._docs[item[0]]['title'])
+            )[:limit]
+            return [dict(self._docs[key], score=round(score, 4)) for key, score in ranked]
+
+
+catalog_index = CatalogIndex()
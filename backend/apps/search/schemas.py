@@ -0,0 +1,26 @@
+"""
+Pydantic schemas for Search API endpoints.
+"""
+from typing import Optional, List
+from ninja import Schema
+
+
+class SearchResultSchema(Schema):
+    """Schema de um resultado de busca no catálogo."""
+    type: str
+    id: int
+    title: str
+    description: Optional[str] = None
+    score: float
+    category: Optional[str] = None
+    file_type: Optional[str] = None
+    required_step: Optional[int] = None
+    duration_minutes: Optional[int] = None
+    is_locked: bool = False
+
+
+class SearchResponseSchema(Schema):
+    """Schema de resposta da busca."""
+    query: str
+    total: int
+    results: List[SearchResultSchema]
@@ -0,0 +1,37 @@
+"""
+Keep the in-process search index in sync with catalog saves.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.resources.models import Resource
+from apps.training.models import TrainingModule
+from .index import DOC_MODULE, DOC_RESOURCE, catalog_index, current_version
+
+DOC_KINDS = {Resource: DOC_RESOURCE, TrainingModule: DOC_MODULE}
+
+
+def _after_commit(update):
+    def apply():
+        if catalog_index.version is None:
+            # Índice ainda não construído: será montado na primeira busca
+            return
+        update()
+        catalog_index.version = current_version()
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Resource)
+@receiver(post_save, sender=TrainingModule)
+def index_catalog_item(sender, instance, **kwargs):
+    """Atualiza incrementalmente o documento salvo."""
+    _after_commit(lambda: catalog_index.upsert(DOC_KINDS[sender], instance))
+
+
+@receiver(post_delete, sender=Resource)
+@receiver(post_delete, sender=TrainingModule)
+def unindex_catalog_item(sender, instance, **kwargs):
+    """Remove o documento excluído do índice."""
+    instance_id = instance.id
+    _after_commit(lambda: catalog_index.remove(DOC_KINDS[sender], instance_id))
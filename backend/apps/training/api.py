@@ -2,15 +2,22 @@
 Training API endpoints using Django Ninja.
 Manages training modules and progress tracking.
 """
+import asyncio
+import logging
 from typing import List
 from datetime import datetime
 from ninja import Router
 from ninja.errors import HttpError
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from asgiref.sync import sync_to_async
 
-from core.auth import supabase_auth
+from core.aio import alist
+from core.auth import async_supabase_auth, supabase_auth
+from core.conditional import etag_condition
+from core.response_cache import cached_response
 from apps.profiles.models import Profile
+from .catalog import get_active_modules, get_modules_version, get_progress_version
 from .models import TrainingModule, ModuleProgress
 from .schemas import (
     TrainingModuleOutSchema,
@@ -20,24 +27,43 @@ from .schemas import (
 )
 
 router = Router()
+logger = logging.getLogger(__name__)
 
 
-@router.get("/modules", response=TrainingOverviewSchema, auth=supabase_auth)
-def get_training_overview(request):
+def overview_etag(request, *args, **kwargs) -> str:
+    """
+    ETag da visão geral: catálogo de módulos + step e progresso do perfil.
+    """
+    profile = request.auth
+    return ':'.join([
+        get_modules_version(),
+        str(profile.id),
+        str(profile.onboarding_step),
+        get_progress_version(profile.id),
+    ])
+
+
+@router.get("/modules", response=TrainingOverviewSchema, auth=async_supabase_auth)
+@etag_condition(overview_etag)
+@cached_response('catalog', 'progress:{profile}')
+async def get_training_overview(request):
     """
     Retorna visão geral dos módulos de treinamento com progresso.
     OPERAÇÃO: Briefing de Missões de Treinamento.
     """
-    profile = request.auth
+    return await build_training_overview(request.auth)
+
+
+async def build_training_overview(profile: Profile) -> TrainingOverviewSchema:
+    """Visão geral dos módulos com o progresso do perfil (também usada pelo bootstrap do War Room)."""
     user_step = profile.onboarding_step
     
-    # Busca todos os módulos ativos
-    all_modules = TrainingModule.objects.filter(is_active=True)
-    
-    # Busca progresso do usuário
-    progress_map = {
-        p.module_id: p for p in ModuleProgress.objects.filter(profile=profile)
-    }
+    # Módulos ativos (em cache pela versão do catálogo) e o progresso do usuário
+    all_modules, progress = await asyncio.gather(
+        sync_to_async(get_active_modules)(),
+        alist(ModuleProgress.objects.filter(profile=profile)),
+    )
+    progress_map = {p.module_id: p for p in progress}
     
     modules_with_progress = []
     completed_count = 0
@@ -87,6 +113,7 @@ def get_training_overview(request):
 
 
 @router.get("/modules/{module_id}", response=TrainingModuleWithProgressSchema, auth=supabase_auth)
+@cached_response('catalog', 'progress:{profile}')
 def get_module_detail(request, module_id: int):
     """
     Retorna detalhes de um módulo específico.
@@ -135,42 +162,38 @@ def mark_module_complete(request, module_id: int):
     OPERAÇÃO: Missão Cumprida.
     """
     profile = request.auth
-    print(f"[Training] Completando módulo {module_id} para perfil {profile.id}")
+    module = get_object_or_404(TrainingModule, id=module_id, is_active=True)
     
-    try:
-        module = get_object_or_404(TrainingModule, id=module_id, is_active=True)
-        print(f"[Training] Módulo encontrado: {module.title}")
-        
-        # Verifica se está bloqueado
-        if module.required_step > profile.onboarding_step:
-            raise HttpError(403, "ACESSO NEGADO: Módulo bloqueado.")
-        
-        # Cria ou atualiza progresso
-        progress, created = ModuleProgress.objects.get_or_create(
-            profile=profile,
-            module=module,
-            defaults={'completed': True, 'completed_at': timezone.now()}
-        )
-        print(f"[Training] Progresso criado: {created}, completed: {progress.completed}")
-        
-        if not created and not progress.completed:
-            progress.completed = True
-            progress.completed_at = timezone.now()
-            progress.save()
-            print(f"[Training] Progresso atualizado")
-        
-        return {
-            "status": "MISSÃO CUMPRIDA",
-            "message": f"Módulo '{module.title}' concluído com sucesso.",
-            "module_id": module.id,
-            "completed_at": progress.completed_at
-        }
-    except Exception as e:
-        print(f"[Training] Erro ao completar módulo: {e}")
-        raise
+    # Verifica se está bloqueado
+    if module.required_step > profile.onboarding_step:
+        raise HttpError(403, "ACESSO NEGADO: Módulo bloqueado.")
+    
+    # Cria ou atualiza progresso
+    progress, created = ModuleProgress.objects.get_or_create(
+        profile=profile,
+        module=module,
+        defaults={'completed': True, 'completed_at': timezone.now()}
+    )
+    
+    if not created and not progress.completed:
+        progress.completed = True
+        progress.completed_at = timezone.now()
+        progress.save()
+    
+    logger.info(
+        "Módulo concluído",
+        extra={'module_id': module.id, 'profile_id': str(profile.id), 'progress_created': created}
+    )
+    return {
+        "status": "MISSÃO CUMPRIDA",
+        "message": f"Módulo '{module.title}' concluído com sucesso.",
+        "module_id": module.id,
+        "completed_at": progress.completed_at
+    }
 
 
 @router.get("/pending", response=List[TrainingModuleWithProgressSchema], auth=supabase_auth)
+@cached_response('catalog', 'progress:{profile}')
 def get_pending_modules(request):
     """
     Retorna módulos pendentes (não concluídos e disponíveis).
@@ -5,3 +5,6 @@ class TrainingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.training'
     verbose_name = 'Módulos de Treinamento'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,42 @@
+"""
+Training catalog versioning.
+Tracks version tokens for the module catalog and for each profile's progress,
+used to answer conditional requests without querying the database.
+"""
+from typing import List
+
+from core.cache import get_version, get_versioned, queryset_version
+from .models import TrainingModule, ModuleProgress
+
+MODULES_VERSION_SCOPE = 'training'
+
+
+def progress_version_scope(profile_id) -> str:
+    """Escopo de versão do progresso de um perfil."""
+    return f"progress:{profile_id}"
+
+
+def get_modules_version() -> str:
+    """Versão atual do catálogo de módulos de treinamento."""
+    return get_version(
+        MODULES_VERSION_SCOPE,
+        lambda: queryset_version(TrainingModule.objects.all())
+    )
+
+
+def get_active_modules() -> List[TrainingModule]:
+    """Módulos ativos, em cache pela versão do catálogo (1 query a frio)."""
+    return get_versioned(
+        MODULES_VERSION_SCOPE,
+        'active',
+        get_modules_version(),
+        lambda: list(TrainingModule.objects.filter(is_active=True))
+    )
+
+
+def get_progress_version(profile_id) -> str:
+    """Versão atual do progresso de treinamento de um perfil."""
+    return get_version(
+        progress_version_scope(profile_id),
+        lambda: queryset_version(ModuleProgress.objects.filter(profile_id=profile_id))
+    )
@@ -3,6 +3,11 @@ Training Module model - Maps to seal.training_modules table in Supabase.
 Manages training videos and content for strategists.
 """
 from django.db import models
+from core.response_cache import TaggedQuerySet
+
+
+class TrainingModuleQuerySet(TaggedQuerySet):
+    cache_tag = 'catalog'
 
 
 class TrainingModule(models.Model):
@@ -58,6 +63,8 @@ class TrainingModule(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TrainingModuleQuerySet.as_manager()
+    
     class Meta:
         managed = False  # Não sobrescrever o banco existente do Supabase
         db_table = '"seal"."training_modules"'
@@ -69,6 +76,11 @@ class TrainingModule(models.Model):
         return f"{self.order_index}. {self.title}"
 
 
+class ModuleProgressQuerySet(TaggedQuerySet):
+    cache_tag = 'progress:{profile}'
+    cache_tag_field = 'profile_id'
+
+
 class ModuleProgress(models.Model):
     """
     Progresso do usuário em módulos de treinamento.
@@ -97,6 +109,8 @@ class ModuleProgress(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ModuleProgressQuerySet.as_manager()
+    
     class Meta:
         managed = False
         db_table = '"seal"."module_progress"'
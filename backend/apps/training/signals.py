@@ -0,0 +1,24 @@
+"""
+Signals for the training catalog and progress tracking.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from core.response_cache import invalidate_instance
+from .catalog import MODULES_VERSION_SCOPE, progress_version_scope
+from .models import TrainingModule, ModuleProgress
+
+
+@receiver([post_save, post_delete], sender=TrainingModule)
+def invalidate_modules_catalog(sender, instance, **kwargs):
+    """Invalida a versão do catálogo e as respostas em cache quando um módulo muda."""
+    bump_version(MODULES_VERSION_SCOPE)
+    invalidate_instance(instance)
+
+
+@receiver([post_save, post_delete], sender=ModuleProgress)
+def invalidate_module_progress(sender, instance, **kwargs):
+    """Invalida a versão e as respostas em cache do progresso do perfil dono do registro."""
+    bump_version(progress_version_scope(instance.profile_id))
+    invalidate_instance(instance)
@@ -0,0 +1,74 @@
+"""
+War Room API: bootstrap do dashboard em uma única requisição.
+"""
+import asyncio
+
+from ninja import Router
+from ninja.errors import HttpError
+
+from core.auth import async_supabase_auth
+from apps.commissions.api import build_commission_summary
+from apps.crm.api import build_board
+from apps.profiles.api import dashboard_stats
+from apps.profiles.models import Profile
+from apps.training.api import build_training_overview
+from .schemas import WarRoomBootstrapSchema
+
+router = Router()
+
+SECTIONS = ('me', 'dashboard_stats', 'commissions', 'board', 'training')
+# Seções que exigem onboarding_step operacional (CADEADOS)
+OPERATIONAL_SECTIONS = {'commissions', 'board'}
+# Seções que consultam o banco. São aguardadas juntas via asyncio.gather, mas o
+# ORM assíncrono executa as consultas em série na thread de banco da requisição
+# (ver core/aio.py): o ganho é uma autenticação e uma ida e volta HTTP, não paralelismo
+QUERY_SECTIONS = {
+    'commissions': build_commission_summary,
+    'board': build_board,
+    'training': build_training_overview,
+}
+
+
+def parse_sections(sections: str = None) -> list:
+    """Seções solicitadas em `sections` (separadas por vírgula); todas se omitido."""
+    if not sections:
+        return list(SECTIONS)
+    requested = [name.strip() for name in sections.split(',') if name.strip()]
+    unknown = sorted(set(requested) - set(SECTIONS))
+    if unknown:
+        raise HttpError(400, f"Seções desconhecidas: {', '.join(unknown)}. Disponíveis: {', '.join(SECTIONS)}.")
+    return [name for name in SECTIONS if name in requested]
+
+
+@router.get("/bootstrap", response=WarRoomBootstrapSchema, auth=async_supabase_auth)
+async def war_room_bootstrap(request, sections: str = None):
+    """
+    Retorna numa única resposta os dados do carregamento do War Room: perfil,
+    estatísticas do dashboard, resumo de comissões, board Kanban e visão geral
+    dos treinamentos. Autentica uma vez e executa as consultas das seções
+    numa só requisição (em série, na mesma conexão).
+    `sections=me,board,...` limita as seções; sem acesso operacional, board e
+    comissões vêm nulos e listados em `locked`.
+    OPERAÇÃO: Sala de Guerra.
+    """
+    profile = request.auth
+    requested = parse_sections(sections)
+    
+    payload = {'locked': []}
+    if 'me' in requested:
+        payload['me'] = profile
+    if 'dashboard_stats' in requested:
+        payload['dashboard_stats'] = dashboard_stats(profile)
+    
+    builders = {}
+    for name in requested:
+        if name not in QUERY_SECTIONS:
+            continue
+        if name in OPERATIONAL_SECTIONS and profile.onboarding_step < Profile.STEP_OPERACIONAL:
+            payload['locked'].append(name)
+            continue
+        builders[name] = QUERY_SECTIONS[name]
+    
+    results = await asyncio.gather(*(build(profile) for build in builders.values()))
+    payload.update(zip(builders, results))
+    return payload
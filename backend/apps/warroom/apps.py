@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class WarRoomConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.warroom'
+    verbose_name = 'War Room'
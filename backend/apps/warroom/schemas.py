@@ -0,0 +1,21 @@
+"""
+Pydantic schemas for the War Room bootstrap endpoint.
+"""
+from typing import Dict, List, Optional
+from ninja import Schema
+
+from apps.commissions.schemas import CommissionSummarySchema
+from apps.crm.schemas import KanbanBoardSchema
+from apps.profiles.schemas import ProfileOutSchema
+from apps.training.schemas import TrainingOverviewSchema
+
+
+class WarRoomBootstrapSchema(Schema):
+    """Seções do War Room; as não solicitadas ou bloqueadas vêm nulas."""
+    me: Optional[ProfileOutSchema] = None
+    dashboard_stats: Optional[Dict] = None
+    commissions: Optional[CommissionSummarySchema] = None
+    board: Optional[KanbanBoardSchema] = None
+    training: Optional[TrainingOverviewSchema] = None
+    # Seções solicitadas que exigem acesso operacional (CADEADO)
+    locked: List[str] = []
@@ -0,0 +1,36 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import WebhookEvent
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'provider', 'event_type', 'status', 'attempts', 'next_attempt_at', 'created_at', 'processed_at']
+    list_filter = ['provider', 'status', 'event_type']
+    search_fields = ['dedup_key']
+    readonly_fields = ['id', 'created_at', 'processed_at', 'locked_at']
+    ordering = ['-created_at']
+    actions = ['requeue_events']
+    
+    fieldsets = (
+        ('Evento', {
+            'fields': ('provider', 'event_type', 'dedup_key', 'payload')
+        }),
+        ('Processamento', {
+            'fields': ('status', 'attempts', 'next_attempt_at', 'locked_at', 'last_error')
+        }),
+        ('Datas', {
+            'fields': ('created_at', 'processed_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    
+    @admin.action(description="Reprocessar eventos selecionados")
+    def requeue_events(self, request, queryset):
+        updated = queryset.update(
+            status=WebhookEvent.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            locked_at=None,
+        )
+        self.message_user(request, f"{updated} evento(s) reenfileirado(s).")
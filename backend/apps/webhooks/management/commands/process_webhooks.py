@@ -0,0 +1,48 @@
+"""
+Worker that drains the webhook queue (seal.webhook_events) in batches.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.webhooks.queue import claim_batch, process_batch
+
+
+class Command(BaseCommand):
+    help = "Processa eventos de webhook enfileirados, em lotes, com retentativas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.WEBHOOKS_BATCH_SIZE,
+            help="Eventos reservados por lote.",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.WEBHOOKS_POLL_INTERVAL,
+            help="Segundos de espera quando a fila está vazia.",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Processa os eventos vencidos e encerra.",
+        )
+
+    def handle(self, *args, batch_size, poll_interval, once, **options):
+        while True:
+            close_old_connections()
+            events = claim_batch(batch_size)
+            if events:
+                summary = process_batch(events)
+                self.stdout.write(
+                    f"Lote de {len(events)} evento(s): {summary['done']} processado(s), "
+                    f"{summary['retry']} para nova tentativa, {summary['failed']} com falha definitiva."
+                )
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('provider', models.CharField(help_text='Origem do webhook (ex.: calendly)', max_length=30)),
+                ('event_type', models.CharField(help_text='Tipo do evento (ex.: invitee.created)', max_length=100)),
+                ('dedup_key', models.TextField(help_text='Chave de idempotência do evento', unique=True)),
+                ('payload', models.JSONField(default=dict, help_text='Corpo bruto do webhook')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('PROCESSING', 'Processando'), ('DONE', 'Processado'), ('FAILED', 'Falhou')], default='PENDING', help_text='Status do processamento', max_length=20)),
+                ('attempts', models.IntegerField(default=0, help_text='Tentativas de processamento')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Próxima tentativa (backoff exponencial)')),
+                ('locked_at', models.DateTimeField(blank=True, help_text='Quando um worker reservou o evento', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='Último erro de processamento', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Evento de Webhook',
+                'verbose_name_plural': 'Eventos de Webhook',
+                'db_table': '"seal"."webhook_events"',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='webhook_events_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+"""
+Webhook event queue - Managed table seal.webhook_events.
+Incoming webhooks are stored here and processed asynchronously by
+`python manage.py process_webhooks`.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class WebhookEvent(models.Model):
+    """
+    Evento de webhook recebido e aguardando processamento.
+    Deduplicado por `dedup_key` (ex.: URI do evento/convidado no Calendly).
+    """
+    
+    # Status constants
+    STATUS_PENDING = 'PENDING'
+    STATUS_PROCESSING = 'PROCESSING'
+    STATUS_DONE = 'DONE'
+    STATUS_FAILED = 'FAILED'
+    
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendente'),
+        (STATUS_PROCESSING, 'Processando'),
+        (STATUS_DONE, 'Processado'),
+        (STATUS_FAILED, 'Falhou'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    
+    provider = models.CharField(
+        max_length=30,
+        help_text="Origem do webhook (ex.: calendly)"
+    )
+    
+    event_type = models.CharField(
+        max_length=100,
+        help_text="Tipo do evento (ex.: invitee.created)"
+    )
+    
+    dedup_key = models.TextField(
+        unique=True,
+        help_text="Chave de idempotência do evento"
+    )
+    
+    payload = models.JSONField(
+        default=dict,
+        help_text="Corpo bruto do webhook"
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="Status do processamento"
+    )
+    
+    attempts = models.IntegerField(
+        default=0,
+        help_text="Tentativas de processamento"
+    )
+    
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Próxima tentativa (backoff exponencial)"
+    )
+    
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Quando um worker reservou o evento"
+    )
+    
+    last_error = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Último erro de processamento"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = '"seal"."webhook_events"'
+        verbose_name = 'Evento de Webhook'
+        verbose_name_plural = 'Eventos de Webhook'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='webhook_events_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"[{self.provider}] {self.event_type} ({self.status})"
@@ -0,0 +1,131 @@
+"""
+Durable webhook queue backed by seal.webhook_events.
+
+Webhook endpoints call `enqueue` (one INSERT inside a savepoint; a redelivery
+hits the unique dedup key and its IntegrityError is swallowed) and return
+immediately. Workers claim due events in batches with
+`SELECT ... FOR UPDATE SKIP LOCKED`, hand them to the handler registered for
+the provider and retry failures with exponential backoff.
+"""
+import logging
+import random
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# provider -> handler(events) que retorna {event_id: erro ou None}
+_handlers: Dict[str, Callable[[List[WebhookEvent]], Dict[int, str]]] = {}
+
+
+def register_handler(provider: str, handler: Callable[[List[WebhookEvent]], Dict[int, str]]) -> None:
+    """Registra o processador de lotes de um provedor."""
+    _handlers[provider] = handler
+
+
+def enqueue(provider: str, event_type: str, dedup_key: str, payload: dict) -> bool:
+    """
+    Persiste o evento bruto. Retorna False se a chave já foi recebida (reentrega).
+    """
+    try:
+        with transaction.atomic():
+            WebhookEvent.objects.create(
+                provider=provider,
+                event_type=event_type,
+                dedup_key=dedup_key,
+                payload=payload,
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def claim_batch(batch_size: int) -> List[WebhookEvent]:
+    """
+    Reserva até `batch_size` eventos vencidos, incluindo reservas expiradas
+    de workers que caíram no meio do processamento.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.WEBHOOKS_VISIBILITY_TIMEOUT)
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=WebhookEvent.STATUS_PENDING, next_attempt_at__lte=now)
+                | Q(status=WebhookEvent.STATUS_PROCESSING, locked_at__lt=stale)
+            )
+            .order_by('created_at')[:batch_size]
+        )
+        if events:
+            WebhookEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                status=WebhookEvent.STATUS_PROCESSING,
+                locked_at=now,
+            )
+    return events
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = settings.WEBHOOKS_RETRY_BASE_SECONDS
+    delay = min(base * (2 ** (attempts - 1)), settings.WEBHOOKS_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def process_batch(events: List[WebhookEvent]) -> Dict[str, int]:
+    """
+    Processa um lote já reservado e registra sucesso, nova tentativa ou falha definitiva.
+    """
+    summary = {'done': 0, 'retry': 0, 'failed': 0}
+    by_provider: Dict[str, List[WebhookEvent]] = {}
+    for event in events:
+        by_provider.setdefault(event.provider, []).append(event)
+
+    now = timezone.now()
+    done_ids = []
+    for provider, provider_events in by_provider.items():
+        handler = _handlers.get(provider)
+        if handler is None:
+            errors = {event.id: f"Sem processador para '{provider}'" for event in provider_events}
+        else:
+            try:
+                errors = handler(provider_events)
+            except Exception as exc:
+                logger.exception("Falha no processador de webhooks", extra={'provider': provider})
+                errors = {event.id: repr(exc) for event in provider_events}
+
+        for event in provider_events:
+            error = errors.get(event.id)
+            if not error:
+                done_ids.append(event.id)
+                continue
+            event.attempts += 1
+            event.last_error = error[:2000]
+            event.locked_at = None
+            if event.attempts >= settings.WEBHOOKS_MAX_ATTEMPTS:
+                event.status = WebhookEvent.STATUS_FAILED
+                summary['failed'] += 1
+                logger.warning(
+                    "Webhook com falha definitiva",
+                    extra={'event_id': event.id, 'provider': provider, 'error': event.last_error}
+                )
+            else:
+                event.status = WebhookEvent.STATUS_PENDING
+                event.next_attempt_at = now + _backoff(event.attempts)
+                summary['retry'] += 1
+            event.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+
+    if done_ids:
+        WebhookEvent.objects.filter(pk__in=done_ids).update(
+            status=WebhookEvent.STATUS_DONE,
+            processed_at=now,
+            locked_at=None,
+            last_error=None,
+        )
+    summary['done'] = len(done_ids)
+    return summary
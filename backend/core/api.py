@@ -10,11 +10,17 @@ from apps.training.api import router as training_router
 from apps.resources.api import router as resources_router
 from apps.commissions.api import router as commissions_router
 from apps.onboarding.api import router as onboarding_router
+from apps.search.api import router as search_router
+from apps.warroom.api import router as warroom_router
+from core.batch import router as batch_router
+from core.internal import router as internal_router
+from core.metrics import TimedJSONRenderer
 
 api = NinjaAPI(
     title="SEAL Platform API",
     version="1.0.0",
     description="API do Sistema de Estrategistas de Alta Performance - Operações Táticas",
+    renderer=TimedJSONRenderer(),
 )
 
 # Register all routers
@@ -24,6 +30,10 @@ api.add_router("/training/", training_router, tags=["Treinamentos"])
 api.add_router("/resources/", resources_router, tags=["Arsenal"])
 api.add_router("/commissions/", commissions_router, tags=["Comissões"])
 api.add_router("/onboarding/", onboarding_router, tags=["Onboarding"])
+api.add_router("/search/", search_router, tags=["Busca"])
+api.add_router("/war-room/", warroom_router, tags=["War Room"])
+api.add_router("/batch", batch_router, tags=["Lote"])
+api.add_router("/internal/", internal_router, tags=["Interno"])
 
 
 @api.exception_handler(HttpError)
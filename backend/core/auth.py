@@ -2,12 +2,51 @@
 Supabase JWT Authentication for Django Ninja.
 Validates JWT tokens and returns the authenticated Profile.
 """
+import hmac
+import logging
 import jwt
 from typing import Optional
 from django.conf import settings
-from ninja.security import HttpBearer
+from ninja.security import APIKeyHeader, HttpBearer
+from apps.profiles.lookup import normalize_email
 from apps.profiles.models import Profile
 
+logger = logging.getLogger(__name__)
+
+# Set by core/batch.py on sub-requests: the profile already authenticated by the batch
+BATCH_PROFILE_ATTR = 'batch_profile'
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """
+    Validate a Supabase JWT and return its payload, or None if invalid.
+    """
+    try:
+        jwt_secret = settings.SUPABASE_JWT_SECRET
+        
+        # Decode the JWT token using Supabase's JWT secret
+        # Supabase uses the raw secret string directly
+        payload = jwt.decode(
+            token,
+            jwt_secret,
+            algorithms=['HS256'],
+            audience='authenticated'
+        )
+    except jwt.ExpiredSignatureError:
+        logger.info("Token expirado")
+        return None
+    except jwt.InvalidTokenError as e:
+        logger.info("Token inválido", extra={'reason': str(e)})
+        return None
+    except Exception:
+        logger.exception("Erro ao validar token")
+        return None
+    
+    # Extract user ID from the token
+    if not payload.get('sub'):
+        return None
+    return payload
+
 
 class SupabaseJWTAuth(HttpBearer):
     """
@@ -19,49 +58,97 @@ class SupabaseJWTAuth(HttpBearer):
         """
         Validate the JWT token and return the user's Profile.
         """
+        profile = getattr(request, BATCH_PROFILE_ATTR, None)
+        if profile is not None:
+            return profile
+        
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        
+        user_id = payload['sub']
+        email = normalize_email(payload.get('email'))
+        # Attach raw payload for additional data if needed
+        request.jwt_payload = payload
+        
         try:
-            jwt_secret = settings.SUPABASE_JWT_SECRET
-            
-            # Decode the JWT token using Supabase's JWT secret
-            # Supabase uses the raw secret string directly
-            payload = jwt.decode(
-                token,
-                jwt_secret,
-                algorithms=['HS256'],
-                audience='authenticated'
-            )
-            
-            # Extract user ID from the token
-            user_id = payload.get('sub')
-            if not user_id:
-                return None
-            
             # Get or create the profile for this user
             try:
                 profile = Profile.objects.get(id=user_id)
-                # Attach raw payload for additional data if needed
-                request.jwt_payload = payload
-                return profile
             except Profile.DoesNotExist:
                 # Create a new profile for first-time users
-                profile = Profile.objects.create(
+                return Profile.objects.create(
                     id=user_id,
-                    onboarding_step=0
+                    onboarding_step=0,
+                    email=email or None
                 )
-                request.jwt_payload = payload
-                return profile
-                
-        except jwt.ExpiredSignatureError as e:
-            print(f"[AUTH] Token expirado: {e}")
+            
+            # Fill/refresh the email from the token claims; only writes when it differs
+            if email and normalize_email(profile.email) != email:
+                profile.email = email
+                profile.save(update_fields=['email', 'updated_at'])
+            return profile
+        except Exception:
+            logger.exception("Erro ao carregar perfil", extra={'user_id': user_id})
             return None
-        except jwt.InvalidTokenError as e:
-            print(f"[AUTH] Token inválido: {e}")
+
+
+class AsyncSupabaseJWTAuth(HttpBearer):
+    """
+    Async variant of SupabaseJWTAuth for `async def` endpoints.
+    Uses the async ORM so authentication doesn't block the event loop under ASGI.
+    """
+    
+    is_async = True
+    
+    async def authenticate(self, request, token: str) -> Optional[Profile]:
+        profile = getattr(request, BATCH_PROFILE_ATTR, None)
+        if profile is not None:
+            return profile
+        
+        payload = decode_token(token)
+        if payload is None:
             return None
-        except Exception as e:
-            print(f"[AUTH] Erro geral: {e}")
+        
+        user_id = payload['sub']
+        email = normalize_email(payload.get('email'))
+        request.jwt_payload = payload
+        
+        try:
+            try:
+                profile = await Profile.objects.aget(id=user_id)
+            except Profile.DoesNotExist:
+                return await Profile.objects.acreate(
+                    id=user_id,
+                    onboarding_step=0,
+                    email=email or None
+                )
+            
+            if email and normalize_email(profile.email) != email:
+                profile.email = email
+                await profile.asave(update_fields=['email', 'updated_at'])
+            return profile
+        except Exception:
+            logger.exception("Erro ao carregar perfil", extra={'user_id': user_id})
             return None
 
 
+class InternalTokenAuth(APIKeyHeader):
+    """
+    Protects internal/operational endpoints with the shared INTERNAL_API_TOKEN
+    (header `X-Internal-Token`). Rejects everything when the token is not set.
+    """
+    
+    param_name = "X-Internal-Token"
+    
+    def authenticate(self, request, key: Optional[str]) -> Optional[bool]:
+        expected = settings.INTERNAL_API_TOKEN
+        # Bytes: compare_digest raises TypeError for non-ASCII str (a 500 instead of 401)
+        if expected and key and hmac.compare_digest(key.encode(), expected.encode()):
+            return True
+        return None
+
+
 class OnboardingStepRequired:
     """
     Dependency to check if user has completed required onboarding step.
@@ -87,4 +174,6 @@ class OnboardingStepRequired:
 
 # Singleton instances for use in API endpoints
 supabase_auth = SupabaseJWTAuth()
+async_supabase_auth = AsyncSupabaseJWTAuth()
+internal_auth = InternalTokenAuth()
 require_operational = OnboardingStepRequired(min_step=3)
@@ -0,0 +1,172 @@
+"""
+Batch endpoint: several API operations in one HTTP request.
+
+`POST /api/batch` receives a list of sub-requests (method, path, query string
+and JSON body) and runs them in order, in process, against the regular Ninja
+routes: each sub-request goes through the operation's auth, validation,
+decorators and serialization exactly as a standalone call would. The batch is
+authenticated once; sub-requests reuse that profile instead of decoding the
+JWT and loading the profile again (see `BATCH_PROFILE_ATTR` in core/auth.py).
+
+With `atomic: true` the sub-requests share one transaction: the first one
+answering with an error (status >= 400) rolls everything back and the rest
+are not run (status 424). Without it each sub-request commits on its own.
+
+Sub-requests skip the middleware (metrics, logs and replica routing see only
+the batch itself); streaming responses (SSE, files) are not supported.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from ninja import Field, Router, Schema
+from ninja.errors import HttpError
+
+from core.auth import BATCH_PROFILE_ATTR, supabase_auth
+
+logger = logging.getLogger(__name__)
+
+router = Router()
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+API_PREFIX = '/api/'
+# Parent request headers/environment passed on to every sub-request
+INHERITED_META = ('HTTP_AUTHORIZATION', 'HTTP_X_REQUEST_ID', 'REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'wsgi.url_scheme')
+
+
+class BatchOperationSchema(Schema):
+    method: str = 'GET'
+    # Caminho da rota, com query string opcional (ex.: /api/crm/leads?status=RADAR)
+    path: str
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+
+
+class BatchRequestSchema(Schema):
+    operations: List[BatchOperationSchema] = Field(..., min_length=1)
+    atomic: bool = False
+
+
+class BatchResultSchema(Schema):
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponseSchema(Schema):
+    results: List[BatchResultSchema]
+    # True quando o lote atômico foi desfeito por uma operação com erro
+    rolled_back: bool = False
+
+
+def _error(status: int, detail: str) -> Dict:
+    return {'status': status, 'body': {'status': 'OPERAÇÃO NEGADA', 'detail': detail}}
+
+
+def _sub_request(parent: HttpRequest, operation: BatchOperationSchema, atomic: bool) -> HttpRequest:
+    url = urlsplit(operation.path)
+    request = HttpRequest()
+    request.method = operation.method.upper()
+    request.path = request.path_info = url.path
+    request.GET = QueryDict(url.query)
+    request.META = {key: parent.META[key] for key in INHERITED_META if key in parent.META}
+    request.META.update({
+        'REQUEST_METHOD': request.method,
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+    })
+    for name, value in operation.headers.items():
+        if name.lower() != 'authorization':
+            request.META['HTTP_' + name.upper().replace('-', '_')] = value
+    if operation.body is not None:
+        request._body = json.dumps(operation.body).encode()
+        request.META['CONTENT_TYPE'] = 'application/json'
+        request.META['CONTENT_LENGTH'] = str(len(request._body))
+    else:
+        request._body = b''
+    request._set_content_type_params(request.META)
+    request.request_id = getattr(parent, 'request_id', None)
+    request.jwt_payload = getattr(parent, 'jwt_payload', None)
+    setattr(request, BATCH_PROFILE_ATTR, parent.auth)
+    # Inside a shared transaction, invalidations only happen at commit: later
+    # reads in the batch must not be answered from the response cache
+    request.skip_response_cache = atomic
+    return request
+
+
+def _decode(response) -> Any:
+    if not response.content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(response.content)
+    return response.content.decode(response.charset or 'utf-8', errors='replace')
+
+
+def run_operation(parent: HttpRequest, operation: BatchOperationSchema, atomic: bool) -> Dict:
+    """Executes one sub-request and returns `{'status', 'body'}`."""
+    method = operation.method.upper()
+    if method not in METHODS:
+        return _error(405, f"Método não suportado em lote: {operation.method}.")
+    path = urlsplit(operation.path).path
+    if not path.startswith(API_PREFIX) or path.rstrip('/') == parent.path.rstrip('/'):
+        return _error(400, f"Caminho não permitido em lote: {path}.")
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return _error(404, f"Rota não encontrada: {path}.")
+
+    request = _sub_request(parent, operation, atomic)
+    request.resolver_match = match
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, *match.args, **match.kwargs)
+    if response.streaming:
+        if hasattr(response, 'close'):
+            response.close()
+        return _error(400, f"Respostas em streaming não são suportadas em lote: {path}.")
+    return {'status': response.status_code, 'body': _decode(response)}
+
+
+@router.post("", response=BatchResponseSchema, auth=supabase_auth)
+def run_batch(request, payload: BatchRequestSchema):
+    """
+    Executa várias operações da API numa única requisição, em ordem, com uma
+    única autenticação. Com `atomic`, todas rodam numa só transação: a primeira
+    operação com erro desfaz o lote e as seguintes não são executadas (424).
+    OPERAÇÃO: Ofensiva Coordenada.
+    """
+    if len(payload.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HttpError(400, f"Máximo de {settings.BATCH_MAX_OPERATIONS} operações por lote.")
+
+    if not payload.atomic:
+        results = []
+        for operation in payload.operations:
+            try:
+                results.append(run_operation(request, operation, atomic=False))
+            except Exception:
+                logger.exception("Erro em operação do lote", extra={'path': operation.path})
+                results.append(_error(500, "Erro interno na operação."))
+        return {'results': results}
+
+    results = []
+    with transaction.atomic():
+        for operation in payload.operations:
+            try:
+                result = run_operation(request, operation, atomic=True)
+            except Exception:
+                logger.exception("Erro em operação do lote", extra={'path': operation.path})
+                result = _error(500, "Erro interno na operação.")
+            results.append(result)
+            if result['status'] >= 400:
+                transaction.set_rollback(True)
+                break
+    rolled_back = results[-1]['status'] >= 400
+    skipped = _error(424, "Não executada: uma operação anterior do lote falhou.")
+    results.extend(skipped for _ in range(len(payload.operations) - len(results)))
+    return {'results': results, 'rolled_back': rolled_back}
@@ -0,0 +1,74 @@
+"""
+Versioned cache helpers for SEAL Platform.
+Keeps cheap version tokens for catalog data so read endpoints can answer
+conditional requests without querying the database.
+Misses are computed once per key (core/singleflight.py), so an expired token
+does not send every concurrent request to the database.
+"""
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from core import singleflight
+from core.replicas import use_primary
+
+VERSION_KEY_PREFIX = 'seal:version:'
+VERSIONED_KEY_PREFIX = 'seal:data:'
+
+
+def _fill(key: str, compute: Callable):
+    """Compute and cache a missing value, once for all concurrent callers."""
+    def run():
+        with singleflight.db_lock(key):
+            # Another process may have filled it while we waited for the lock
+            value = cache.get(key)
+            if value is None:
+                # Computed from the primary: a lagging replica would cache stale data
+                with use_primary():
+                    value = compute()
+                cache.set(key, value, settings.CATALOG_VERSION_TIMEOUT)
+        return value
+    return singleflight.do(key, run)
+
+
+def get_version(scope: str, compute: Callable[[], str]) -> str:
+    """
+    Return the version token for a scope, computing it on cache miss.
+    """
+    key = VERSION_KEY_PREFIX + scope
+    version = cache.get(key)
+    if version is None:
+        version = _fill(key, compute)
+    return version
+
+
+def bump_version(scope: str) -> None:
+    """
+    Invalidate the version token of a scope once the current transaction commits.
+    The next read recomputes it from the committed data.
+    """
+    transaction.on_commit(lambda: cache.delete(VERSION_KEY_PREFIX + scope))
+
+
+def get_versioned(scope: str, name: str, version: str, compute: Callable):
+    """
+    Return a value cached under a scope's version token, computing it on miss.
+    Entries of older versions are never read again and simply expire.
+    """
+    key = f"{VERSIONED_KEY_PREFIX}{scope}:{name}:{version}"
+    value = cache.get(key)
+    if value is None:
+        value = _fill(key, compute)
+    return value
+
+
+def queryset_version(queryset) -> str:
+    """
+    Build a version token from the row count and latest `updated_at` of a queryset.
+    """
+    stats = queryset.aggregate(last_update=Max('updated_at'), total=Count('pk'))
+    last_update = stats['last_update'].timestamp() if stats['last_update'] else 0
+    return f"{stats['total']}-{last_update}"
@@ -0,0 +1,25 @@
+"""
+Database connection pool introspection.
+"""
+import os
+from typing import Dict
+
+from django.db import connections
+
+
+def pool_stats() -> Dict[str, dict]:
+    """
+    Counters of each pooled connection alias in this process (psycopg_pool
+    `get_stats()`), plus `connections_in_use`. Aliases without an open pool
+    are omitted.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None or pool.closed:
+            continue
+        data = pool.get_stats()
+        data['connections_in_use'] = data.get('pool_size', 0) - data.get('pool_available', 0)
+        data['pid'] = os.getpid()
+        stats[alias] = data
+    return stats
@@ -0,0 +1,284 @@
+"""
+In-process publish/subscribe for server-sent events (SSE).
+
+Each subscriber gets a bounded queue; a slow client never blocks publishers; when
+its queue is full, further events are dropped and the subscription is flagged
+as overflowed so the stream can tell the client to resync.
+
+Events published inside a transaction are delivered only after it commits.
+With EVENTS_PG_NOTIFY enabled (PostgreSQL only), events travel through
+`pg_notify` instead, and each process runs one LISTEN thread that republishes
+them locally - this is what lets the webhook worker wake up streams served by
+the web process.
+
+Every open stream holds a worker thread (under ASGI, an executor thread) for
+up to EVENTS_STREAM_MAX_AGE seconds, so each process accepts at most
+EVENTS_MAX_STREAMS subscriptions at a time; beyond that `open_subscription`
+answers 503 and the client retries later.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, connections, transaction
+from django.http import StreamingHttpResponse
+from ninja.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'seal_events'
+# pg_notify payloads are limited to 8000 bytes
+NOTIFY_MAX_PAYLOAD = 7900
+
+
+class StreamLimitReached(Exception):
+    """Raised by `EventBus.subscribe` when EVENTS_MAX_STREAMS are already open."""
+
+
+class Subscription:
+    """Bounded queue of events for a single stream."""
+
+    def __init__(self, bus: 'EventBus', channel: str, maxsize: int):
+        self.bus = bus
+        self.channel = channel
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[dict]:
+        """Wait up to `timeout` seconds for the next event."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> None:
+        """Discard queued events and clear the overflow flag (after a resync)."""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        self.overflowed = False
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventBus:
+    """Thread-safe channel -> subscriptions registry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, channel: str, maxsize: Optional[int] = None) -> Subscription:
+        if _notify_enabled():
+            self._start_listener()
+        subscription = Subscription(self, channel, maxsize or settings.EVENTS_QUEUE_SIZE)
+        with self._lock:
+            if settings.EVENTS_MAX_STREAMS and self._count >= settings.EVENTS_MAX_STREAMS:
+                raise StreamLimitReached(channel)
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            self._count -= 1
+            if not subscribers:
+                del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    def stream_count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def deliver(self, channel: str, event: dict) -> None:
+        """Hand an event to every local subscriber of `channel`."""
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name='seal-events-listener', daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self) -> None:
+        # Dedicated connection outside Django's per-thread handling and the pool
+        # (LISTEN state must not leak into pooled connections); reconnects on failure
+        while True:
+            try:
+                wrapper = connections['default']
+                with wrapper.Database.connect(
+                    **wrapper.get_connection_params(), autocommit=True
+                ) as conn:
+                    conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    while True:
+                        for notify in conn.notifies(timeout=30):
+                            message = json.loads(notify.payload)
+                            self.deliver(message['channel'], message['event'])
+            except Exception:
+                logger.exception("Event listener disconnected, reconnecting")
+                time.sleep(settings.EVENTS_LISTENER_RETRY_SECONDS)
+
+
+event_bus = EventBus()
+
+
+def open_subscription(channel: str) -> Subscription:
+    """Subscribe a stream view to `channel`, answering 503 when this process is full."""
+    try:
+        return event_bus.subscribe(channel)
+    except StreamLimitReached:
+        logger.warning("Limite de streams SSE atingido", extra={'limit': settings.EVENTS_MAX_STREAMS})
+        raise HttpError(503, "Limite de conexões em tempo real atingido. Tente novamente em instantes.")
+
+
+def _notify_enabled() -> bool:
+    return settings.EVENTS_PG_NOTIFY and connection.vendor == 'postgresql'
+
+
+def _send(channel: str, event: dict) -> None:
+    if _notify_enabled():
+        payload = json.dumps({'channel': channel, 'event': event}, default=str)
+        if len(payload.encode()) <= NOTIFY_MAX_PAYLOAD:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, payload])
+            return
+        # Too large for NOTIFY: deliver locally and let other processes resync
+        event = {'type': 'resync', 'data': {}}
+    event_bus.deliver(channel, event)
+
+
+def publish(channel: str, event_type: str, data: Optional[dict] = None) -> None:
+    """
+    Publish an event to a channel once the current transaction commits.
+    """
+    event = {'type': event_type, 'data': data or {}}
+    transaction.on_commit(lambda: _send(channel, event))
+
+
+def format_sse(event_type: str, data=None, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    payload = json.dumps(data if data is not None else {}, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines())
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(
+    subscription: Subscription,
+    initial: Optional[Iterator[str]] = None,
+    stop: Optional[Callable[[dict], bool]] = None,
+    on_idle: Optional[Callable[[], Optional[dict]]] = None,
+) -> Iterator[str]:
+    """
+    Yield SSE frames for a subscription: `initial` frames first, then live events,
+    heartbeat comments while idle and a `resync` event after an overflow.
+
+    `on_idle()` runs on every heartbeat and may return an event to send; streams
+    use it as a low-frequency database re-check in case a notification was missed.
+    Ends when `stop(event)` returns True or after EVENTS_STREAM_MAX_AGE seconds;
+    the client is expected to reconnect. The subscription is closed on exit.
+    The database connection is released while waiting, so idle streams do not
+    hold one.
+    """
+    deadline = time.monotonic() + settings.EVENTS_STREAM_MAX_AGE
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        for frame in initial or ():
+            yield frame
+        while time.monotonic() < deadline:
+            _release_connection()
+            if subscription.overflowed:
+                subscription.drain()
+                yield format_sse('resync')
+                continue
+            event = subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            if event is None and on_idle:
+                event = on_idle()
+                _release_connection()
+            if event is None:
+                yield ': heartbeat\n\n'
+                continue
+            yield format_sse(event['type'], event['data'])
+            if stop and stop(event):
+                break
+    finally:
+        subscription.close()
+        _release_connection()
+
+
+def _release_connection() -> None:
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+async def _async_frames(stream: Iterator[str]):
+    # Under ASGI each blocking step of the (sync) stream runs in a worker thread,
+    # so waiting for events never blocks the event loop
+    next_frame = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            frame = await next_frame(stream, None)
+            if frame is None:
+                break
+            yield frame.encode()
+    finally:
+        if hasattr(stream, 'close'):
+            await sync_to_async(stream.close, thread_sensitive=False)()
+
+
+def sse_response(
+    request, stream: Iterator[str], subscription: Optional[Subscription] = None
+) -> StreamingHttpResponse:
+    """
+    Wrap `stream` in a text/event-stream response. `subscription` is also closed
+    with the response, so its slot is freed even if the stream never started.
+    """
+    if isinstance(request, ASGIRequest):
+        content = _async_frames(stream)
+    else:
+        content = (frame.encode() for frame in stream)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disable proxy buffering (nginx) so events are flushed immediately
+    response['X-Accel-Buffering'] = 'no'
+    if subscription is not None:
+        response._resource_closers.append(subscription.close)
+    return response
@@ -0,0 +1,61 @@
+"""
+Sparse fieldsets for list endpoints (`?fields=id,name,status`).
+
+`parse_fields(fields, LeadOutSchema)` validates the requested names against
+the output schema and returns them (`id` is always included), or None when
+the parameter is absent and the full schema applies. The view then pushes the
+projection down to the query (`queryset.values(*selected)`), so unrequested
+columns such as `notes` or `description` are neither read nor transferred,
+and answers with `sparse_response(...)`: rows are validated by a schema
+restricted to the selected fields and rendered by the API renderer, so
+values are formatted exactly as in the full response.
+
+Only schema fields backed by a model column can be selected.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple, Type
+
+from django.http import HttpResponse
+from ninja import Schema
+from ninja.errors import HttpError
+from pydantic import create_model
+
+ALWAYS_INCLUDED = ('id',)
+
+
+def parse_fields(fields: Optional[str], schema: Type[Schema]) -> Optional[Tuple[str, ...]]:
+    """Selected field names in schema order, or None for the full schema."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = sorted(requested - set(schema.model_fields))
+    if unknown:
+        raise HttpError(
+            400,
+            f"Campos desconhecidos: {', '.join(unknown)}. Disponíveis: {', '.join(schema.model_fields)}."
+        )
+    requested.update(name for name in ALWAYS_INCLUDED if name in schema.model_fields)
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def subset_schema(schema: Type[Schema], selected: Tuple[str, ...]) -> Type[Schema]:
+    """`schema` restricted to `selected` (same types and defaults)."""
+    definitions = {
+        name: (field.annotation, field)
+        for name, field in schema.model_fields.items() if name in selected
+    }
+    return create_model(f"{schema.__name__}Fields", __base__=Schema, **definitions)
+
+
+def serialize(schema: Type[Schema], selected: Tuple[str, ...], rows: Iterable[Any]) -> list:
+    """Rows (dicts from `.values()` or model instances) as dicts with the selected fields."""
+    model = subset_schema(schema, selected)
+    return [model.model_validate(row).model_dump() for row in rows]
+
+
+def sparse_response(request, data: Any) -> HttpResponse:
+    """Renders already serialized data with the API renderer (status 200)."""
+    from core.api import api
+
+    return api.create_response(request, data, status=200)
@@ -0,0 +1,187 @@
+"""
+Streaming file responses for locally stored files.
+
+Supports conditional requests (strong ETag / Last-Modified), single byte
+ranges (HTTP 206) and offloading to the web server via X-Accel-Redirect or
+X-Sendfile. Files are never buffered in memory: the WSGI server's
+`wsgi.file_wrapper` (gunicorn uses `sendfile()`) streams straight from the
+file descriptor, and other servers read it in fixed-size blocks.
+"""
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_etags,
+    parse_http_date_safe,
+    quote_etag,
+)
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    File-like view over `length` bytes of an open file starting at `start`.
+    Keeps `fileno()` so servers can still use `sendfile()` from the current offset.
+    """
+
+    def __init__(self, file, start: int, length: int):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag from file size and modification time."""
+    return quote_etag(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into (start, end) inclusive.
+    Returns None when the header should be ignored (malformed or multiple ranges)
+    and raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Unsatisfiable range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('Unsatisfiable range')
+    return start, min(end, size - 1)
+
+
+def _not_modified(request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        candidates = parse_etags(if_none_match)
+        return '*' in candidates or etag in candidates
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def _range_applies(request, etag: str, mtime: float) -> bool:
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    if_range_date = parse_http_date_safe(if_range)
+    return if_range_date is not None and int(mtime) <= if_range_date
+
+
+def _sendfile_response(path: Path, root: Path, content_type: str) -> Optional[HttpResponse]:
+    backend = settings.FILE_SENDFILE_BACKEND
+    if backend == 'nginx':
+        relative = path.relative_to(root).as_posix()
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f"{settings.FILE_SENDFILE_URL_PREFIX.rstrip('/')}/{relative}"
+        return response
+    if backend in ('apache', 'lighttpd'):
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = str(path)
+        return response
+    return None
+
+
+def serve_file(
+    request,
+    path: Path,
+    root: Path,
+    filename: Optional[str] = None,
+    as_attachment: bool = False,
+):
+    """
+    Serve a local file with validators, Range support and zero-copy where available.
+    `path` must already be resolved inside `root`.
+    """
+    stat = path.stat()
+    etag = file_etag(stat)
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    filename = filename or path.name
+
+    if _not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        return response
+
+    # The web server handles Range itself when the file is offloaded to it
+    response = _sendfile_response(path, root, content_type)
+    if response is not None:
+        disposition = content_disposition_header(as_attachment, filename)
+        if disposition:
+            response['Content-Disposition'] = disposition
+    else:
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if range_header and _range_applies(request, etag, stat.st_mtime):
+            try:
+                byte_range = parse_range(range_header, stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f"bytes */{stat.st_size}"
+                return response
+
+        file = path.open('rb')
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(
+                FileRange(file, start, length),
+                status=206,
+                content_type=content_type,
+                as_attachment=as_attachment,
+                filename=filename,
+            )
+            response['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+            response['Content-Length'] = length
+        else:
+            response = FileResponse(
+                file,
+                content_type=content_type,
+                as_attachment=as_attachment,
+                filename=filename,
+            )
+        response.block_size = STREAM_BLOCK_SIZE
+        response['Accept-Ranges'] = 'bytes'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response
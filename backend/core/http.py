@@ -0,0 +1,162 @@
+"""
+Pooled async HTTP client for external APIs (Calendly, Supabase Auth).
+
+One `httpx.AsyncClient` keeps connections alive across requests, a semaphore
+bounds the number of requests in flight, and rate limiting (HTTP 429) pauses
+every request of the client until the server's reset time, instead of letting
+each concurrent task hammer the API on its own.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Optional
+
+import httpx
+from django.conf import settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class APIError(Exception):
+    """Request failed after all retries (or with a non-retryable status)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from Retry-After (seconds or HTTP date) or X-RateLimit-Reset."""
+    value = response.headers.get('Retry-After')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    value = response.headers.get('X-RateLimit-Reset')
+    if value:
+        try:
+            reset = float(value)
+        except ValueError:
+            return None
+        # Either seconds until reset or an epoch timestamp
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+class AsyncAPIClient:
+    """
+    Async JSON API client with connection pooling, bounded concurrency and retries.
+    Use as `async with AsyncAPIClient(...) as client`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[dict] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency or settings.HTTP_CLIENT_CONCURRENCY
+        self.max_retries = settings.HTTP_CLIENT_MAX_RETRIES if max_retries is None else max_retries
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout or settings.HTTP_CLIENT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._resume_at = 0.0
+        self.request_count = 0
+        self.rate_limited_count = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _wait_rate_limit(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        base = settings.HTTP_CLIENT_RETRY_BASE_SECONDS * (2 ** attempt)
+        return min(base, settings.HTTP_CLIENT_RETRY_MAX_SECONDS) * random.uniform(0.5, 1.0)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying on 429/5xx and transport errors."""
+        attempt = 0
+        while True:
+            await self._wait_rate_limit()
+            async with self._semaphore:
+                try:
+                    self.request_count += 1
+                    response = await self._client.request(method, url, **kwargs)
+                except httpx.TransportError as exc:
+                    if attempt >= self.max_retries:
+                        raise APIError(f"{method} {url}: {exc!r}") from exc
+                    response = None
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                if response.is_error:
+                    raise APIError(
+                        f"{method} {url}: HTTP {response.status_code} {response.text[:200]}",
+                        response.status_code
+                    )
+                return response
+
+            if attempt >= self.max_retries:
+                raise APIError(
+                    f"{method} {url}: HTTP {response.status_code} after {attempt + 1} attempts",
+                    response.status_code
+                )
+
+            delay = None
+            if response is not None and response.status_code == 429:
+                self.rate_limited_count += 1
+                delay = _retry_after(response)
+                if delay is not None:
+                    # Pausa todas as requisições do cliente até o reset
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            await asyncio.sleep(self._backoff(attempt) if delay is None else 0)
+            attempt += 1
+
+    async def get_json(self, url: str, params: Optional[dict] = None):
+        response = await self.request('GET', url, params=params)
+        return response.json()
+
+    async def paginate(
+        self,
+        url: str,
+        next_page: Callable[[Any, dict], Optional[dict]],
+        params: Optional[dict] = None,
+        items: Callable[[Any], list] = lambda data: data,
+    ) -> AsyncIterator[list]:
+        """
+        Yield pages of items. `items(data)` extracts the page items from the JSON
+        body and `next_page(data, params)` returns the params to update for the
+        next page, or None on the last page.
+        """
+        params = dict(params or {})
+        while True:
+            data = await self.get_json(url, params=params)
+            yield items(data) or []
+            next_params = next_page(data, params)
+            if not next_params:
+                return
+            params.update(next_params)
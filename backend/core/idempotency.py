@@ -0,0 +1,211 @@
+"""
+`Idempotency-Key` support for mutating API requests.
+
+A POST/PUT/PATCH/DELETE to `/api/` carrying `Idempotency-Key: <key>` runs at
+most once per authenticated user and key:
+
+- the first request claims the key, runs normally and its response (status,
+  content type and body, compressed) is stored for IDEMPOTENCY_TTL seconds;
+- a retry with the same key gets the stored response back without running the
+  view again, marked with `Idempotent-Replayed: true`;
+- a duplicate arriving while the first one is still running waits for it (up
+  to IDEMPOTENCY_WAIT_SECONDS) and then replays its response, instead of
+  racing it; if it is still running after that, the answer is 409 (the
+  claim itself expires after IDEMPOTENCY_LOCK_SECONDS);
+- reusing a key for a different request (method, path or body) is a 422.
+
+Responses larger than IDEMPOTENCY_MAX_BYTES, streaming responses and 5xx
+errors are not stored: the key is released and a retry runs again. Keys are
+scoped by the `sub` of the bearer token; requests without a valid token are
+passed through (the view answers 401). Entries live in the
+IDEMPOTENCY_CACHE_ALIAS Django cache, which must be shared (e.g. Redis) when
+several processes serve the API.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+import zlib
+from typing import Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from core.auth import decode_token
+
+logger = logging.getLogger(__name__)
+
+KEY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+API_PREFIX = '/api/'
+RESPONSE_KEY_PREFIX = 'seal:idempotency:'
+LOCK_KEY_PREFIX = 'seal:idempotency-lock:'
+POLL_INTERVAL = 0.05
+# Returned by `_attempt` while another request holds the key
+WAIT = object()
+
+
+class Claim:
+    """An idempotent request: cache keys, request fingerprint and lock token."""
+
+    __slots__ = ('response_key', 'lock_key', 'fingerprint', 'token')
+
+    def __init__(self, scope: str, fingerprint: str):
+        self.response_key = RESPONSE_KEY_PREFIX + scope
+        self.lock_key = LOCK_KEY_PREFIX + scope
+        self.fingerprint = fingerprint
+        self.token = uuid.uuid4().hex
+
+
+def _cache():
+    return caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+
+
+def _error(status: int, detail: str) -> JsonResponse:
+    return JsonResponse({'status': 'OPERAÇÃO NEGADA', 'detail': detail}, status=status)
+
+
+def _user_id(request) -> Optional[str]:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    payload = decode_token(token)
+    return payload['sub'] if payload is not None else None
+
+
+def _claim(request) -> Tuple[Optional[Claim], Optional[HttpResponse]]:
+    """The request's claim, or an error response for an invalid key."""
+    key = request.headers.get(KEY_HEADER)
+    if not key or request.method not in UNSAFE_METHODS or not request.path.startswith(API_PREFIX):
+        return None, None
+    if len(key) > MAX_KEY_LENGTH:
+        return None, _error(400, f"{KEY_HEADER} deve ter no máximo {MAX_KEY_LENGTH} caracteres.")
+    user_id = _user_id(request)
+    if user_id is None:
+        return None, None
+    digest = hashlib.sha256(f"{request.method} {request.get_full_path()}\n".encode())
+    digest.update(request.body)
+    scope = hashlib.sha256(f"{user_id}:{key}".encode()).hexdigest()
+    return Claim(scope, digest.hexdigest()), None
+
+
+def _replay(claim: Claim, stored: tuple) -> HttpResponse:
+    fingerprint, status, content_type, body = stored
+    if fingerprint != claim.fingerprint:
+        return _error(422, f"{KEY_HEADER} já utilizada em outra requisição.")
+    response = HttpResponse(zlib.decompress(body), status=status, content_type=content_type)
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def _attempt(claim: Claim):
+    """
+    One non-blocking attempt: None when the key was claimed (run the request),
+    the response to send (replay or error), or WAIT while the first request
+    with the key is still running.
+    """
+    cache = _cache()
+    stored = cache.get(claim.response_key)
+    if stored is not None:
+        return _replay(claim, stored)
+    if not cache.add(claim.lock_key, claim.token, settings.IDEMPOTENCY_LOCK_SECONDS):
+        return WAIT
+    # The first request may have finished between the lookup and the claim
+    stored = cache.get(claim.response_key)
+    if stored is None:
+        return None
+    cache.delete(claim.lock_key)
+    return _replay(claim, stored)
+
+
+def _timeout() -> HttpResponse:
+    return _error(409, f"Requisição com esta {KEY_HEADER} ainda em processamento.")
+
+
+def _begin(claim: Claim) -> Optional[HttpResponse]:
+    """`_attempt` until the key is claimed or a response is ready."""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while (result := _attempt(claim)) is WAIT:
+        if time.monotonic() >= deadline:
+            return _timeout()
+        time.sleep(POLL_INTERVAL)
+    return result
+
+
+async def _abegin(claim: Claim) -> Optional[HttpResponse]:
+    """Async `_begin`: waiting does not hold a thread."""
+    attempt = sync_to_async(_attempt, thread_sensitive=False)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while (result := await attempt(claim)) is WAIT:
+        if time.monotonic() >= deadline:
+            return _timeout()
+        await asyncio.sleep(POLL_INTERVAL)
+    return result
+
+
+def _finish(claim: Claim, response: Optional[HttpResponse]) -> None:
+    """Stores the response (when replayable) and releases the key."""
+    cache = _cache()
+    try:
+        if response is not None and response.status_code < 500 and not response.streaming:
+            if len(response.content) <= settings.IDEMPOTENCY_MAX_BYTES:
+                stored = (
+                    claim.fingerprint,
+                    response.status_code,
+                    response.get('Content-Type', 'application/json'),
+                    zlib.compress(response.content),
+                )
+                cache.set(claim.response_key, stored, settings.IDEMPOTENCY_TTL)
+            else:
+                logger.info("Resposta grande demais para Idempotency-Key; não armazenada",
+                            extra={'bytes': len(response.content)})
+    finally:
+        if cache.get(claim.lock_key) == claim.token:
+            cache.delete(claim.lock_key)
+
+
+@sync_and_async_middleware
+def idempotency_middleware(get_response):
+    """Replays mutating requests repeated with the same Idempotency-Key (see module docstring)."""
+    if not settings.IDEMPOTENCY_ENABLED:
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            claim, error = _claim(request)
+            if error is not None:
+                return error
+            if claim is None:
+                return await get_response(request)
+            response = await _abegin(claim)
+            if response is not None:
+                return response
+            try:
+                response = await get_response(request)
+            finally:
+                await sync_to_async(_finish, thread_sensitive=False)(claim, response)
+            return response
+    else:
+        def middleware(request):
+            claim, error = _claim(request)
+            if error is not None:
+                return error
+            if claim is None:
+                return get_response(request)
+            response = _begin(claim)
+            if response is not None:
+                return response
+            try:
+                response = get_response(request)
+            finally:
+                _finish(claim, response)
+            return response
+
+    return middleware
@@ -0,0 +1,31 @@
+"""
+Internal operational endpoints (not used by the frontend).
+Protected by `X-Internal-Token: <INTERNAL_API_TOKEN>`.
+"""
+from django.http import HttpResponse
+from ninja import Router
+
+from core.auth import internal_auth
+from core.db import pool_stats
+from core.metrics import render_metrics
+
+router = Router(auth=internal_auth)
+
+
+@router.get("/db-pool")
+def db_pool(request):
+    """
+    Estatísticas do pool de conexões deste processo: tamanho, conexões em uso,
+    requisições em espera, tempo total de espera (ms), conexões perdidas etc.
+    """
+    return pool_stats()
+
+
+@router.get("/metrics")
+def metrics(request):
+    """
+    Métricas por endpoint deste processo no formato texto do Prometheus
+    (latência, consultas SQL, tempo de banco, serialização e tamanho da resposta).
+    Vazio se METRICS_ENABLED estiver desligado.
+    """
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
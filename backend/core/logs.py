@@ -0,0 +1,167 @@
+"""
+Structured, non-blocking logging.
+
+`configure` is Django's LOGGING_CONFIG callable: it applies LOGGING and then,
+with LOG_QUEUE enabled, moves the root handlers behind a `QueueHandler`, so
+request threads only enqueue records; formatting and writing happen in a
+background `QueueListener` thread.
+
+- `RequestIdFilter` tags every record with the id of the request being served
+  (`request_id_middleware` reads `X-Request-ID` or generates one and echoes it
+  in the response).
+- `SamplingFilter` keeps only a fraction of the records below WARNING for the
+  loggers listed in LOG_SAMPLE_RATES; a call site can also pass
+  `extra={'sample_rate': 0.01}`.
+- `JSONFormatter` writes one JSON object per line, including `extra` fields.
+"""
+import atexit
+import json
+import logging
+import logging.config
+import queue
+import random
+import re
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+_request_id: ContextVar[Optional[str]] = ContextVar('seal_request_id', default=None)
+
+# Attributes of every LogRecord; anything else came from `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id', 'sample_rate'}
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds `record.request_id` (or '-' outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'request_id'):
+            # django.request logs after the middleware chain, but passes the request
+            request_id = _request_id.get() or getattr(getattr(record, 'request', None), 'request_id', None)
+            record.request_id = request_id or '-'
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps records below WARNING with the probability configured for the most
+    specific matching logger prefix (or the record's own `sample_rate`).
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        # Longest prefix first
+        self.rates = sorted((rates or {}).items(), key=lambda item: -len(item[0]))
+
+    def _rate(self, record: logging.LogRecord) -> float:
+        rate = getattr(record, 'sample_rate', None)
+        if rate is not None:
+            return rate
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request id and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock handler formats the message on the calling thread; records go
+    # to an in-process queue, so they can be passed as-is and formatted by the
+    # listener instead
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _enqueue_root_handlers() -> None:
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if not handlers:
+        return
+    queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+    for handler in handlers:
+        # Request id depends on the calling thread and sampling should drop
+        # records before they are queued: run those filters before enqueueing
+        for log_filter in list(handler.filters):
+            if isinstance(log_filter, (RequestIdFilter, SamplingFilter)):
+                handler.removeFilter(log_filter)
+                queue_handler.addFilter(log_filter)
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def configure(config: dict) -> None:
+    """LOGGING_CONFIG entry point."""
+    logging.config.dictConfig(config)
+    if settings.LOG_QUEUE:
+        _enqueue_root_handlers()
+
+
+def _clean_request_id(value: Optional[str]) -> str:
+    if value and _VALID_REQUEST_ID.match(value):
+        return value
+    return uuid.uuid4().hex
+
+
+@sync_and_async_middleware
+def request_id_middleware(get_response):
+    """Binds a request id to the logs of each request and echoes it back."""
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            request_id = _clean_request_id(request.headers.get(REQUEST_ID_HEADER))
+            request.request_id = request_id
+            token = _request_id.set(request_id)
+            try:
+                response = await get_response(request)
+            finally:
+                _request_id.reset(token)
+            response[REQUEST_ID_HEADER] = request_id
+            return response
+    else:
+        def middleware(request):
+            request_id = _clean_request_id(request.headers.get(REQUEST_ID_HEADER))
+            request.request_id = request_id
+            token = _request_id.set(request_id)
+            try:
+                response = get_response(request)
+            finally:
+                _request_id.reset(token)
+            response[REQUEST_ID_HEADER] = request_id
+            return response
+
+    return middleware
@@ -0,0 +1,217 @@
+"""
+Per-endpoint performance metrics in Prometheus text format.
+
+With METRICS_ENABLED, `metrics_middleware` records for every request, labelled
+by HTTP method and URL route (e.g. `api/crm/leads/<int:lead_id>/move`):
+
+- latency histogram and request counter (by status);
+- number of SQL queries and time spent in the database;
+- time spent rendering the response body (JSON serialization);
+- response size.
+
+Database and serialization timings are collected through a context variable,
+so queries run by async views in `sync_to_async` threads are counted too.
+Metrics are kept per process. When disabled, the middleware removes itself and
+no database hook is installed.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+from ninja.renderers import JSONRenderer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Thread-safe labelled histogram with fixed buckets."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self, label_names: Sequence[str]) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(snapshot):
+            base = _format_labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{base},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return '\n'.join(lines)
+
+
+class Counter:
+    """Thread-safe labelled counter."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, int] = {}
+
+    def inc(self, labels: Tuple) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + 1
+
+    def render(self, label_names: Sequence[str]) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for labels, value in snapshot:
+            lines.append(f"{self.name}{{{_format_labels(label_names, labels)}}} {value}")
+        return '\n'.join(lines)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Tuple) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+LABELS = ('method', 'route')
+
+REQUESTS = Counter('seal_http_requests_total', 'Requests handled.')
+LATENCY = Histogram('seal_http_request_duration_seconds', 'Request latency.', LATENCY_BUCKETS)
+DB_QUERIES = Histogram('seal_http_db_queries', 'SQL queries per request.', QUERY_COUNT_BUCKETS)
+DB_TIME = Histogram('seal_http_db_duration_seconds', 'Database time per request.', LATENCY_BUCKETS)
+SERIALIZATION_TIME = Histogram(
+    'seal_http_serialization_duration_seconds', 'Response rendering time per request.', LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram('seal_http_response_size_bytes', 'Response body size.', SIZE_BUCKETS)
+
+
+class RequestMetrics:
+    """Timings accumulated while serving one request."""
+
+    __slots__ = ('queries', 'db_time', 'serialization_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('seal_request_metrics', default=None)
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+def _install_query_hook(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON renderer that adds its rendering time to the request metrics."""
+
+    def render(self, request, data, *, response_status):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(request, data, response_status=response_status)
+        start = time.perf_counter()
+        try:
+            return super().render(request, data, response_status=response_status)
+        finally:
+            metrics.serialization_time += time.perf_counter() - start
+
+
+def _route(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else 'unmatched'
+
+
+def _observe(request, response, metrics: RequestMetrics, elapsed: float) -> None:
+    labels = (request.method, _route(request))
+    REQUESTS.inc(labels + (response.status_code,))
+    LATENCY.observe(labels, elapsed)
+    DB_QUERIES.observe(labels, metrics.queries)
+    DB_TIME.observe(labels, metrics.db_time)
+    SERIALIZATION_TIME.observe(labels, metrics.serialization_time)
+    if not response.streaming:
+        RESPONSE_SIZE.observe(labels, len(response.content))
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Records the metrics of each request (see module docstring)."""
+    if not settings.METRICS_ENABLED:
+        raise MiddlewareNotUsed
+    connection_created.connect(_install_query_hook, dispatch_uid='seal-metrics-query-hook')
+    for connection in connections.all(initialized_only=True):
+        _install_query_hook(None, connection)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            metrics = RequestMetrics()
+            token = _current.set(metrics)
+            start = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            _observe(request, response, metrics, time.perf_counter() - start)
+            return response
+    else:
+        def middleware(request):
+            metrics = RequestMetrics()
+            token = _current.set(metrics)
+            start = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            _observe(request, response, metrics, time.perf_counter() - start)
+            return response
+
+    return middleware
+
+
+def render_metrics() -> str:
+    """All metrics of this process in Prometheus text exposition format."""
+    parts = [REQUESTS.render(LABELS + ('status',))]
+    parts.extend(
+        histogram.render(LABELS)
+        for histogram in (LATENCY, DB_QUERIES, DB_TIME, SERIALIZATION_TIME, RESPONSE_SIZE)
+    )
+    return '\n'.join(parts) + '\n'
@@ -0,0 +1,283 @@
+"""
+Opt-in sampling profiler for single requests.
+
+With PROFILING_ENABLED, `profiling_middleware` profiles a request when:
+
+- it carries `X-Profile: 1` together with a valid `X-Internal-Token`, or
+- it is picked at random with probability PROFILING_SAMPLE_RATE.
+
+A profiled request gets a background thread that samples the call stacks of
+the threads serving it every PROFILING_INTERVAL_MS (the request thread plus
+any thread that runs its SQL, e.g. `sync_to_async` threads under ASGI), and a
+timeline of its SQL queries. The result is written as JSON to PROFILING_DIR
+(the newest PROFILING_MAX_FILES are kept) and its id is returned in the
+`X-Profile-Id` header; staff can list and download profiles in the admin
+(`/admin/profiling/`). Stacks are also exported in the folded format read by
+flamegraph.pl and speedscope.
+
+Requests that are not profiled only pay for a header lookup and a random
+draw; when disabled, the middleware removes itself.
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+from core.auth import internal_auth
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+MAX_STACK_DEPTH = 128
+MAX_SQL_LENGTH = 2000
+
+_VALID_PROFILE_ID = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+
+class RequestProfile:
+    """Samples and queries collected while serving one request."""
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.started = time.perf_counter()
+        self.threads = {threading.get_ident()}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.queries: List[dict] = []
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='seal-profiler', daemon=True)
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> float:
+        """Stops sampling and returns the elapsed time (s)."""
+        elapsed = time.perf_counter() - self.started
+        self._stop.set()
+        self._sampler.join()
+        return elapsed
+
+    def _sample(self) -> None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            for ident in tuple(self.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_fold(frame)] += 1
+                    self.samples += 1
+            del frames
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar('seal_request_profile', default=None)
+
+
+@lru_cache(maxsize=1024)
+def _short_path(filename: str) -> str:
+    base = str(settings.BASE_DIR) + os.sep
+    if filename.startswith(base):
+        return filename[len(base):]
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+def _fold(frame) -> str:
+    """`root;...;leaf`, one `function (file:first line)` per frame."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    profile.threads.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries.append({
+            'start_ms': round((start - profile.started) * 1000, 3),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'alias': context['connection'].alias,
+            'sql': sql[:MAX_SQL_LENGTH],
+        })
+
+
+def _install_query_hook(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _trigger(request) -> Optional[str]:
+    if request.headers.get(PROFILE_HEADER) and internal_auth.authenticate(
+        request, request.headers.get(internal_auth.param_name)
+    ):
+        return 'header'
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate > 0 and random.random() < rate:
+        return 'sample'
+    return None
+
+
+def _route(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else 'unmatched'
+
+
+def _user_id(request) -> Optional[str]:
+    auth = getattr(request, 'auth', None)
+    user_id = getattr(auth, 'id', None)
+    return str(user_id) if user_id is not None else None
+
+
+def _path(profile_id: str) -> str:
+    return os.path.join(settings.PROFILING_DIR, f"{profile_id}.json")
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:  # pruned by another process
+        return 0.0
+
+
+def _stored() -> List[str]:
+    """Paths of the stored profiles, oldest first."""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    paths = [
+        os.path.join(settings.PROFILING_DIR, name)
+        for name in os.listdir(settings.PROFILING_DIR) if name.endswith('.json')
+    ]
+    return sorted(paths, key=_mtime)
+
+
+def _prune() -> None:
+    for path in _stored()[:-settings.PROFILING_MAX_FILES]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def save(profile: RequestProfile, request, response, elapsed: float) -> str:
+    """Writes the profile to PROFILING_DIR and returns its id."""
+    now = datetime.now(timezone.utc)
+    profile_id = f"{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    data = {
+        'id': profile_id,
+        'created': now.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'route': _route(request),
+        'status': response.status_code,
+        'duration_ms': round(elapsed * 1000, 3),
+        'trigger': profile.trigger,
+        'request_id': getattr(request, 'request_id', None),
+        'user_id': _user_id(request),
+        'interval_ms': settings.PROFILING_INTERVAL_MS,
+        'samples': profile.samples,
+        'db_ms': round(sum(query['duration_ms'] for query in profile.queries), 3),
+        'queries': profile.queries,
+        'stacks': dict(profile.stacks.most_common()),
+    }
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    path = _path(profile_id)
+    with open(path + '.tmp', 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+    _prune()
+    return profile_id
+
+
+def load(profile_id: str) -> Optional[Dict]:
+    if not _VALID_PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(_path(profile_id), encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def list_profiles() -> List[Dict]:
+    """Summaries of the stored profiles, newest first."""
+    summaries = []
+    for path in reversed(_stored()):
+        data = load(os.path.basename(path)[:-len('.json')])
+        if data is not None:
+            data['queries'] = len(data['queries'])
+            del data['stacks']
+            summaries.append(data)
+    return summaries
+
+
+def folded(data: Dict) -> str:
+    """Stacks in the folded format (`frame;frame;frame count` per line)."""
+    return ''.join(f"{stack} {count}\n" for stack, count in data['stacks'].items())
+
+
+@sync_and_async_middleware
+def profiling_middleware(get_response):
+    """Profiles the requests selected by `_trigger` (see module docstring)."""
+    if not settings.PROFILING_ENABLED:
+        raise MiddlewareNotUsed
+    connection_created.connect(_install_query_hook, dispatch_uid='seal-profiling-query-hook')
+    for connection in connections.all(initialized_only=True):
+        _install_query_hook(None, connection)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            trigger = _trigger(request)
+            if trigger is None:
+                return await get_response(request)
+            profile = RequestProfile(trigger)
+            token = _current.set(profile)
+            profile.start()
+            try:
+                response = await get_response(request)
+            finally:
+                elapsed = profile.stop()
+                _current.reset(token)
+            profile_id = await sync_to_async(save, thread_sensitive=False)(profile, request, response, elapsed)
+            response[PROFILE_ID_HEADER] = profile_id
+            return response
+    else:
+        def middleware(request):
+            trigger = _trigger(request)
+            if trigger is None:
+                return get_response(request)
+            profile = RequestProfile(trigger)
+            token = _current.set(profile)
+            profile.start()
+            try:
+                response = get_response(request)
+            finally:
+                elapsed = profile.stop()
+                _current.reset(token)
+            response[PROFILE_ID_HEADER] = save(profile, request, response, elapsed)
+            return response
+
+    return middleware
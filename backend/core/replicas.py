@@ -0,0 +1,145 @@
+"""
+Read-replica routing.
+
+When a `replica` database is configured, reads made while serving GET/HEAD
+requests go to it and everything else uses the primary (`default`):
+
+- writes always go to the primary, and once a request writes, its remaining
+  reads go to the primary too (read-after-write within the request);
+- after a request that wrote (or any unsafe method), the same client is pinned
+  to the primary for DB_REPLICA_PIN_SECONDS, so the next GET sees its own write
+  despite replication lag;
+- reads inside `transaction.atomic()` and outside requests (management
+  commands, webhook worker, SSE streams) use the primary.
+
+Routing state lives in a context variable, so it follows the request into
+`sync_to_async` threads under ASGI.
+"""
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY_PREFIX = 'seal:db-pin:'
+
+
+class RoutingState:
+    """Per-request routing flags (mutable, shared with child contexts)."""
+
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica: bool):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('seal_db_routing', default=None)
+
+
+def replica_configured() -> bool:
+    return settings.DB_REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_primary():
+    """Force reads in the block to the primary (e.g. before caching derived data)."""
+    token = _state.set(RoutingState(use_replica=False))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    """Database router; a no-op unless the replica alias is configured."""
+
+    def db_for_read(self, model, **hints):
+        if not replica_configured():
+            return None
+        state = _state.get()
+        if (
+            state is None
+            or not state.use_replica
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return settings.DB_REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if not replica_configured():
+            return None
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        # Explicit: instances loaded from the replica must still be saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.DB_REPLICA_ALIAS:
+            return False
+        return None
+
+
+def _pin_key(request) -> Optional[str]:
+    # Clients are identified by their bearer token (or session); anonymous
+    # requests are never pinned
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credential:
+        return None
+    return PIN_KEY_PREFIX + hashlib.sha256(credential.encode()).hexdigest()[:32]
+
+
+def _should_pin(request, state: RoutingState) -> bool:
+    return state.wrote or request.method not in SAFE_METHODS
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """Installs the per-request routing state (see module docstring)."""
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not replica_configured():
+                return await get_response(request)
+            key = _pin_key(request)
+            pinned = key is not None and await cache.aget(key) is not None
+            state = RoutingState(request.method in SAFE_METHODS and not pinned)
+            token = _state.set(state)
+            try:
+                response = await get_response(request)
+            finally:
+                _state.reset(token)
+            if key is not None and _should_pin(request, state):
+                await cache.aset(key, 1, settings.DB_REPLICA_PIN_SECONDS)
+            return response
+    else:
+        def middleware(request):
+            if not replica_configured():
+                return get_response(request)
+            key = _pin_key(request)
+            pinned = key is not None and cache.get(key) is not None
+            state = RoutingState(request.method in SAFE_METHODS and not pinned)
+            token = _state.set(state)
+            try:
+                response = get_response(request)
+            finally:
+                _state.reset(token)
+            if key is not None and _should_pin(request, state):
+                cache.set(key, 1, settings.DB_REPLICA_PIN_SECONDS)
+            return response
+
+    return middleware
@@ -0,0 +1,326 @@
+"""
+Tagged per-user response cache for Django Ninja GET operations.
+
+`cached_response('leads:{profile}')` stores the rendered body of a 200
+response under (profile, onboarding step, path, query string), so a warm hit
+skips the view, the database and serialization. Each entry depends on tags
+(`{profile}` is the authenticated profile id):
+
+- `leads:<profile>`, `commissions:<profile>`, `progress:<profile>`;
+- `profile:<profile>` for responses reading Profile fields other than the
+  onboarding step (e.g. financial goal);
+- `catalog` for data shared by everyone (Arsenal and training modules).
+
+Every tag has a version token; an entry records the versions it was computed
+under and is only served while they are all current. `invalidate(*tags)`
+replaces the tokens once the transaction commits, from model signals and from
+`TaggedQuerySet` bulk writes (which do not send signals). Because the versions
+are read before the view runs, a response computed concurrently with a write
+is never served after that write commits.
+
+RESPONSE_CACHE selects the backend: `memory` (LRU per process, limited to
+RESPONSE_CACHE_MAX_ENTRIES), `shared` (the RESPONSE_CACHE_ALIAS Django cache,
+e.g. Redis, required with several processes since invalidations must reach
+all of them) or `off`.
+"""
+import inspect
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.http import HttpResponse
+from ninja.decorators import decorate_view
+
+from core.replicas import use_primary
+
+CACHE_HEADER = 'X-Response-Cache'
+TAG_KEY_PREFIX = 'seal:response-tag:'
+ENTRY_KEY_PREFIX = 'seal:response:'
+# Implicit tag of every shared entry, bumped by `clear`
+ALL_TAG = '*'
+
+
+class Entry:
+    """A rendered response and the tag versions it was computed under."""
+
+    __slots__ = ('content', 'content_type', 'versions')
+
+    def __init__(self, content: bytes, content_type: str, versions: Dict[str, str]):
+        self.content = content
+        self.content_type = content_type
+        self.versions = versions
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class MemoryBackend:
+    """Per-process LRU; tag versions are kept apart so they are never evicted."""
+
+    local = True
+
+    def __init__(self, max_entries: int, timeout: int):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, Entry]]' = OrderedDict()
+        self._versions: Dict[str, str] = {}
+
+    def lookup(self, key: str, tags: List[str]) -> Tuple[Optional[Entry], Dict[str, str]]:
+        with self._lock:
+            versions = {tag: self._versions.setdefault(tag, _new_version()) for tag in tags}
+            item = self._entries.get(key)
+            if item is None:
+                return None, versions
+            expires, entry = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None, versions
+            self._entries.move_to_end(key)
+            return entry, versions
+
+    def store(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = _new_version()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class SharedBackend:
+    """
+    Django cache alias shared by all processes; one round trip per lookup.
+    Every entry also depends on ALL_TAG, so `clear` drops the cached responses
+    without touching other keys in the alias (e.g. idempotency entries).
+    """
+
+    local = False
+
+    def __init__(self, alias: str, timeout: int):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def lookup(self, key: str, tags: List[str]) -> Tuple[Optional[Entry], Dict[str, str]]:
+        tag_keys = {TAG_KEY_PREFIX + tag: tag for tag in (*tags, ALL_TAG)}
+        found = self.cache.get_many([ENTRY_KEY_PREFIX + key, *tag_keys])
+        versions = {}
+        for tag_key, tag in tag_keys.items():
+            version = found.get(tag_key)
+            if version is None:
+                # `add` keeps the version another process may have just created
+                self.cache.add(tag_key, _new_version(), None)
+                version = self.cache.get(tag_key)
+            versions[tag] = version
+        return found.get(ENTRY_KEY_PREFIX + key), versions
+
+    def store(self, key: str, entry: Entry) -> None:
+        self.cache.set(ENTRY_KEY_PREFIX + key, entry, self.timeout)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.cache.set_many({TAG_KEY_PREFIX + tag: _new_version() for tag in tags}, None)
+
+    def clear(self) -> None:
+        self.invalidate([ALL_TAG])
+
+
+_backend = None
+_backend_setting = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Backend selected by RESPONSE_CACHE (None when `off`)."""
+    global _backend, _backend_setting
+    if _backend_setting != settings.RESPONSE_CACHE:
+        with _backend_lock:
+            if settings.RESPONSE_CACHE == 'memory':
+                _backend = MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TIMEOUT)
+            elif settings.RESPONSE_CACHE == 'shared':
+                _backend = SharedBackend(settings.RESPONSE_CACHE_ALIAS, settings.RESPONSE_CACHE_TIMEOUT)
+            else:
+                _backend = None
+            _backend_setting = settings.RESPONSE_CACHE
+    return _backend
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidate every response depending on `tags` once the current transaction commits."""
+    backend = get_backend()
+    if backend is not None and tags:
+        transaction.on_commit(lambda: backend.invalidate(tags))
+
+
+def clear() -> None:
+    """Drop every cached response (benchmarks)."""
+    backend = get_backend()
+    if backend is not None:
+        backend.clear()
+
+
+def _cache_key(request) -> str:
+    profile = request.auth
+    query = '&'.join(f"{name}={value}" for name, value in sorted(request.GET.lists()))
+    return f"{profile.id}:{profile.onboarding_step}:{request.path}?{query}"
+
+
+def _hit(entry: Entry) -> HttpResponse:
+    response = HttpResponse(entry.content, content_type=entry.content_type)
+    response[CACHE_HEADER] = 'hit'
+    return response
+
+
+def _store(backend, request, response):
+    pending = getattr(request, '_response_cache', None)
+    if pending is None:
+        return response
+    key, versions = pending
+    response[CACHE_HEADER] = 'miss'
+    if response.status_code == 200 and not response.streaming:
+        backend.store(key, Entry(response.content, response['Content-Type'], versions))
+    return response
+
+
+def _store_rendered(run):
+    # Runs around the whole operation: the entry is the rendered response
+    if inspect.iscoroutinefunction(run):
+        @wraps(run)
+        async def async_wrapper(request, *args, **kwargs):
+            response = await run(request, *args, **kwargs)
+            backend = get_backend()
+            if backend is None:
+                return response
+            if backend.local:
+                return _store(backend, request, response)
+            return await sync_to_async(_store)(backend, request, response)
+        return async_wrapper
+
+    @wraps(run)
+    def wrapper(request, *args, **kwargs):
+        response = run(request, *args, **kwargs)
+        backend = get_backend()
+        return response if backend is None else _store(backend, request, response)
+    return wrapper
+
+
+def _lookup(backend, request, tag_templates: Tuple[str, ...]) -> Optional[HttpResponse]:
+    tags = [template.format(profile=request.auth.id) for template in tag_templates]
+    key = _cache_key(request)
+    entry, versions = backend.lookup(key, tags)
+    if entry is not None and entry.versions == versions:
+        return _hit(entry)
+    request._response_cache = (key, versions)
+    return None
+
+
+def cached_response(*tag_templates: str):
+    """
+    Decorator for authenticated Ninja GET operations whose response is a
+    function of the profile, the request path/query and the tagged data.
+
+    Place it below `@router.get` (and below `@etag_condition`, so 304s are
+    still answered first). Works with `async def` views too. Requests with
+    `skip_response_cache` set (atomic batches) bypass the cache.
+
+    On a miss the view reads from the primary: the entry is stored under the
+    versions read before it ran, and a lagging replica would cache pre-write
+    data as current.
+    """
+    def decorator(view_func):
+        if inspect.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                backend = get_backend()
+                if backend is not None and not getattr(request, 'skip_response_cache', False):
+                    if backend.local:
+                        response = _lookup(backend, request, tag_templates)
+                    else:
+                        response = await sync_to_async(_lookup)(backend, request, tag_templates)
+                    if response is not None:
+                        return response
+                    with use_primary():
+                        return await view_func(request, *args, **kwargs)
+                return await view_func(request, *args, **kwargs)
+            return decorate_view(_store_rendered)(async_wrapper)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            backend = get_backend()
+            if backend is not None and not getattr(request, 'skip_response_cache', False):
+                response = _lookup(backend, request, tag_templates)
+                if response is not None:
+                    return response
+                with use_primary():
+                    return view_func(request, *args, **kwargs)
+            return view_func(request, *args, **kwargs)
+        return decorate_view(_store_rendered)(wrapper)
+    return decorator
+
+
+class TaggedQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk writes (`update`, `bulk_create`, `bulk_update`)
+    invalidate the response cache tags of the rows they touch. Subclasses set
+    `cache_tag` and, for per-profile data, the `cache_tag_field` filling `{profile}`.
+    """
+
+    cache_tag: str = ''
+    cache_tag_field: Optional[str] = None
+
+    def cache_tags(self, objs: Optional[Iterable] = None) -> List[str]:
+        """Tags of `objs`, or of the rows matched by this queryset."""
+        if self.cache_tag_field is None:
+            return [self.cache_tag]
+        if objs is None:
+            ids = set(self.order_by().values_list(self.cache_tag_field, flat=True).distinct())
+        else:
+            ids = {getattr(obj, self.cache_tag_field) for obj in objs}
+        return [self.cache_tag.format(profile=profile_id) for profile_id in ids]
+
+    def update(self, **kwargs):
+        tags = self.cache_tags() if get_backend() is not None else []
+        rows = super().update(**kwargs)
+        if self.cache_tag_field is not None:
+            # Rows moved to another profile invalidate its tag too
+            field = self.cache_tag_field
+            owner = kwargs.get(field, kwargs.get(field.removesuffix('_id')))
+            owner = getattr(owner, 'pk', owner)
+            if owner is not None and not hasattr(owner, 'resolve_expression'):
+                tags.append(self.cache_tag.format(profile=owner))
+        if rows:
+            invalidate(*tags)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        invalidate(*self.cache_tags(objs))
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        invalidate(*self.cache_tags(objs))
+        return rows
+
+
+def invalidate_instance(instance: models.Model) -> None:
+    """Invalidate the tags of a saved/deleted instance (for post_save/post_delete receivers)."""
+    queryset = type(instance)._default_manager.get_queryset()
+    invalidate(*queryset.cache_tags([instance]))
@@ -1,6 +1,7 @@
 """
 Django settings for SEAL Platform.
 """
+import copy
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -31,9 +32,16 @@ INSTALLED_APPS = [
     'apps.resources',
     'apps.commissions',
     'apps.onboarding',
+    'apps.search',
+    'apps.warroom',
+    'apps.webhooks',
+    'apps.benchmarks',
 ]
 
 MIDDLEWARE = [
+    'core.logs.request_id_middleware',
+    'core.metrics.metrics_middleware',
+    'core.profiling.profiling_middleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -42,6 +50,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.idempotency.idempotency_middleware',
+    'core.replicas.replica_routing_middleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -74,11 +84,50 @@ DATABASES = {
         'HOST': os.getenv('SUPABASE_DB_HOST', 'localhost'),
         'PORT': os.getenv('SUPABASE_DB_PORT', '5432'),
         'OPTIONS': {
-            'options': '-c search_path=seal,public'
+            'options': '-c search_path=seal,public,extensions'
         },
+        # Validates connections before use (pool checkout / persistent connections)
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Connection pool (psycopg 3): avoids a TLS + auth handshake with Supabase per request.
+# Each process (gunicorn/uvicorn worker, webhook worker) has its own pool.
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'True').lower() == 'true'
+if DB_POOL_ENABLED:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '16')),
+        # Seconds a request waits for a free connection before failing
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+        'reconnect_timeout': float(os.getenv('DB_POOL_RECONNECT_TIMEOUT', '60')),
+        'name': 'seal-default',
+    }
+else:
+    # Without the pool (e.g. behind PgBouncer), keep connections open between requests
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+# Read replica: reads of GET/HEAD requests are routed to it (core/replicas.py)
+DB_REPLICA_ALIAS = 'replica'
+DB_REPLICA_HOST = os.getenv('SUPABASE_DB_REPLICA_HOST', '')
+# A different database name (e.g. a second database on a local server for testing)
+DB_REPLICA_NAME = os.getenv('SUPABASE_DB_REPLICA_NAME', '')
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES[DB_REPLICA_ALIAS] = copy.deepcopy(DATABASES['default'])
+    DATABASES[DB_REPLICA_ALIAS].update({
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'PORT': os.getenv('SUPABASE_DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'TEST': {'MIRROR': 'default'},
+    })
+    if 'pool' in DATABASES[DB_REPLICA_ALIAS]['OPTIONS']:
+        DATABASES[DB_REPLICA_ALIAS]['OPTIONS']['pool']['name'] = 'seal-replica'
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+# Seconds a client keeps reading from the primary after a write (replication lag)
+DB_REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '5'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -113,9 +162,139 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
+    'idempotency-key',
 ]
+CORS_EXPOSE_HEADERS = ['etag', 'idempotent-replayed']
+
+# Cache - version tokens for catalog endpoints (conditional GET)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'seal-default',
+    }
+}
+CATALOG_VERSION_TIMEOUT = int(os.getenv('CATALOG_VERSION_TIMEOUT', '300'))
+# Single-flight for cache misses (core/singleflight.py); DB locks coalesce across processes (PostgreSQL)
+SINGLEFLIGHT_WAIT_SECONDS = float(os.getenv('SINGLEFLIGHT_WAIT_SECONDS', '10'))
+SINGLEFLIGHT_DB_LOCKS = os.getenv('SINGLEFLIGHT_DB_LOCKS', 'False').lower() == 'true'
+# Tagged response cache for GET endpoints (core/response_cache.py): 'memory', 'shared' or 'off'.
+# 'memory' is per process; with several workers use 'shared' (RESPONSE_CACHE_ALIAS, e.g. Redis)
+RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', 'off').lower()
+RESPONSE_CACHE_ALIAS = os.getenv('RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '5000'))
+PROFILE_EMAIL_CACHE_TIMEOUT = int(os.getenv('PROFILE_EMAIL_CACHE_TIMEOUT', '3600'))
+# Batch endpoint (core/batch.py): maximum sub-requests per POST /api/batch
+BATCH_MAX_OPERATIONS = int(os.getenv('BATCH_MAX_OPERATIONS', '20'))
+# Idempotency-Key for POST/PUT/PATCH/DELETE (core/idempotency.py); use a shared cache with several processes
+IDEMPOTENCY_ENABLED = os.getenv('IDEMPOTENCY_ENABLED', 'True').lower() == 'true'
+IDEMPOTENCY_CACHE_ALIAS = os.getenv('IDEMPOTENCY_CACHE_ALIAS', 'default')
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))
+IDEMPOTENCY_MAX_BYTES = int(os.getenv('IDEMPOTENCY_MAX_BYTES', '65536'))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '10'))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', '60'))
 
 # Supabase Auth Settings
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY', '')
 SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET', '')
+# Admin API (sync_profile_emails) - never expose to the frontend
+SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY', '')
+
+# Arsenal local storage - resources with file_url "local://<path>" are served by the backend
+RESOURCES_STORAGE_ROOT = os.getenv('RESOURCES_STORAGE_ROOT', str(BASE_DIR / 'storage' / 'resources'))
+RESOURCES_DOWNLOAD_MAX_AGE = int(os.getenv('RESOURCES_DOWNLOAD_MAX_AGE', '3600'))
+# '' (stream from Django / wsgi.file_wrapper), 'nginx' (X-Accel-Redirect) or 'apache'/'lighttpd' (X-Sendfile)
+FILE_SENDFILE_BACKEND = os.getenv('FILE_SENDFILE_BACKEND', '')
+FILE_SENDFILE_URL_PREFIX = os.getenv('FILE_SENDFILE_URL_PREFIX', '/protected/resources')
+
+# Webhook queue (seal.webhook_events) - processed by `python manage.py process_webhooks`
+WEBHOOKS_BATCH_SIZE = int(os.getenv('WEBHOOKS_BATCH_SIZE', '50'))
+WEBHOOKS_POLL_INTERVAL = float(os.getenv('WEBHOOKS_POLL_INTERVAL', '2'))
+WEBHOOKS_MAX_ATTEMPTS = int(os.getenv('WEBHOOKS_MAX_ATTEMPTS', '8'))
+WEBHOOKS_RETRY_BASE_SECONDS = int(os.getenv('WEBHOOKS_RETRY_BASE_SECONDS', '30'))
+WEBHOOKS_RETRY_MAX_SECONDS = int(os.getenv('WEBHOOKS_RETRY_MAX_SECONDS', '3600'))
+WEBHOOKS_VISIBILITY_TIMEOUT = int(os.getenv('WEBHOOKS_VISIBILITY_TIMEOUT', '300'))
+
+# Calendly webhook signature (empty disables verification, e.g. in development)
+CALENDLY_WEBHOOK_SIGNING_KEY = os.getenv('CALENDLY_WEBHOOK_SIGNING_KEY', '')
+CALENDLY_WEBHOOK_TOLERANCE = int(os.getenv('CALENDLY_WEBHOOK_TOLERANCE', '180'))
+
+# Calendly API (backfill: `python manage.py sync_calendly_schedules`)
+CALENDLY_API_URL = os.getenv('CALENDLY_API_URL', 'https://api.calendly.com')
+CALENDLY_API_TOKEN = os.getenv('CALENDLY_API_TOKEN', '')
+CALENDLY_ORGANIZATION_URI = os.getenv('CALENDLY_ORGANIZATION_URI', '')
+
+# Pooled async HTTP client for external APIs (core/http.py)
+HTTP_CLIENT_CONCURRENCY = int(os.getenv('HTTP_CLIENT_CONCURRENCY', '8'))
+HTTP_CLIENT_TIMEOUT = float(os.getenv('HTTP_CLIENT_TIMEOUT', '20'))
+HTTP_CLIENT_MAX_RETRIES = int(os.getenv('HTTP_CLIENT_MAX_RETRIES', '5'))
+HTTP_CLIENT_RETRY_BASE_SECONDS = float(os.getenv('HTTP_CLIENT_RETRY_BASE_SECONDS', '0.5'))
+HTTP_CLIENT_RETRY_MAX_SECONDS = float(os.getenv('HTTP_CLIENT_RETRY_MAX_SECONDS', '30'))
+
+# Internal endpoints (/api/internal/*: pool stats, metrics); disabled when empty
+INTERNAL_API_TOKEN = os.getenv('INTERNAL_API_TOKEN', '')
+# Per-endpoint metrics served at /api/internal/metrics (core/metrics.py)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+
+# Request profiler (core/profiling.py): `X-Profile: 1` + X-Internal-Token, or a random sample
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '5'))
+PROFILING_DIR = os.getenv('PROFILING_DIR', str(BASE_DIR / '.profiles'))
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '200'))
+
+# Benchmark results (`python manage.py bench_api`)
+BENCHMARK_RESULTS_DIR = os.getenv('BENCHMARK_RESULTS_DIR', str(BASE_DIR / '.benchmarks'))
+
+# Logging (core/logs.py): records are formatted and written by a background thread
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_QUEUE = os.getenv('LOG_QUEUE', 'True').lower() == 'true'
+# Per-module levels and sampling rates, e.g. "django.request=ERROR,core.auth=DEBUG" / "core.auth=0.1"
+LOG_LEVELS = {
+    name.strip(): level.strip().upper()
+    for name, level in (item.split('=', 1) for item in os.getenv('LOG_LEVELS', '').split(',') if '=' in item)
+}
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (item.split('=', 1) for item in os.getenv('LOG_SAMPLE_RATES', '').split(',') if '=' in item)
+}
+LOGGING_CONFIG = 'core.logs.configure'
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'core.logs.RequestIdFilter'},
+        'sampling': {'()': 'core.logs.SamplingFilter', 'rates': LOG_SAMPLE_RATES},
+    },
+    'formatters': {
+        'json': {'()': 'core.logs.JSONFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': LOG_FORMAT,
+            'filters': ['request_id', 'sampling'],
+        },
+    },
+    'root': {'handlers': ['console'], 'level': LOG_LEVEL},
+    'loggers': {
+        # Django's own handlers are replaced: everything goes through the root handler
+        'django': {'handlers': [], 'level': LOG_LEVELS.get('django', LOG_LEVEL), 'propagate': True},
+        **{name: {'level': level} for name, level in LOG_LEVELS.items() if name != 'django'},
+    },
+}
+
+# Server-sent events (core/events.py)
+# EVENTS_PG_NOTIFY carries events between processes (web/worker) via LISTEN/NOTIFY
+EVENTS_PG_NOTIFY = os.getenv('EVENTS_PG_NOTIFY', 'False').lower() == 'true'
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', '100'))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+EVENTS_STREAM_MAX_AGE = int(os.getenv('EVENTS_STREAM_MAX_AGE', '300'))
+EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', '3000'))
+# Open SSE streams per process (0 = unlimited); each one holds a worker thread
+EVENTS_MAX_STREAMS = int(os.getenv('EVENTS_MAX_STREAMS', '16'))
+EVENTS_LISTENER_RETRY_SECONDS = float(os.getenv('EVENTS_LISTENER_RETRY_SECONDS', '5'))
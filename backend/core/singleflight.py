@@ -0,0 +1,107 @@
+"""
+Single-flight execution of expensive shared reads.
+
+When a cached value expires (or right after a deploy), every request that
+needs it would recompute it at once. `do(key, fn)` lets only the first caller
+in the process run `fn`; concurrent callers with the same key wait for that
+call and get its result (or its exception). A waiter that gives up after
+SINGLEFLIGHT_WAIT_SECONDS computes the value itself.
+
+`db_lock(key)` extends this across processes with a PostgreSQL transaction
+advisory lock (SINGLEFLIGHT_DB_LOCKS): the first process computes and fills
+the shared cache while the others wait on the lock and then find the value
+in the cache. It is a no-op on other databases or when disabled.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, TypeVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# First argument of pg_advisory_xact_lock(int, int): keeps these locks apart from others
+ADVISORY_LOCK_NAMESPACE = 0x5EA1
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class Group:
+    """Deduplicates concurrent calls sharing a key within the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(settings.SINGLEFLIGHT_WAIT_SECONDS):
+                logger.warning("Tempo de espera esgotado; calculando sem coalescer", extra={'key': key})
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+
+_group = Group()
+
+
+def do(key: str, fn: Callable[[], T]) -> T:
+    """Run `fn` once for all concurrent callers with the same key in this process."""
+    return _group.do(key, fn)
+
+
+@contextmanager
+def db_lock(key: str, using: str = DEFAULT_DB_ALIAS):
+    """
+    Hold a PostgreSQL advisory lock on `key` for the block (inside a
+    transaction). If the lock is not granted within SINGLEFLIGHT_WAIT_SECONDS
+    the block runs anyway.
+    """
+    connection = connections[using]
+    if not settings.SINGLEFLIGHT_DB_LOCKS or connection.vendor != 'postgresql':
+        yield
+        return
+    with transaction.atomic(using=using):
+        try:
+            # Savepoint: a lock timeout must not abort the enclosing transaction
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('lock_timeout', %s, true)",
+                    [f"{int(settings.SINGLEFLIGHT_WAIT_SECONDS * 1000)}ms"],
+                )
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s::int, hashtext(%s))",
+                    [ADVISORY_LOCK_NAMESPACE, key],
+                )
+        except DatabaseError:
+            logger.warning("Lock de coalescência não obtido; calculando sem ele", extra={'key': key})
+        yield
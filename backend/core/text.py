@@ -0,0 +1,14 @@
+"""
+Text normalization helpers shared by search features.
+"""
+import unicodedata
+
+# Accent map mirrored by the `seal.seal_unaccent` SQL function used in indexes
+UNACCENT_FROM = 'áàâãäåéèêëíìîïóòôõöúùûüçñýÿ'
+UNACCENT_TO = 'aaaaaaeeeeiiiiooooouuuucnyy'
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
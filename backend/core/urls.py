@@ -2,10 +2,11 @@
 URL configuration for SEAL Platform.
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from .api import api
 
 urlpatterns = [
+    path('admin/profiling/', include('apps.benchmarks.urls')),
     path('admin/', admin.site.urls),
     path('api/', api.urls),
 ]
@@ -33,6 +33,64 @@ export async function apiRequest<T>(endpoint: string, options: ApiOptions = {}):
   return response.json()
 }
 
+export interface ServerEvent<T = unknown> {
+  event: string
+  data: T
+}
+
+// Stream SSE via fetch (EventSource não envia o header Authorization).
+// Reconecta automaticamente até o `signal` ser abortado; com o servidor lotado
+// (503) o intervalo dobra a cada tentativa, até 16x o `retry` do servidor.
+export async function subscribeEvents<T>(
+  endpoint: string,
+  onEvent: (event: ServerEvent<T>) => void,
+  signal: AbortSignal,
+): Promise<void> {
+  let retryMs = 3000
+  let busy = 0
+
+  while (!signal.aborted) {
+    try {
+      const token = await getAuthToken()
+      if (!token) throw new Error('Não autenticado')
+
+      const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+        headers: { 'Authorization': `Bearer ${token}`, 'Accept': 'text/event-stream' },
+        signal,
+      })
+      busy = response.status === 503 ? Math.min(busy + 1, 4) : 0
+      if (!response.ok || !response.body) throw new Error(`Erro ${response.status}`)
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+      let buffer = ''
+      for (;;) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += value
+        let boundary = buffer.indexOf('\n\n')
+        while (boundary !== -1) {
+          const frame = buffer.slice(0, boundary)
+          buffer = buffer.slice(boundary + 2)
+          boundary = buffer.indexOf('\n\n')
+
+          let event = 'message'
+          const data: string[] = []
+          for (const line of frame.split('\n')) {
+            if (line.startsWith('event: ')) event = line.slice(7)
+            else if (line.startsWith('data: ')) data.push(line.slice(6))
+            else if (line.startsWith('retry: ')) retryMs = Number(line.slice(7)) || retryMs
+          }
+          if (data.length) onEvent({ event, data: JSON.parse(data.join('\n')) as T })
+        }
+      }
+    } catch (err) {
+      if (signal.aborted) return
+      console.error('Stream de eventos interrompido:', err)
+    }
+    await new Promise((resolve) => setTimeout(resolve, retryMs * 2 ** busy))
+  }
+}
+
 // Profile API
 export const profileApi = {
   getMe: () => apiRequest<Profile>('/profiles/me'),
@@ -46,6 +104,8 @@ export const profileApi = {
 // CRM API
 export const crmApi = {
   getBoard: () => apiRequest<KanbanBoard>('/crm/board'),
+  streamBoard: (onEvent: (event: ServerEvent<BoardEventData>) => void, signal: AbortSignal) =>
+    subscribeEvents<BoardEventData>('/crm/board/stream', onEvent, signal),
   getLeads: (status?: string) => apiRequest<Lead[]>(`/crm/leads${status ? `?status=${status}` : ''}`),
   createLead: (data: CreateLeadData) => apiRequest<Lead>('/crm/leads', { method: 'POST', body: data }),
   updateLead: (id: number, data: Partial<Lead>) => apiRequest<Lead>(`/crm/leads/${id}`, { method: 'PUT', body: data }),
@@ -78,6 +138,8 @@ export const commissionsApi = {
 // Onboarding API
 export const onboardingApi = {
   checkSchedule: () => apiRequest<ScheduleCheck>('/onboarding/check-schedule'),
+  streamSchedule: (onEvent: (event: ServerEvent<ScheduleState>) => void, signal: AbortSignal) =>
+    subscribeEvents<ScheduleState>('/onboarding/schedule-stream', onEvent, signal),
   confirmSchedule: () => apiRequest<{ status: string; message: string }>('/onboarding/confirm-schedule', { method: 'POST' }),
   // DEV ONLY
   devSimulateSchedule: () => apiRequest<{ status: string; message: string }>('/onboarding/dev-simulate-schedule', { method: 'POST' }),
@@ -90,6 +152,10 @@ export interface ScheduleCheck {
   schedule_time: string | null
 }
 
+export interface ScheduleState extends ScheduleCheck {
+  onboarding_step: number
+}
+
 // Types
 export interface Profile {
   id: string
@@ -156,6 +222,16 @@ export interface KanbanBoard {
   families_saved: number
 }
 
+// Eventos do stream do board: lead.created/updated/moved trazem `lead`,
+// lead.deleted traz `id`, commission.* trazem `commission` (ou `id`)
+export interface BoardEventData {
+  lead?: Lead
+  from_status?: Lead['status']
+  commission?: Commission
+  id?: number
+  status?: Lead['status']
+}
+
 export interface TrainingModule {
   id: number
   title: string
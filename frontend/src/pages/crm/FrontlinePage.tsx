@@ -1,7 +1,7 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { Plus, Phone, Mail, DollarSign, Trash2, GripVertical } from 'lucide-react'
-import { crmApi, type Lead, type CreateLeadData } from '../../lib/api'
+import { crmApi, type Lead, type CreateLeadData, type KanbanBoard, type BoardEventData } from '../../lib/api'
 import { Button, Input } from '../../components/ui'
 import { Card, CardHeader, CardTitle, CardContent } from '../../components/ui'
 import clsx from 'clsx'
@@ -13,6 +13,36 @@ const COLUMNS = [
   { id: 'RESGATE', label: 'RESGATE', description: 'Família Salva', color: 'border-green-600' },
 ]
 
+const BOARD_STATUSES: Lead['status'][] = ['RADAR', 'COMBATE', 'EXTRAÇÃO', 'RESGATE']
+
+// Aplica um evento do stream ao board em cache (mesma ordenação do backend: mais novos primeiro)
+function applyBoardEvent(board: KanbanBoard, event: string, data: BoardEventData): KanbanBoard {
+  const leadId = data.lead?.id ?? data.id
+  const next = { ...board }
+  let removed = 0
+  for (const status of BOARD_STATUSES) {
+    const column = board[status].filter((lead) => lead.id !== leadId)
+    removed += board[status].length - column.length
+    next[status] = column
+  }
+
+  if (event !== 'lead.deleted' && data.lead) {
+    const column = next[data.lead.status]
+    const position = board[data.lead.status].findIndex((lead) => lead.id === leadId)
+    if (position >= 0 && event === 'lead.updated') {
+      column.splice(position, 0, data.lead)
+    } else {
+      const index = column.findIndex((lead) => lead.created_at < data.lead!.created_at)
+      column.splice(index === -1 ? column.length : index, 0, data.lead)
+    }
+    removed -= 1
+  }
+
+  next.total_count = board.total_count - removed
+  next.families_saved = next.RESGATE.length
+  return next
+}
+
 export function FrontlinePage() {
   const queryClient = useQueryClient()
   const [showNewLead, setShowNewLead] = useState(false)
@@ -22,12 +52,41 @@ export function FrontlinePage() {
   const { data: board, isLoading } = useQuery({
     queryKey: ['crm-board'],
     queryFn: () => crmApi.getBoard(),
+    // Mantido atualizado pelo stream abaixo, sem refetch periódico
+    staleTime: Infinity,
+    refetchOnWindowFocus: false,
   })
 
+  const patchBoard = (event: string, data: BoardEventData) => {
+    queryClient.setQueryData<KanbanBoard>(['crm-board'], (current) =>
+      current ? applyBoardEvent(current, event, data) : current
+    )
+  }
+
+  // Stream SSE do board: aplica as mudanças localmente; `ready`/`resync` recarregam
+  useEffect(() => {
+    const controller = new AbortController()
+    crmApi.streamBoard(({ event, data }) => {
+      if (event === 'ready' || event === 'resync') {
+        queryClient.invalidateQueries({ queryKey: ['crm-board'] })
+      } else if (event.startsWith('lead.')) {
+        queryClient.setQueryData<KanbanBoard>(['crm-board'], (current) =>
+          current ? applyBoardEvent(current, event, data) : current
+        )
+        queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
+      } else if (event.startsWith('commission.')) {
+        queryClient.invalidateQueries({ queryKey: ['commissions-summary'] })
+        queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
+      }
+    }, controller.signal)
+    return () => controller.abort()
+  }, [queryClient])
+
   const createMutation = useMutation({
     mutationFn: (data: CreateLeadData) => crmApi.createLead(data),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['crm-board'] })
+    onSuccess: (lead) => {
+      // O stream também envia o evento; aplicar duas vezes é idempotente
+      patchBoard('lead.created', { lead })
       setShowNewLead(false)
       setNewLead({ name: '', phone: '', potential_value: 0 })
     },
@@ -35,15 +94,15 @@ export function FrontlinePage() {
 
   const moveMutation = useMutation({
     mutationFn: ({ id, status }: { id: number; status: string }) => crmApi.moveLead(id, status),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['crm-board'] })
+    onSuccess: (lead) => {
+      patchBoard('lead.moved', { lead })
     },
   })
 
   const deleteMutation = useMutation({
     mutationFn: (id: number) => crmApi.deleteLead(id),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['crm-board'] })
+    onSuccess: (_, id) => {
+      patchBoard('lead.deleted', { id })
     },
   })
 
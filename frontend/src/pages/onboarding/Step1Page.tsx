@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { Calendar, Clock, CheckCircle, Loader2 } from 'lucide-react'
 import { useAuthStore } from '../../stores/authStore'
@@ -13,48 +13,28 @@ export function Step1Page() {
   const { profile, refreshProfile } = useAuthStore()
   
   const [loading, setLoading] = useState(false)
-  const [checking, setChecking] = useState(false)
+  const [listening, setListening] = useState(false)
   const [error, setError] = useState('')
   const [calendlyOpened, setCalendlyOpened] = useState(false)
   const [scheduleConfirmed, setScheduleConfirmed] = useState(false)
   const [scheduleTime, setScheduleTime] = useState<string | null>(null)
 
-  // Verifica se já tem agendamento
-  const checkSchedule = useCallback(async () => {
-    try {
-      setChecking(true)
-      const result = await onboardingApi.checkSchedule()
-      
-      if (result.has_schedule) {
+  // Acompanha o agendamento via stream SSE: o servidor envia o estado atual
+  // e avisa assim que o webhook do Calendly registra a reunião
+  useEffect(() => {
+    if (scheduleConfirmed) return
+
+    const controller = new AbortController()
+    setListening(true)
+    onboardingApi.streamSchedule(({ event, data }) => {
+      if (event === 'schedule' && data.has_schedule) {
         setScheduleConfirmed(true)
-        setScheduleTime(result.schedule_time)
+        setScheduleTime(data.schedule_time)
       }
-    } catch (err) {
-      console.error('Erro ao verificar agendamento:', err)
-    } finally {
-      setChecking(false)
-    }
-  }, [])
-
-  // Verifica agendamento ao montar e periodicamente após abrir Calendly
-  useEffect(() => {
-    checkSchedule()
-  }, [checkSchedule])
+    }, controller.signal).finally(() => setListening(false))
 
-  useEffect(() => {
-    let interval: ReturnType<typeof setInterval> | null = null
-    
-    if (calendlyOpened && !scheduleConfirmed) {
-      // Polling a cada 5 segundos após abrir o Calendly
-      interval = setInterval(() => {
-        checkSchedule()
-      }, 5000)
-    }
-    
-    return () => {
-      if (interval) clearInterval(interval)
-    }
-  }, [calendlyOpened, scheduleConfirmed, checkSchedule])
+    return () => controller.abort()
+  }, [scheduleConfirmed])
 
   const handleOpenCalendly = () => {
     window.open(CALENDLY_URL, '_blank')
@@ -159,7 +139,7 @@ export function Step1Page() {
               ) : calendlyOpened ? (
                 <div className="space-y-4">
                   <div className="flex items-center gap-3 text-yellow-400 bg-yellow-900/20 p-4 border border-yellow-800">
-                    {checking ? (
+                    {listening ? (
                       <Loader2 className="w-6 h-6 animate-spin" />
                     ) : (
                       <Clock className="w-6 h-6" />
@@ -200,7 +180,6 @@ export function Step1Page() {
                     onClick={async () => {
                       try {
                         await onboardingApi.devSimulateSchedule()
-                        checkSchedule()
                       } catch (err) {
                         setError('Erro ao simular agendamento')
                       }